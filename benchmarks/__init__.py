@@ -0,0 +1 @@
+"""Performance benchmarks for pypaya-json (not part of the test suite)."""
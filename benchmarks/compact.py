@@ -0,0 +1,41 @@
+"""Measure the memory saved by compact loads, with tracemalloc.
+
+Every scenario is loaded plain, frozen, and frozen with compact=True. The memory still held
+once the load is done (the loaded data and the documents kept by the loader) is reported,
+along with the load time.
+
+Run from the repository root:
+
+    python -m benchmarks.compact
+"""
+import argparse
+import tempfile
+
+from benchmarks.generators import GENERATORS, generate
+from benchmarks.run import measure
+
+VARIANTS = [("plain", {}), ("frozen", {"frozen": True}), ("compact", {"frozen": True, "compact": True})]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=[g.__name__ for g in GENERATORS],
+                        default=["repeated_subtrees", "fan_out", "large_array", "dense_paths"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pypaya-json-bench-") as directory:
+        for scenario in generate(directory, args.scale):
+            if scenario.name not in args.only:
+                continue
+            results = {name: measure(scenario, args.repeat, options) for name, options in VARIANTS}
+            plain = results["plain"]["retained_bytes"]
+            for name, result in results.items():
+                retained = result["retained_bytes"]
+                print(f"{scenario.name:18s} {name:8s} {result['seconds'] * 1000:10.2f} ms "
+                      f"{retained / 2 ** 20:8.2f} MiB retained ({1 - retained / plain:+7.1%} saved)")
+
+
+if __name__ == "__main__":
+    main()
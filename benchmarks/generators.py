@@ -0,0 +1,131 @@
+"""Synthetic config trees in the shapes that stress different parts of the loader.
+
+Every generator writes its files into a directory and returns a Scenario describing how to
+load them. Sizes are controlled by a single scale factor, so that the same scenarios serve
+for quick checks and for longer, more stable measurements.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple
+
+
+class Scenario(NamedTuple):
+    """A generated config tree: its root file and the loader options it needs."""
+
+    name: str
+    root: str
+    options: Dict[str, Any]
+
+
+def _write(directory: str, name: str, data: Any) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def _entry(i: int) -> Dict[str, Any]:
+    """A small, typical config entry."""
+    return {"type": "linear", "size": i, "activation": {"type": "relu", "inplace": True},
+            "tags": ["a", "b", i % 7], "enabled": i % 10 != 0}
+
+
+def wide_flat(directory: str, scale: int) -> Scenario:
+    """One file with a flat dictionary of many scalar entries."""
+    data = {f"key_{i}": (i if i % 3 == 0 else f"value {i}" if i % 3 == 1 else i * 0.5)
+            for i in range(20000 * scale)}
+    return Scenario("wide_flat", _write(directory, "wide_flat.json", data), {})
+
+
+def deep_nesting(directory: str, scale: int) -> Scenario:
+    """One file with chains of nested dictionaries and lists, 500 levels deep.
+
+    The depth stays within what the standard json module can write; scale adds chains.
+    """
+    chains = {}
+    for chain in range(4 * scale):
+        data = {"leaf": True}
+        for i in range(500):
+            data = {f"level_{i}": data, "index": i, "items": [i, {"enabled": True, "x": i}]}
+        chains[f"chain_{chain}"] = data
+    return Scenario("deep_nesting", _write(directory, "deep_nesting.json", chains), {})
+
+
+def fan_out(directory: str, scale: int) -> Scenario:
+    """A root including many distinct files, each with a few nested entries."""
+    count = 200 * scale
+    for i in range(count):
+        _write(directory, f"fan_{i}.json", {f"entry_{j}": _entry(j) for j in range(20)})
+    data = {f"part_{i}": {"include": {"filename": f"fan_{i}.json"}} for i in range(count)}
+    return Scenario("fan_out", _write(directory, "fan_out.json", data), {})
+
+
+def diamond(directory: str, scale: int) -> Scenario:
+    """Many files all including the same shared base, which is loaded once per load."""
+    _write(directory, "diamond_base.json", {f"entry_{j}": _entry(j) for j in range(200)})
+    count = 100 * scale
+    for i in range(count):
+        _write(directory, f"diamond_{i}.json",
+               {"include": {"filename": "diamond_base.json"}, "override": i})
+    data = {"models": [{"include": {"filename": f"diamond_{i}.json"}} for i in range(count)]}
+    return Scenario("diamond", _write(directory, "diamond.json", data), {})
+
+
+def large_array(directory: str, scale: int) -> Scenario:
+    """A root including a large array of records and selecting part of a large dictionary."""
+    _write(directory, "array_data.json", [_entry(i) for i in range(20000 * scale)])
+    _write(directory, "array_lookup.json", {"tables": {f"t{i}": list(range(50)) for i in range(200 * scale)},
+                                            "selected": {"value": 1}})
+    data = {"records": {"include": {"filename": "array_data.json"}},
+            "lookup": {"include": {"filename": "array_lookup.json", "keys_path": "selected"}}}
+    return Scenario("large_array", _write(directory, "large_array.json", data), {})
+
+
+def comment_heavy(directory: str, scale: int) -> Scenario:
+    """A file where every entry has a comment and trailing commas."""
+    lines = ["{", "  // Generated config with a comment on every entry"]
+    for i in range(10000 * scale):
+        lines.append(f'  // Entry {i}: "quoted" text, braces {{}} and a // nested marker')
+        lines.append(f'  "key_{i}": {{"value": {i}, "name": "entry {i}", "list": [1, 2, 3,],}},')
+    lines.append("}")
+    path = os.path.join(directory, "comment_heavy.json")
+    with open(path, "w") as f:
+        f.write("\n".join(lines))
+    return Scenario("comment_heavy", path, {"comment_string": "//"})
+
+
+def dense_paths(directory: str, scale: int) -> Scenario:
+    """A file where most values are path annotations, spread over a few directories."""
+    data = {f"item_{i}": {"@path:data": f"data/set_{i % 10}/file_{i}.bin",
+                          "@path:output": f"../out/run_{i % 5}", "id": i}
+            for i in range(10000 * scale)}
+    return Scenario("dense_paths", _write(directory, "dense_paths.json", data), {})
+
+
+def repeated_subtrees(directory: str, scale: int) -> Scenario:
+    """Generated model configs repeating the same small objects across many files."""
+    count = 50 * scale
+    for i in range(count):
+        layers = [{"name": f"layer_{j}", "type": "linear", "size": 64 * ((i + j) % 7 + 1), "bias": True,
+                   "activation": {"type": "relu", "inplace": True},
+                   "init": {"type": "kaiming_uniform", "mode": "fan_in", "nonlinearity": "relu"}}
+                  for j in range(200)]
+        _write(directory, f"model_{i}.json", {"name": f"model_{i}", "layers": layers})
+    data = {"models": [{"include": {"filename": f"model_{i}.json"}} for i in range(count)]}
+    return Scenario("repeated_subtrees", _write(directory, "repeated_subtrees.json", data), {})
+
+
+# All generators, in the order the runner reports them
+GENERATORS: List[Callable[[str, int], Scenario]] = [
+    wide_flat, deep_nesting, fan_out, diamond, large_array, comment_heavy, dense_paths, repeated_subtrees,
+]
+
+
+def generate(directory: str, scale: int = 1) -> List[Scenario]:
+    """Write every scenario into its own subdirectory of directory."""
+    scenarios = []
+    for generator in GENERATORS:
+        path = os.path.join(directory, generator.__name__)
+        os.makedirs(path, exist_ok=True)
+        scenarios.append(generator(path, scale))
+    return scenarios
@@ -0,0 +1,56 @@
+"""Time PypayaJSON._process_data on deep and wide synthetic trees.
+
+Run from the repository root, e.g. on two commits to compare them:
+
+    python -m benchmarks.process_data
+"""
+import argparse
+import time
+from typing import Any, Dict
+
+from pypaya_json import PypayaJSON
+
+
+def deep_tree(depth: int) -> Dict[str, Any]:
+    """A chain of nested dictionaries with enable flags and sparse path annotations."""
+    data = {"leaf": 1}
+    for i in range(depth):
+        if i % 50 == 0:
+            data = {f"k{i}": data, "value": i, "@path:p": "a/b"}
+        else:
+            data = {f"k{i}": data, "value": i, "enabled": True}
+    return data
+
+
+def wide_tree(width: int) -> Dict[str, Any]:
+    """A flat dictionary of small, three-level-deep entries."""
+    return {
+        f"k{i}": {"a": i, "b": [1, 2, {"c": "x", "enabled": True}], "d": {"e": {"f": i}}}
+        for i in range(width)
+    }
+
+
+def best_time(loader: PypayaJSON, data: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loader._process_data(data, ".")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--width", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    loader = PypayaJSON()
+    for name, data in ((f"deep ({args.depth} levels)", deep_tree(args.depth)),
+                       (f"wide ({args.width} entries)", wide_tree(args.width))):
+        print(f"{name:24s} {best_time(loader, data, args.repeat) * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Time PypayaJSON loads of synthetic config trees and compare the results between commits.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.run --output before.json
+    (check out another commit)
+    python -m benchmarks.run --output after.json --compare before.json
+
+Every scenario of benchmarks.generators is loaded a few times with a fresh loader; the best
+time is reported along with the throughput in MB of source files and in nodes of the loaded
+data per second. Peak memory, and the memory still held by the loaded data and the loader
+afterwards, are measured with tracemalloc in a separate load, since tracing slows the load
+down. Loader options such as frozen or compact can be given with --option. With --compare,
+scenarios slower than the baseline by more than the threshold are flagged and the exit status
+is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.generators import GENERATORS, Scenario, generate
+from pypaya_json import PypayaJSON
+from pypaya_json.stats import count_nodes
+
+
+def source_bytes(directory: str) -> int:
+    """Total size of the files of a scenario."""
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def measure(scenario: Scenario, repeat: int, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Best load time, throughput, and peak and retained traced memory of a scenario."""
+    options = {**scenario.options, **(options or {})}
+    best = float("inf")
+    data = None
+    for _ in range(repeat):
+        loader = PypayaJSON(**options)
+        start = time.perf_counter()
+        data = loader.load_file(scenario.root)
+        best = min(best, time.perf_counter() - start)
+    size = source_bytes(os.path.dirname(scenario.root))
+    nodes = count_nodes(data)
+    del data
+
+    tracemalloc.start()
+    try:
+        loader = PypayaJSON(**options)
+        data = loader.load_file(scenario.root)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del data, loader
+    return {"seconds": best, "bytes": size, "nodes": nodes, "mb_per_s": size / best / 1e6,
+            "nodes_per_s": nodes / best, "peak_bytes": peak, "retained_bytes": retained}
+
+
+def parse_option(text: str) -> Tuple[str, Any]:
+    """A loader option given as NAME=VALUE, the value in JSON (e.g. frozen=true)."""
+    name, _, value = text.partition("=")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value  # A plain string, e.g. path_resolution=prefix
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """Names of the scenarios slower than in baseline by more than threshold (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is not None and result["seconds"] > before["seconds"] * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="size factor of the generated trees")
+    parser.add_argument("--repeat", type=int, default=5, help="timed loads per scenario")
+    parser.add_argument("--only", nargs="+", choices=[g.__name__ for g in GENERATORS],
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--option", action="append", type=parse_option, default=[], metavar="NAME=VALUE",
+                        help="loader option for every scenario, e.g. frozen=true (repeatable)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown flagged as a regression, as a fraction (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pypaya-json-bench-") as directory:
+        for scenario in generate(directory, args.scale):
+            if args.only and scenario.name not in args.only:
+                continue
+            result = results[scenario.name] = measure(scenario, args.repeat, dict(args.option))
+            print(f"{scenario.name:18s} {result['seconds'] * 1000:10.2f} ms {result['mb_per_s']:8.2f} MB/s "
+                  f"{result['nodes_per_s'] / 1e6:8.2f} Mnodes/s {result['peak_bytes'] / 2 ** 20:8.1f} MiB peak "
+                  f"{result['retained_bytes'] / 2 ** 20:8.1f} MiB retained")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "scale": args.scale,
+                       "options": dict(args.option), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != args.scale:
+            print(f"warning: the baseline was run with --scale {baseline.get('scale')}", file=sys.stderr)
+        baseline = baseline["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, result in results.items():
+            if name in baseline:
+                change = result["seconds"] / baseline[name]["seconds"] - 1
+                flag = "  REGRESSION" if name in regressions else ""
+                print(f"{name:18s} {change:+8.1%}{flag}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
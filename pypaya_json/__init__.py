@@ -1,6 +1,14 @@
 """Enhanced JSON processing with includes, comments, and more."""
 
 from pypaya_json.core import PypayaJSON
+from pypaya_json.frozen import FrozenDict, FrozenList
+from pypaya_json.graph import DependencyGraph, IncludeEdge
+from pypaya_json.lazy import LazyMapping, LazySequence
+from pypaya_json.limits import LoadLimitError
+from pypaya_json.shared import SharedConfig
+from pypaya_json.stats import FileStats, LoadStats
+from pypaya_json.watch import LoadedConfig
 
 __version__ = "0.1.0"
-__all__ = ["PypayaJSON"]
+__all__ = ["PypayaJSON", "DependencyGraph", "IncludeEdge", "LazyMapping", "LazySequence", "LoadedConfig",
+           "FileStats", "LoadStats", "FrozenDict", "FrozenList", "SharedConfig", "LoadLimitError"]
@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Hashable, Optional
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "max_bytes", "currbytes"])
+
+
+class FileCache:
+    """Thread-safe LRU cache of parsed files, validated against a file signature.
+
+    Every entry remembers the signature (e.g. ``(st_mtime_ns, st_size)``) of the file it was
+    parsed from; a lookup with a different signature is a miss and drops the stale entry.
+    The cache is bounded both by the number of entries and by their approximate size in bytes.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached files. Defaults to 128.
+            max_bytes (int): Maximum total approximate size of cached files. Defaults to 64 MiB.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (signature, value, size)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, signature: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the value cached under key if its signature matches, otherwise default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, signature: Hashable, value: Any, size: int) -> None:
+        """Store value under key, evicting least recently used entries to respect the limits."""
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            if size > self.max_bytes:
+                return  # Would evict everything else and still not fit
+            self._entries[key] = (signature, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def info(self) -> CacheInfo:
+        """Report cache statistics."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.max_entries, len(self._entries),
+                             self.max_bytes, self._bytes)
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _discard(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
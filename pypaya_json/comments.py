@@ -0,0 +1,134 @@
+import re
+from functools import lru_cache
+from typing import Optional, Pattern, Tuple, Union
+
+Text = Union[str, bytes]
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_BLOCK_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"  # Cannot run past the first */
+
+
+def _compile(pattern: str, binary: bool) -> Pattern:
+    return re.compile(pattern.encode("utf-8") if binary else pattern, re.DOTALL)
+
+
+def _not_marker(comment_string: str) -> str:
+    """Pattern for a character that can start comment_string but does not here."""
+    first, rest = re.escape(comment_string[0]), re.escape(comment_string[1:])
+    return rf"{first}(?!{rest})" if rest else r"(?!)"
+
+
+@lru_cache(maxsize=32)
+def _patterns(comment_string: str, binary: bool) -> Tuple[Pattern, Pattern, Pattern]:
+    """Compile the line, full and trailing comma scanners for comment_string.
+
+    Each scanner matches either a run of text to keep (group "keep") or something to drop.
+    Keep runs only stop at characters that may start something to drop, so the number of
+    matches is proportional to the number of comments, not of strings.
+    """
+    first = re.escape(comment_string[0])
+    line_comment = rf"{re.escape(comment_string)}[^\n]*"
+    comment = rf"{line_comment}|{_BLOCK_COMMENT}"
+    # The line comment must run to the end of the line here: stopping earlier could let a /* in it
+    # start a block comment, making a needed comma look trailing
+    trailing = rf"(?:\s|{line_comment}(?![^\n])|{_BLOCK_COMMENT})*[\]}}]"
+    not_block = r"/(?!\*)" if comment_string[0] != "/" else r"(?!)"
+
+    line = rf'(?P<keep>(?:[^"{first}]+|{_STRING}|{_not_marker(comment_string)})+)|{line_comment}'
+    full = (rf'(?P<keep>(?:[^"/,{first}]+|{_STRING}|,(?!{trailing})|{not_block}'
+            rf'|{_not_marker(comment_string) if comment_string[0] != "/" else r"/(?![*/])"})+)'
+            rf'|{comment}|,')
+    commas = r'(?P<keep>(?:[^",]+|' + _STRING + r'|,(?!\s*[\]}]))+)|,'
+    return _compile(line, binary), _compile(full, binary), _compile(commas, binary)
+
+
+def strip_comments(text: Text, comment_string: str) -> Text:
+    """
+    Remove comments and trailing commas from JSON text.
+
+    Line comments start with comment_string and run to the end of the line; block comments
+    are delimited by /* and */. Comment markers inside string values are left untouched.
+    Lines without a comment marker are copied as they are, so the cost of stripping grows
+    with the number of comments rather than with the size of the document.
+
+    Args:
+        text (Union[str, bytes]): The JSON text, as str or UTF-8 encoded bytes.
+        comment_string (str): The string that starts a line comment.
+
+    Returns:
+        Union[str, bytes]: The text without comments and trailing commas, of the type of text.
+    """
+    binary = not isinstance(text, str)
+    line_pattern, full_pattern, comma_pattern = _patterns(comment_string, binary)
+    keep = b"\\g<keep>" if binary else "\\g<keep>"
+    if (b"/*" if binary else "/*") in text:
+        # Block comments may span lines, so scan the whole text at once
+        return full_pattern.sub(keep, text)
+
+    # JSON strings cannot contain raw newlines, so every line can be scanned on its own
+    marker = comment_string.encode("utf-8") if binary else comment_string
+    newline = b"\n" if binary else "\n"
+    lines = text.split(newline)
+    for i, line in enumerate(lines):
+        index = _comment_start(line, marker, binary)
+        if index is None:
+            lines[i] = line_pattern.sub(keep, line)
+        elif index >= 0:
+            lines[i] = line[:index]
+    text = newline.join(lines)
+    return _strip_trailing_commas(text, comma_pattern, keep, binary)
+
+
+def _outside_string(line: Text, index: int, binary: bool) -> bool:
+    """Whether position index of a line is certainly outside strings.
+
+    Without backslashes, quotes always delimit strings, so an even number of them before
+    index means it is not inside a string. Lines with escapes need a full scan instead.
+    """
+    quote, backslash = (b'"', b"\\") if binary else ('"', "\\")
+    return line.count(quote, 0, index) % 2 == 0 and backslash not in line[:index]
+
+
+def _comment_start(line: Text, marker: Text, binary: bool) -> Optional[int]:
+    """Position of the line comment in line, -1 if there is none, None if unsure."""
+    index = line.find(marker)
+    while index >= 0 and not _outside_string(line, index, binary):
+        if (b"\\" if binary else "\\") in line[:index]:
+            return None
+        index = line.find(marker, index + 1)
+    return index
+
+
+def _strip_trailing_commas(text: Text, comma_pattern: Pattern, keep: Text, binary: bool) -> Text:
+    """Remove commas directly followed by a closing bracket, outside strings."""
+    newline = b"\n" if binary else "\n"
+    drop = []
+    for match in _trailing_comma_pattern(binary).finditer(text):
+        position = match.start()
+        line_start = text.rfind(newline, 0, position) + 1
+        if not _outside_string(text[line_start:position + 1], position - line_start, binary):
+            # Maybe inside a string with escapes, scan the whole text properly
+            return comma_pattern.sub(keep, text)
+        drop.append(position)
+    if not drop:
+        return text
+    parts, start = [], 0
+    for position in drop:
+        parts.append(text[start:position])
+        start = position + 1
+    parts.append(text[start:])
+    return text[:0].join(parts)
+
+
+@lru_cache(maxsize=2)
+def _trailing_comma_pattern(binary: bool) -> Pattern:
+    """Candidate trailing commas, which may still be inside strings."""
+    return _compile(r",\s*[\]}]", binary)
+
+
+def has_comment_markers(text: Text, comment_string: str) -> bool:
+    """Cheap check whether text may contain comments at all."""
+    if isinstance(text, str):
+        return comment_string in text or "/*" in text
+    # find() also works on buffers such as an mmap, which do not support the in operator
+    return text.find(comment_string.encode("utf-8")) >= 0 or text.find(b"/*") >= 0
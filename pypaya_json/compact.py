@@ -0,0 +1,117 @@
+import sys
+import weakref
+from typing import Any
+
+from pypaya_json.frozen import FrozenDict, FrozenList
+
+_FROZEN = (FrozenDict, FrozenList)
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Whether two equal values are indistinguishable, unlike e.g. 1, 1.0 and True, or 0.0 and -0.0."""
+    if a is b:
+        return True
+    if type(a) is not type(b) or type(a) in _FROZEN:
+        return False  # Shared containers are identical, equal ones differ somewhere
+    return type(a) is not float or a.hex() == b.hex()
+
+
+class Compactor:
+    """Shares the repeated parts of the documents it compacts.
+
+    Dictionary keys and string values of at most max_string characters are interned, so that
+    every occurrence of a string is the same object. When sharing subtrees, the data is also
+    frozen and hash-consed: structurally identical subtrees, anywhere in any document compacted
+    by the same Compactor, become one shared object. Only frozen subtrees can be shared safely,
+    plain data just gets its strings interned. Shared subtrees are only referenced weakly, so
+    they are dropped with the last document using them.
+    """
+
+    def __init__(self, max_string: int = 64):
+        """
+        Initialize a compactor with empty tables.
+
+        Args:
+            max_string (int): Maximum length of the string values interned; keys are always
+                interned. Defaults to 64.
+        """
+        self.max_string = max_string
+        self._nodes = weakref.WeakKeyDictionary()  # frozen container -> weak reference to the shared one equal to it
+
+    def compact(self, data: Any, share_subtrees: bool = True) -> Any:
+        """
+        Compact a JSON tree.
+
+        Args:
+            data (Any): Processed data. Frozen containers in it are taken as already compacted
+                when sharing subtrees.
+            share_subtrees (bool): Whether to freeze the data and share identical subtrees.
+                Defaults to True.
+
+        Returns:
+            Any: New containers with the same contents: frozen and shared if share_subtrees,
+                plain dicts and lists otherwise.
+        """
+        if not isinstance(data, (dict, list)):
+            return self._scalar(data)
+        if type(data) in _FROZEN and share_subtrees:
+            return data
+        scalar = self._scalar
+        intern = sys.intern
+        # Frames are (container, items, compacted children, key in the parent); children are
+        # compacted first, so that a container is shared only once all of its contents are
+        stack = [(data, self._items(data), [], None)]
+        while True:
+            container, items, children, key = stack[-1]
+            is_dict = isinstance(container, dict)
+            for item in items:
+                value = item[1] if is_dict else item
+                if isinstance(value, (dict, list)) and not (share_subtrees and type(value) in _FROZEN):
+                    stack.append((value, self._items(value), [], item[0] if is_dict else None))
+                    break
+                if is_dict:
+                    children.append((intern(item[0]), scalar(value)))
+                else:
+                    children.append(scalar(value))
+            else:
+                stack.pop()
+                node = self._node(children, is_dict, share_subtrees)
+                if not stack:
+                    return node
+                parent, _, siblings, _ = stack[-1]
+                siblings.append((intern(key), node) if isinstance(parent, dict) else node)
+
+    def clear(self) -> None:
+        """Forget the shared subtrees."""
+        self._nodes = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _items(container: Any) -> Any:
+        return iter(dict.items(container) if isinstance(container, dict) else container)
+
+    def _scalar(self, value: Any) -> Any:
+        if type(value) is str and len(value) <= self.max_string:
+            return sys.intern(value)
+        return value
+
+    def _node(self, children: list, is_dict: bool, share: bool) -> Any:
+        """The container with the given compacted children, shared if an identical one exists."""
+        if not share:
+            return dict(children) if is_dict else children
+        if is_dict:
+            node = FrozenDict(children)
+            node._hash = hash(frozenset(children))
+        else:
+            node = FrozenList(children)
+            node._hash = hash(tuple(children))
+        shared = self._nodes.get(node)
+        shared = shared() if shared is not None else None
+        if shared is None:
+            self._nodes[node] = weakref.ref(node)
+            return node
+        if is_dict:
+            if list(shared) == list(node) and all(_same(v, node[k]) for k, v in dict.items(shared)):
+                return shared
+        elif all(_same(a, b) for a, b in zip(shared, node)):
+            return shared
+        return node  # Equal but not identical, e.g. 1 where the shared subtree has True
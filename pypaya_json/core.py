@@ -1,7 +1,114 @@
-import json
+import asyncio
+import mmap
 import os
-from typing import Optional, Any, Dict, List, Union
-from pathlib import Path
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import islice
+from typing import Optional, Any, Callable, Dict, Generator, Iterable, Iterator, List, Tuple, Union
+
+from pypaya_json.cache import CacheInfo, FileCache
+from pypaya_json.compact import Compactor
+from pypaya_json.comments import has_comment_markers, strip_comments
+from pypaya_json.disk_cache import DiskCache, file_signature
+from pypaya_json.fragments import DirectoryListing, fragment_pattern, fragment_spec
+from pypaya_json.frozen import freeze, thaw
+from pypaya_json.graph import DependencyGraph, build_graph
+from pypaya_json.limits import LoadBudget
+from pypaya_json.lazy import LazyLoad, LazyMapping, LazySequence, resolve, select as select_paths
+from pypaya_json.watch import LoadedConfig
+from pypaya_json.parsers import accepts_buffers, get_parser
+from pypaya_json.paths import PathResolver
+from pypaya_json.prefetch import Prefetcher, preload
+from pypaya_json.shared import SharedConfig
+from pypaya_json.stats import FileStats, LoadStats, count_nodes
+from pypaya_json.stream import is_array_file, iter_array, locate
+
+_MISSING = object()
+_STREAM_DOCUMENTS = 64  # Included documents kept between the elements of a streamed array
+
+
+class _LoadContext:
+    """State shared by every file processed during a single top-level load."""
+
+    def __init__(self):
+        self.documents = {}  # absolute path -> processed document
+        self.partials = {}  # absolute path -> (key path, processed value) of the value parsed partially from it
+        self.claimed = set()  # absolute paths whose document was already handed to an include site
+        self.loading = {}  # absolute paths of the documents being processed, outermost first (values unused)
+        self.reader = None  # Object whose get(path) supplies parsed documents (e.g. prefetched), if any
+        self.files = None  # absolute path -> signature of every file read, when tracked
+        self.includes = None  # absolute path -> absolute paths of the documents it loaded, when tracked
+        self.active = []  # absolute paths of the documents being processed, innermost last, when tracked
+        self.copy_always = False  # Whether every include site gets a copy, keeping documents pristine
+        self.stats = None  # LoadStats being recorded, if any
+        self.depth = 0  # Include depth of the document being processed
+        self.budget = None  # LoadBudget of the loader's limits, if any
+        self.manifests = None  # Frozen loads: {absolute path: signature} of the files of every document being processed
+        self.signatures = None  # Frozen loads: absolute path -> signature of the files checked so far
+
+
+def _run(task: Generator) -> Any:
+    """Drive a processing task to completion without growing the call stack.
+
+    A task is a generator that yields sub-tasks and is sent back their results. Suspended
+    tasks are kept on an explicit stack, so neither deeply nested data nor long include
+    chains are limited by the interpreter's recursion limit.
+    """
+    stack = [task]
+    value = None
+    while True:
+        try:
+            subtask = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            value = stop.value
+        else:
+            stack.append(subtask)
+            value = None
+
+
+def _load_chunk(loader: "PypayaJSON", paths: List[str], return_exceptions: bool) -> List[Any]:
+    """Load a chunk of a load_many batch in a worker process, sharing included documents."""
+    documents = {}
+    return [loader._load_batched(path, documents, return_exceptions) for path in paths]
+
+
+def _circular_include(path: str, key: Any, context: _LoadContext) -> ValueError:
+    """The error for including path (key in context.loading) while it is being processed, naming the cycle."""
+    active = list(context.loading)
+    cycle = active[active.index(key):] + [key]
+    names = [k[0] if isinstance(k, tuple) else k for k in cycle]  # Partially parsed files are (path, keys)
+    return ValueError(f"Circular include of {path}: {' -> '.join(names)}")
+
+
+def _copy_tree(data: Any) -> Any:
+    """Copy the dicts and lists of a JSON tree, sharing the (immutable) leaf values."""
+    if not isinstance(data, (dict, list)):
+        return data
+    root = {} if isinstance(data, dict) else []
+    stack = [(data, root)]
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(value, (dict, list)):
+                    copy = target[key] = {} if isinstance(value, dict) else []
+                    stack.append((value, copy))
+                else:
+                    target[key] = value
+        else:
+            for item in source:
+                if isinstance(item, (dict, list)):
+                    copy = {} if isinstance(item, dict) else []
+                    target.append(copy)
+                    stack.append((item, copy))
+                else:
+                    target.append(item)
+    return root
 
 
 class PypayaJSON:
@@ -11,7 +118,27 @@ class PypayaJSON:
                  enable_key: str = "enabled",
                  comment_string: Optional[str] = None,
                  resolve_path_annotations: bool = True,
-                 path_annotation_prefix: str = "@path:"):
+                 path_annotation_prefix: str = "@path:",
+                 cache: bool = False,
+                 cache_max_entries: int = 128,
+                 cache_max_bytes: int = 64 * 1024 * 1024,
+                 parser: Union[str, Callable[[bytes], Any]] = "auto",
+                 prefetch_workers: int = 0,
+                 disk_cache: Optional[str] = None,
+                 disk_cache_hash: bool = False,
+                 partial_parse_min_bytes: Optional[int] = None,
+                 mmap_min_bytes: Optional[int] = None,
+                 path_resolution: str = "resolve",
+                 path_cache: bool = False,
+                 path_cache_ttl: Optional[float] = None,
+                 stats: bool = False,
+                 on_event: Optional[Callable[[str, Any], None]] = None,
+                 frozen: bool = False,
+                 compact: bool = False,
+                 max_include_depth: Optional[int] = None,
+                 max_files: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 max_nodes: Optional[int] = None):
         """
         Initialize PypayaJSON with enhanced processing capabilities.
 
@@ -22,6 +149,76 @@ class PypayaJSON:
             path_annotation_prefix (str): Prefix for path annotation keys. Keys starting with this prefix
                 will have their values resolved to absolute paths. Defaults to "@path:".
                 Examples: "@path:data_dir" -> {"data_dir": "/absolute/path/to/data"}
+            cache (bool): Whether to keep parsed files in memory between loads. Cached entries are
+                invalidated when the file's modification time or size changes. Defaults to False.
+            cache_max_entries (int): Maximum number of files kept in the cache. Defaults to 128.
+            cache_max_bytes (int): Maximum total size (in bytes of source files) kept in the cache.
+                Defaults to 64 MiB.
+            parser (Union[str, Callable]): JSON parser used for files: "orjson", "ujson", "json"
+                (standard library), "auto" to use the fastest installed one, or a callable taking
+                the raw bytes of a file. Defaults to "auto".
+            prefetch_workers (int): Number of threads reading and parsing included files ahead of
+                processing, as soon as their include declarations are found. Useful when file
+                access latency dominates, e.g. on network filesystems. 0 disables prefetching.
+                Defaults to 0.
+            disk_cache (Optional[str]): Directory where fully processed results are stored, so that
+                later loads, also in other processes, only check the files they depend on for
+                changes. Defaults to None (no on-disk cache).
+            disk_cache_hash (bool): Whether the on-disk cache also records content hashes, so that
+                files whose modification time changed but whose contents did not keep their
+                entries valid. Defaults to False.
+            partial_parse_min_bytes (Optional[int]): Files at least this large that are included with a
+                keys_path are scanned for the selected value, which is the only part parsed; the
+                rest of the file is skipped without building objects. Used only when the result is
+                the same as parsing the whole file, e.g. not when a dictionary on the key path has
+                an include, and never with comment_string. A single value is taken from a file per
+                load: including a second value of the same file parses the file whole, once, for
+                that and any further include. The rest of the file is not validated: its values
+                are only matched for brackets, and its includes are not followed, so a file that
+                a full load rejects, e.g. for an include of a missing file outside the key path,
+                may still be included this way. Defaults to None (always parse whole files).
+            mmap_min_bytes (Optional[int]): Files at least this large are memory-mapped instead of read
+                into a bytes object. Parsers that accept buffers (orjson) parse the mapping without
+                any copy, so the file's pages stay in the page cache shared by all processes; files
+                with comments are still copied to be stripped. Defaults to None (always read files).
+            path_resolution (str): How path annotations are made absolute: "resolve" resolves symlinks
+                in every path; "prefix" resolves the directory of a path once per directory and
+                appends the last component without following it; "abspath" only normalizes paths,
+                like os.path.abspath, without file system access. Defaults to "resolve".
+            path_cache (bool): Whether to memoize resolved path annotations per (directory, value),
+                across loads. Defaults to False.
+            path_cache_ttl (Optional[float]): Seconds after which memoized paths (and the directories
+                memoized in "prefix" mode) are dropped. Defaults to None (kept until path_cache_clear()).
+            stats (bool): Whether to record a LoadStats for every load (files read with their read,
+                comment-strip and parse times, sizes, node counts and include depths; time spent
+                filtering, resolving path annotations and merging includes; cache hits), available
+                as last_stats afterwards. Recorded by load_file, aload_file and every file of
+                load_many (whose files share the includes read by earlier ones); lazy, selective
+                and streaming loads are not recorded. Defaults to False.
+            on_event (Optional[Callable[[str, Any], None]]): Called with ("file", FileStats) after
+                every file read, possibly from prefetching threads, and with ("load", LoadStats) when
+                a load is done. Implies stats. Defaults to None.
+            frozen (bool): Whether loads return read-only FrozenDict and FrozenList values. Frozen
+                documents are shared instead of copied: by all the places including a file, and by
+                successive loads as long as none of the files a document was built from changed,
+                which is checked with one stat per file. Lazy, selective and streaming loads and
+                watch() are not affected. Defaults to False.
+            compact (bool): Whether to intern the keys and short string values of processed
+                documents and, with frozen, to share every repeated subtree (e.g. the same small
+                object in many files) as a single object, across all the files and loads of this
+                loader. Saves memory at the cost of one more pass over every document. Defaults to False.
+            max_include_depth (Optional[int]): Deepest include level a load may reach, the root file
+                being at level 0. Defaults to None (no limit).
+            max_files (Optional[int]): Maximum number of files a load may read. Defaults to None (no limit).
+            max_bytes (Optional[int]): Maximum total size of the files a load may read, checked with
+                a stat before reading each file. Defaults to None (no limit).
+            max_nodes (Optional[int]): Maximum number of dicts, lists and scalars a load may produce:
+                those of the parsed files, plus those of the copies of included data made for every
+                further include site of a file. Defaults to None (no limit).
+                The limits are checked as soon as the amounts grow and raise LoadLimitError; they
+                apply to load_file, load_many, aload_file, iter_file and watch, including the files
+                read ahead by prefetching, but not to lazy or selective loads, nor to results taken
+                from the on-disk cache.
         """
         self.enable_key = enable_key
         self.comment_string = comment_string
@@ -33,12 +230,78 @@ class PypayaJSON:
             raise ValueError("path_annotation_prefix cannot be empty (risk of conflicts)")
         self.path_annotation_prefix = path_annotation_prefix
 
+        self._cache = FileCache(cache_max_entries, cache_max_bytes) if cache else None
+        self.parser = parser
+        self._parse = get_parser(parser)
+
+        if prefetch_workers < 0:
+            raise ValueError("prefetch_workers cannot be negative")
+        self.prefetch_workers = prefetch_workers
+
+        self._disk_cache = DiskCache(disk_cache, disk_cache_hash) if disk_cache is not None else None
+
+        if partial_parse_min_bytes is not None and partial_parse_min_bytes < 0:
+            raise ValueError("partial_parse_min_bytes cannot be negative")
+        self.partial_parse_min_bytes = partial_parse_min_bytes
+
+        if mmap_min_bytes is not None and mmap_min_bytes < 0:
+            raise ValueError("mmap_min_bytes cannot be negative")
+        self.mmap_min_bytes = mmap_min_bytes
+
+        self.path_resolution = path_resolution
+        self._paths = PathResolver(path_resolution, path_cache, path_cache_ttl)
+        self._listing = DirectoryListing()  # Directory listings of fragment includes, across loads
+
+        self.stats = stats or on_event is not None
+        self.on_event = on_event
+        self.last_stats = None  # LoadStats of the last finished load, when recorded
+
+        self.frozen = frozen
+        # absolute path -> ({absolute path: signature} of the files it was built from, frozen document)
+        self._frozen_documents = {} if frozen else None
+        self.compact = compact
+        self._compactor = Compactor() if compact else None
+
+        for name, value in (("max_include_depth", max_include_depth), ("max_files", max_files),
+                            ("max_bytes", max_bytes), ("max_nodes", max_nodes)):
+            if value is not None and value < 0:
+                raise ValueError(f"{name} cannot be negative")
+        self.max_include_depth = max_include_depth
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Picklable state, e.g. for process pools: caches start empty and on_event is dropped."""
+        state = self.__dict__.copy()
+        if self._cache is not None:
+            state["_cache"] = (self._cache.max_entries, self._cache.max_bytes)
+        if isinstance(self.parser, str):
+            del state["_parse"]
+        state["on_event"] = None
+        state["last_stats"] = None
+        if self._frozen_documents is not None:
+            state["_frozen_documents"] = {}
+        if self._compactor is not None:
+            state["_compactor"] = Compactor(self._compactor.max_string)
+        state["_listing"] = DirectoryListing()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if state["_cache"] is not None:
+            state["_cache"] = FileCache(*state["_cache"])
+        if "_parse" not in state:
+            state["_parse"] = get_parser(state["parser"])
+        self.__dict__.update(state)
+
     @classmethod
     def load(cls, path: str,
              enable_key: str = "enabled",
              comment_string: Optional[str] = None,
              resolve_path_annotations: bool = True,
-             path_annotation_prefix: str = "@path:") -> Dict[str, Any]:
+             path_annotation_prefix: str = "@path:",
+             parser: Union[str, Callable[[bytes], Any]] = "auto",
+             prefetch_workers: int = 0) -> Dict[str, Any]:
         """
         Load a JSON file with includes (one-time usage).
 
@@ -48,45 +311,799 @@ class PypayaJSON:
             comment_string (Optional[str]): The string used to denote comments in JSON files. Defaults to None.
             resolve_path_annotations (bool): Whether to resolve path annotations. Defaults to True.
             path_annotation_prefix (str): Prefix for path annotation keys. Defaults to "@path:".
+            parser (Union[str, Callable]): JSON parser backend or callable. Defaults to "auto".
+            prefetch_workers (int): Number of threads prefetching included files. Defaults to 0.
 
         Returns:
             Dict[str, Any]: The processed JSON data.
         """
-        instance = cls(enable_key, comment_string, resolve_path_annotations, path_annotation_prefix)
+        instance = cls(enable_key, comment_string, resolve_path_annotations, path_annotation_prefix,
+                       parser=parser, prefetch_workers=prefetch_workers)
         return instance.load_file(path)
 
-    def load_file(self, path: str) -> Dict[str, Any]:
+    def load_file(self, path: str, lazy: bool = False,
+                  select: Optional[Iterable[Union[str, List[Any]]]] = None) -> Dict[str, Any]:
         """
         Load a JSON file using this instance's configuration.
 
         Args:
             path (str): The path to the JSON file.
+            lazy (bool): Whether to return read-only LazyMapping and LazySequence proxies that load
+                includes and replacements only when a key under them is first accessed. Their
+                resolve() method returns the fully processed data. Lazy loads bypass prefetching
+                and the on-disk cache. Defaults to False.
+            select (Optional[Iterable[Union[str, List[str]]]]): Key paths ("a/b" or ["a", "b"]) of the
+                only values to load. Includes, replacements and path annotations that cannot
+                contribute to them are skipped; a dictionary's include is loaded whenever a selected
+                path goes through it, as it may supply any key. The values are returned nested under
+                their key paths. Like lazy loads, selective loads bypass prefetching and the on-disk
+                cache. Defaults to None (load everything).
 
         Returns:
             Dict[str, Any]: The processed JSON data.
         """
-        with open(path, 'r') as f:
-            if self.comment_string:
-                # Remove comments before parsing
-                data = self._remove_comments(f.read())
-                json_data = json.loads(data)
+        if select is not None:
+            if lazy:
+                raise ValueError("lazy and select cannot be combined")
+            return select_paths(LazyLoad(self).document(path), select)
+        if lazy:
+            return LazyLoad(self).document(path)
+        if self.stats:
+            return self._load_with_stats(path)
+        if self._disk_cache is None:
+            return self._load(path, self._load_context())
+        return self._load_cached(path, self._load_context())
+
+    def _load_context(self) -> _LoadContext:
+        """The context of a new top-level load."""
+        context = _LoadContext()
+        context.budget = self._budget()
+        if self._frozen_documents is not None:
+            context.manifests = []
+            context.signatures = {}
+        return context
+
+    def _budget(self) -> Optional[LoadBudget]:
+        """The budget of a new top-level load, None without limits."""
+        if (self.max_include_depth is None and self.max_files is None
+                and self.max_bytes is None and self.max_nodes is None):
+            return None
+        return LoadBudget(self.max_include_depth, self.max_files, self.max_bytes, self.max_nodes)
+
+    def _load_cached(self, path: str, context: _LoadContext) -> Any:
+        """Load through the on-disk cache."""
+        key = self._disk_cache.key(path, self._settings())
+        data = self._disk_cache.get(key, _MISSING)
+        if context.stats is not None:
+            context.stats.disk_cache_hit = data is not _MISSING
+        if data is _MISSING:
+            context.files = {}
+            data = self._load(path, context)
+            self._disk_cache.put(key, context.files, data if not self.frozen else thaw(data))
+        else:
+            data = self._from_disk_cache(data)
+        return data
+
+    def _from_disk_cache(self, data: Any) -> Any:
+        """Apply frozen and compact to a result read from the on-disk cache."""
+        if self._compactor is not None:
+            return self._compactor.compact(data, share_subtrees=self.frozen)
+        return freeze(data) if self.frozen else data
+
+    def _load_with_stats(self, path: str, context: Optional[_LoadContext] = None) -> Any:
+        """Load while recording a LoadStats, stored as last_stats."""
+        if context is None:
+            context = self._load_context()
+        with self._recording_stats(path, context):
+            if self._disk_cache is None:
+                return self._load(path, context)
+            return self._load_cached(path, context)
+
+    @contextmanager
+    def _recording_stats(self, path: str, context: _LoadContext) -> Iterator[LoadStats]:
+        """Record the LoadStats of the load of path made in the block, stored as last_stats."""
+        stats = context.stats = LoadStats(os.path.abspath(path), on_event=self.on_event)
+        hits, misses = self._paths.hits, self._paths.misses
+        start = time.perf_counter()
+        yield stats
+        stats.seconds = time.perf_counter() - start
+        stats.path_cache_hits = self._paths.hits - hits
+        stats.path_cache_misses = self._paths.misses - misses
+        self.last_stats = stats
+        stats.emit("load", stats)
+
+    def _load(self, path: str, context: _LoadContext) -> Any:
+        """Load and process a file, prefetching its includes if enabled."""
+        if not self.prefetch_workers:
+            return _run(self._load_document(path, context))
+
+        with ThreadPoolExecutor(self.prefetch_workers, thread_name_prefix="pypaya-json-prefetch") as executor:
+            read = partial(self._read_json, files=context.files, stats=context.stats)
+            context.reader = Prefetcher(read, self.enable_key, executor, self._listing, self._budget())
+            try:
+                return _run(self._load_document(path, context))
+            finally:
+                context.reader.close()
+
+    def load_many(self, paths: Iterable[str], workers: int = 0, executor: str = "thread",
+                  ordered: bool = True, return_exceptions: bool = False) -> Union[List[Any], Iterator[Tuple[str, Any]]]:
+        """
+        Load many JSON files, processing the files they include once for the whole batch.
+
+        Every included file is read and processed once per batch (per chunk of the batch with
+        process workers), and each include site gets its own copy, so the results never share
+        containers. Files loaded through the on-disk cache are loaded one by one, as by load_file.
+
+        Args:
+            paths (Iterable[str]): The paths to the JSON files.
+            workers (int): Number of threads or processes loading files. 0 loads them one after
+                the other in the calling thread. Defaults to 0.
+            executor (str): "thread" or "process". Threads share the processed includes of the
+                whole batch; processes each load chunks of the batch, avoiding the GIL at the cost
+                of pickling the loader and the results. Defaults to "thread".
+            ordered (bool): Whether to return a list of the results in the order of paths. If
+                False, an iterator of (path, result) pairs in completion order is returned; the
+                files are then loaded as it is consumed. Defaults to True.
+            return_exceptions (bool): Whether errors are returned in place of the results of the
+                files that failed, instead of aborting the batch. Defaults to False.
+
+        Returns:
+            Union[List[Any], Iterator[Tuple[str, Any]]]: The processed data of every file.
+        """
+        paths = list(paths)
+        if workers < 0:
+            raise ValueError("workers cannot be negative")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}', expected 'thread' or 'process'")
+        results = self._iter_many(paths, workers, executor, return_exceptions)
+        if not ordered:
+            return ((paths[index], result) for index, result in results)
+        ordered_results = [None] * len(paths)
+        for index, result in results:
+            ordered_results[index] = result
+        return ordered_results
+
+    def _iter_many(self, paths: List[str], workers: int, executor: str,
+                   return_exceptions: bool) -> Iterator[Tuple[int, Any]]:
+        """Load a batch, yielding (index in paths, result) pairs as loads complete."""
+        if not workers:
+            documents = {}
+            for index, path in enumerate(paths):
+                yield index, self._load_batched(path, documents, return_exceptions)
+            return
+
+        if executor == "thread":
+            pool = ThreadPoolExecutor(workers, thread_name_prefix="pypaya-json-batch")
+            documents = {}
+            futures = {pool.submit(self._load_batched, path, documents, return_exceptions): [index]
+                       for index, path in enumerate(paths)}
+        else:
+            pool = ProcessPoolExecutor(workers)
+            # A few chunks per process balance the load while still sharing includes within chunks
+            size = max(1, -(-len(paths) // (workers * 4)))
+            futures = {pool.submit(_load_chunk, self, paths[start:start + size], return_exceptions):
+                       range(start, min(start + size, len(paths)))
+                       for start in range(0, len(paths), size)}
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if executor == "thread":
+                    result = [result]
+                yield from zip(futures[future], result)
+        finally:
+            # Stop early on errors and when the iterator is closed
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+
+    def _load_batched(self, path: str, documents: Dict[str, Any], return_exceptions: bool) -> Any:
+        """Load path as part of a batch, reusing and adding to its processed documents."""
+        try:
+            if self._disk_cache is not None or self.frozen:
+                # Frozen documents are shared by all loads anyway
+                return self.load_file(path)
+            key = os.path.abspath(path)
+            document = documents.get(key, _MISSING)
+            if document is not _MISSING:
+                return _copy_tree(document)
+            context = _LoadContext()
+            context.documents = documents
+            context.copy_always = True
+            context.budget = self._budget()
+            data = self._load_with_stats(path, context) if self.stats else self._load(path, context)
+            # The result itself is handed out; files including it later process it again
+            documents.pop(key, None)
+            return data
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    @classmethod
+    async def aload(cls, path: str,
+                    enable_key: str = "enabled",
+                    comment_string: Optional[str] = None,
+                    resolve_path_annotations: bool = True,
+                    path_annotation_prefix: str = "@path:",
+                    parser: Union[str, Callable[[bytes], Any]] = "auto",
+                    max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Load a JSON file with includes without blocking the event loop (one-time usage).
+
+        Args:
+            path (str): The path to the JSON file.
+            enable_key (str): The key used to enable or disable inclusions. Defaults to "enabled".
+            comment_string (Optional[str]): The string used to denote comments in JSON files. Defaults to None.
+            resolve_path_annotations (bool): Whether to resolve path annotations. Defaults to True.
+            path_annotation_prefix (str): Prefix for path annotation keys. Defaults to "@path:".
+            parser (Union[str, Callable]): JSON parser backend or callable. Defaults to "auto".
+            max_concurrency (int): Maximum number of files read at the same time. Defaults to 8.
+
+        Returns:
+            Dict[str, Any]: The processed JSON data.
+        """
+        instance = cls(enable_key, comment_string, resolve_path_annotations, path_annotation_prefix,
+                       parser=parser)
+        return await instance.aload_file(path, max_concurrency)
+
+    async def aload_file(self, path: str, max_concurrency: int = 8,
+                         executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Load a JSON file using this instance's configuration, without blocking the event loop.
+
+        Files are read and parsed on an executor; the includes of a document are read
+        concurrently. The processed data is the same as with load_file.
+
+        Args:
+            path (str): The path to the JSON file.
+            max_concurrency (int): Maximum number of files read at the same time. Defaults to 8.
+            executor (Optional[Executor]): Executor used for reading and processing. Defaults to
+                the event loop's default executor.
+
+        Returns:
+            Dict[str, Any]: The processed JSON data.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer")
+        context = self._load_context()
+        if not self.stats:
+            return await self._aload(path, context, max_concurrency, executor)
+        with self._recording_stats(path, context):
+            return await self._aload(path, context, max_concurrency, executor)
+
+    async def _aload(self, path: str, context: _LoadContext, max_concurrency: int,
+                     executor: Optional[Executor]) -> Any:
+        """Body of aload_file."""
+        loop = asyncio.get_running_loop()
+        if self._disk_cache is not None:
+            key = self._disk_cache.key(path, self._settings())
+            data = await loop.run_in_executor(executor, self._disk_cache.get, key, _MISSING)
+            if context.stats is not None:
+                context.stats.disk_cache_hit = data is not _MISSING
+            if data is not _MISSING:
+                return self._from_disk_cache(data)
+            context.files = {}
+
+        read = partial(self._read_json, files=context.files, stats=context.stats)
+        context.reader = await preload(path, read, self.enable_key, max_concurrency, executor, self._listing,
+                                       self._budget())
+        data = await loop.run_in_executor(executor, _run, self._load_document(path, context))
+        if self._disk_cache is not None:
+            stored = data if not self.frozen else thaw(data)
+            await loop.run_in_executor(executor, self._disk_cache.put, key, context.files, stored)
+        return data
+
+    def iter_file(self, path: str, key_path: Optional[Union[str, List[Any]]] = None) -> Iterator[Any]:
+        """
+        Iterate over the processed elements of a JSON array, one at a time.
+
+        Included arrays are streamed rather than spliced in: their files are parsed one element
+        at a time, so memory use does not grow with the length of the arrays. Every element is
+        processed as by load_file, including enable filtering and path annotations. Files are
+        only streamed when comment_string is None and the include has no keys_path or keys;
+        other includes are loaded whole. An array at a key path is streamed as well, after
+        scanning the file for it, unless a dictionary on the way has an include or replace_value
+        declaration, a path annotation of the next key, or a list index; the file is then loaded
+        lazily, and the array with it.
+
+        Args:
+            path (str): The path to the JSON file.
+            key_path (Optional[Union[str, List[Any]]]): Key path ("a/b" or ["a", "b"]) of the
+                array in the file. Defaults to None, for a file that is an array itself.
+
+        Yields:
+            Any: The processed elements of the array.
+        """
+        if key_path is None:
+            return self._iter_elements(self._iter_raw_array(path), os.path.dirname(path),
+                                       os.path.abspath(path))
+
+        keys = key_path.split('/') if isinstance(key_path, str) else list(key_path)
+        span = self._locate_array(path, keys)
+        if span is not None:
+            return self._iter_elements(iter_array(path, start=span[0], end=span[1]), os.path.dirname(path),
+                                       os.path.abspath(path))
+        data = LazyLoad(self).document(path)
+        for key in keys:
+            data = data[key]
+        if isinstance(data, LazySequence):
+            unprocessed = data._unprocessed()
+            if unprocessed is not None:
+                return self._iter_elements(iter(unprocessed[0]), unprocessed[1], None)
+        if isinstance(data, (list, LazySequence)):
+            return (resolve(item) for item in data)
+        raise TypeError(f"The value at {key_path!r} in {path} is not an array")
+
+    def _locate_array(self, path: str, keys: List[Any]) -> Optional[Tuple[int, int]]:
+        """Byte range of the array at keys in the file at path, None if it cannot be streamed from there."""
+        if self.comment_string or not keys or not all(isinstance(k, str) for k in keys):
+            return None
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                try:
+                    span = locate(buf, keys, self._locate_reject(keys), self.enable_key)
+                except ValueError:
+                    return None  # Invalid JSON, reported by the regular load
+                if span is None or buf[span[0]:span[0] + 1] != b"[":
+                    return None
+        return span
+
+    def _iter_raw_array(self, path: str) -> Iterator[Any]:
+        """Iterate over the unprocessed elements of the array in a file."""
+        if self.comment_string:
+            data = self._read_json(path)
+            if not isinstance(data, list):
+                raise ValueError(f"{path} does not contain a JSON array")
+            return iter(data)
+        return iter_array(path)
+
+    def _iter_elements(self, items: Iterator[Any], base_dir: str, source: Optional[str]) -> Iterator[Any]:
+        """Process unprocessed array elements one at a time, streaming included array files.
+
+        The documents included by the elements are kept for the following elements, up to
+        _STREAM_DOCUMENTS of them: the oldest ones are dropped between elements, and read again
+        if a later element includes them.
+        """
+        enable_key = self.enable_key
+        context = _LoadContext()
+        budget = context.budget = self._budget()
+        if budget is not None and source is not None:
+            budget.enter(source, source, 0)
+        streaming = {source}  # Absolute paths of the files being streamed
+        # Entries are (unprocessed elements, base directory, absolute path of the streamed file)
+        stack = [(items, base_dir, source)]
+        while stack:
+            items, base_dir, source = stack[-1]
+            for item in items:
+                documents = context.documents
+                while len(documents) > _STREAM_DOCUMENTS:
+                    key = next(iter(documents))
+                    del documents[key]
+                    context.claimed.discard(key)
+                    if budget is not None:
+                        budget.sited.discard(key)
+                while len(context.partials) > _STREAM_DOCUMENTS:
+                    del context.partials[next(iter(context.partials))]
+                spec = item.get("include", _MISSING) if isinstance(item, dict) else _MISSING
+                if spec is not _MISSING and not (enable_key in item and not item[enable_key]) and not (
+                        isinstance(spec, dict) and enable_key in spec and not spec[enable_key]):
+                    spec = self._process_spec(spec, base_dir)
+                    if fragment_pattern(spec) is not None:
+                        # Fragments are loaded whole, one after the other
+                        context.depth = len(stack)
+                        for fragment in self._fragment_specs(spec, base_dir, context):
+                            included_data = _run(self._load_from_spec(fragment, base_dir, context))
+                            yield from included_data if isinstance(included_data, list) else [included_data]
+                        continue
+                    full_path = os.path.join(base_dir, spec["filename"])
+                    if ("keys_path" not in spec and "keys" not in spec and not self.comment_string
+                            and is_array_file(full_path)):
+                        key = os.path.abspath(full_path)
+                        if key in streaming:
+                            cycle = [entry[2] for entry in stack if entry[2] is not None] + [key]
+                            raise ValueError(f"Circular include of {full_path}: {' -> '.join(cycle[cycle.index(key):])}")
+                        if budget is not None:
+                            budget.enter(key, full_path, len(stack))
+                        streaming.add(key)
+                        stack.append((iter_array(full_path), os.path.dirname(full_path), key))
+                        break
+                    context.depth = len(stack)
+                    included_data = _run(self._load_from_spec(spec, base_dir, context))
+                    yield from included_data if isinstance(included_data, list) else [included_data]
+                    continue
+                if budget is not None:
+                    budget.add_nodes(item, source or base_dir)
+                # Processed as the only element of a list, for the same enable filtering
+                yield from _run(self._walk([item], base_dir, context, True))
             else:
-                json_data = json.load(f)
-        base_dir = os.path.dirname(path)
-        return self._process_data(json_data, base_dir)
+                stack.pop()
+                streaming.discard(source)
+
+    def dependency_graph(self, path: str) -> DependencyGraph:
+        """
+        Find the files a load of path depends on, without processing them.
+
+        Args:
+            path (str): The path to the JSON file.
+
+        Returns:
+            DependencyGraph: The include and replace_value declarations connecting the files
+                (including disabled ones) and the size of every file that would be read.
+        """
+        return build_graph(path, self._read_json, self.enable_key, self._listing)
+
+    def watch(self, path: str) -> LoadedConfig:
+        """
+        Load a JSON file into a handle that can be refreshed when its files change.
+
+        Args:
+            path (str): The path to the JSON file.
+
+        Returns:
+            LoadedConfig: The handle; the processed data is in its data attribute.
+        """
+        return LoadedConfig(self, path)
+
+    def publish(self, path: str, file: Optional[str] = None) -> SharedConfig:
+        """
+        Load a JSON file once into a read-only view that worker processes can share.
+
+        Publish before forking the workers (e.g. in a prefork server's master process): the
+        serialized data is in a memory mapping that no process writes to, so it stays shared
+        between all of them, and every worker parses only the values it reads.
+
+        Args:
+            path (str): The path to the JSON file.
+            file (Optional[str]): File to write the serialized data to, so that processes that
+                were not forked from this one can attach with SharedConfig.open(file). Defaults
+                to None: an anonymous mapping, inherited by the processes forked afterwards.
 
-    def _remove_comments(self, json_string: str) -> str:
-        """Remove comments from JSON string."""
-        lines = json_string.split('\n')
-        return '\n'.join(line.split(self.comment_string)[0].rstrip() for line in lines)
+        Returns:
+            SharedConfig: The read-only view of the processed data.
+        """
+        return SharedConfig.publish(self.load_file(path), file, self._parse)
+
+    def _load_incremental(self, path: str, reader: Any, documents: Dict[str, Any]) -> Tuple[Any, _LoadContext]:
+        """Load a file reusing the given processed documents, recording which documents include which.
+
+        The documents are never handed out or modified: every include site gets a copy.
+        """
+        context = _LoadContext()
+        context.budget = self._budget()
+        context.reader = reader
+        context.documents = documents
+        context.files = {}  # The reader reads the files, only the directories listed end up here
+        context.includes = {}
+        context.copy_always = True
+        return _run(self._load_document(path, context)), context
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Return parsed-file cache statistics, or None if caching is disabled."""
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Drop all parsed files from the cache, the documents kept by frozen and compact loads, and directory listings."""
+        if self._cache is not None:
+            self._cache.clear()
+        if self._frozen_documents is not None:
+            self._frozen_documents.clear()
+        if self._compactor is not None:
+            self._compactor.clear()
+        self._listing.clear()
+
+    def path_cache_clear(self) -> None:
+        """Drop all memoized path annotation resolutions, e.g. after symlinks changed.
+
+        The documents kept by frozen loads hold resolved paths too, they are dropped as well.
+        """
+        self._paths.clear()
+        if self._frozen_documents is not None:
+            self._frozen_documents.clear()
+
+    def disk_cache_clear(self) -> None:
+        """Remove all entries from the on-disk cache directory."""
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+    def _settings(self) -> Tuple[Any, ...]:
+        """The loader settings the processed result depends on."""
+        parser = self.parser
+        if not isinstance(parser, str):
+            parser = f"{getattr(parser, '__module__', None)}.{getattr(parser, '__qualname__', repr(parser))}"
+        return (self.enable_key, self.comment_string, self.resolve_path_annotations,
+                self.path_annotation_prefix, parser, self.path_resolution)
+
+    def _read_json(self, path: str, files: Optional[Dict[str, Tuple[int, int]]] = None,
+                   stats: Optional[LoadStats] = None, record: Optional[FileStats] = None) -> Any:
+        """Read and parse a JSON file, going through the parsed-file cache if enabled.
+
+        Cached documents are handed out as-is: _process_data never mutates its input,
+        it always builds new containers for the processed result. If files is given, the
+        signature of the file, taken before reading it, is recorded in it. If stats is given,
+        the cost of reading the file is added to it; if record is given, it is measured into it.
+        """
+        if files is not None:
+            files[os.path.abspath(path)] = file_signature(path)
+        if stats is not None:
+            record = FileStats(os.path.abspath(path))
+            json_data = self._read_json(path, record=record)
+            record.nodes = count_nodes(json_data)
+            stats.add_file(record)
+            return json_data
+        parse = self._parse_file if record is None else partial(self._parse_file, record=record)
+        if self._cache is None:
+            return parse(path)
+
+        key = os.path.realpath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        json_data = self._cache.get(key, signature, _MISSING)
+        if record is not None:
+            record.cached = json_data is not _MISSING
+        if json_data is _MISSING:
+            json_data = parse(key)
+            self._cache.put(key, signature, json_data, stat.st_size)
+        return json_data
+
+    def _parse_file(self, path: str, record: Optional[FileStats] = None) -> Any:
+        """Read and parse a JSON file from disk.
+
+        The file is read as bytes and handed to the parser as is, without decoding it first.
+        Files of at least mmap_min_bytes are memory-mapped instead. If record is given, the
+        size of the file and the time spent reading it are stored in it.
+        """
+        start = time.perf_counter() if record is not None else 0.0
+        with open(path, 'rb') as f:
+            if self.mmap_min_bytes is not None:
+                size = os.fstat(f.fileno()).st_size
+                if size and size >= self.mmap_min_bytes:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                        has_comments = bool(self.comment_string) and has_comment_markers(buf, self.comment_string)
+                        if accepts_buffers(self._parse) and not has_comments:
+                            if record is not None:
+                                record.bytes = size
+                                record.read_seconds = time.perf_counter() - start
+                            return self._parse_data(buf, has_comments=False, record=record)
+                        # Stripping comments and other parsers need bytes
+                        data = buf[:]
+                    if record is not None:
+                        record.bytes = size
+                        record.read_seconds = time.perf_counter() - start
+                    return self._parse_data(data, has_comments, record)
+            data = f.read()
+        if record is not None:
+            record.bytes = len(data)
+            record.read_seconds = time.perf_counter() - start
+        return self._parse_data(data, record=record)
+
+    def _parse_data(self, data: Union[bytes, mmap.mmap], has_comments: Optional[bool] = None,
+                    record: Optional[FileStats] = None) -> Any:
+        """Parse the contents of a file, given as bytes or as a memory map."""
+        if self.comment_string:
+            if has_comments is None:
+                has_comments = has_comment_markers(data, self.comment_string)
+            if has_comments:
+                return self._parse_stripped(data, record)
+            try:
+                return self._parse_raw(data, record)
+            except ValueError:
+                # No comments, but possibly trailing commas: only the full scan removes those
+                return self._parse_stripped(data[:], record)
+        return self._parse_raw(data, record)
+
+    def _parse_raw(self, data: Union[bytes, mmap.mmap], record: Optional[FileStats] = None) -> Any:
+        """Hand the contents of a file to the parser."""
+        if record is not None:
+            start = time.perf_counter()
+            try:
+                return self._parse_raw(data)
+            finally:
+                record.parse_seconds += time.perf_counter() - start
+        if isinstance(data, mmap.mmap):
+            # The view must be released before the mapping can be closed
+            with memoryview(data) as view:
+                return self._parse(view)
+        return self._parse(data)
+
+    def _parse_stripped(self, data: Union[str, bytes], record: Optional[FileStats] = None) -> Any:
+        """Remove comments and trailing commas, then parse."""
+        if record is None:
+            return self._parse(self._remove_comments(data))
+        start = time.perf_counter()
+        data = self._remove_comments(data)
+        stripped = time.perf_counter()
+        record.strip_seconds += stripped - start
+        try:
+            return self._parse(data)
+        finally:
+            record.parse_seconds += time.perf_counter() - stripped
+
+    def _load_document(self, path: str, context: _LoadContext) -> Generator:
+        """Task that loads and processes a file, at most once per top-level load."""
+        key = os.path.abspath(path)
+        tracked = context.includes is not None
+        if tracked and context.active:
+            context.includes.setdefault(context.active[-1], set()).add(key)
+        document = context.documents.get(key, _MISSING)
+        manifests = context.manifests
+        if document is _MISSING and manifests is not None:
+            document = self._reuse_frozen(key, context)
+        if document is _MISSING:
+            if key in context.loading:
+                raise _circular_include(path, key, context)
+            context.loading[key] = None
+            budget = context.budget
+            if budget is not None:
+                budget.enter(key, path, context.depth)
+            if manifests is not None:
+                # Taken before reading, so that a change during the load invalidates the document
+                signature = context.signatures[key] = file_signature(path)
+                manifests.append({key: signature})
+            if context.reader is None:
+                json_data = self._read_json(path, context.files, context.stats)
+            else:
+                json_data = context.reader.get(path)
+            if budget is not None:
+                budget.add_nodes(json_data, path)
+            if context.stats is not None:
+                context.stats.set_depth(key, context.depth)
+            if tracked:
+                context.active.append(key)
+            context.depth += 1
+            document = yield self._walk(json_data, os.path.dirname(path), context, True)
+            context.depth -= 1
+            if tracked:
+                context.active.pop()
+            if self._compactor is not None:
+                # Subtrees are shared by frozen loads only, watch() hands out plain data
+                document = self._compactor.compact(document, share_subtrees=manifests is not None)
+            if manifests is not None:
+                document = freeze(document)
+                self._frozen_documents[key] = (manifests.pop(), document)
+            del context.loading[key]
+            context.documents[key] = document
+        if manifests:
+            # The files of an included document are files of the including one too
+            entry = self._frozen_documents.get(key)
+            if entry is not None:
+                manifests[-1].update(entry[0])
+        return document
+
+    def _reuse_frozen(self, key: str, context: _LoadContext) -> Any:
+        """The frozen document of the file with absolute path key from an earlier load, if none of its files changed."""
+        entry = self._frozen_documents.get(key)
+        if entry is None:
+            return _MISSING
+        manifest, document = entry
+        signatures = context.signatures
+        for path, signature in manifest.items():
+            current = signatures.get(path, _MISSING)
+            if current is _MISSING:
+                try:
+                    current = signatures[path] = file_signature(path)
+                except OSError:
+                    return _MISSING
+            if current != signature:
+                return _MISSING
+        if context.files is not None:
+            context.files.update(manifest)
+        context.documents[key] = document
+        return document
+
+    def _remove_comments(self, json_string: Union[str, bytes]) -> Union[str, bytes]:
+        """Remove comments and trailing commas from JSON text or bytes."""
+        return strip_comments(json_string, self.comment_string)
 
     def load_from_spec(self, spec: Dict[str, Any], base_dir: str) -> Any:
         """Load data from a file specified in the 'spec' dictionary."""
+        return _run(self._load_from_spec(spec, base_dir, _LoadContext()))
+
+    def _load_from_spec(self, spec: Dict[str, Any], base_dir: str, context: _LoadContext) -> Generator:
+        """Task version of load_from_spec."""
         full_path = os.path.join(base_dir, spec["filename"])
-        data = self.load_file(full_path)
+        key = os.path.abspath(full_path)
+        if "keys_path" in spec and self._can_parse_partially(key, context):
+            data = yield self._load_partial(full_path, spec["keys_path"], context)
+            if data is not _MISSING:
+                # Processed for this include site only, nothing to share or copy
+                return self._select(data, spec, keys_path=False)
+        data = yield self._load_document(full_path, context)
+        data = self._select(data, spec)
+        if context.budget is not None:
+            context.budget.add_site(key, data, full_path)
+
+        # The first include site may take the memoized document itself; later ones get their own
+        # copy of the part they selected so that include sites never share containers.
+        # Frozen documents are read-only, every include site shares them
+        if context.manifests is not None:
+            return data
+        if context.copy_always or key in context.claimed:
+            return _copy_tree(data)
+        context.claimed.add(key)
+        return data
+
+    def _can_parse_partially(self, key: str, context: _LoadContext) -> bool:
+        """Whether the file with absolute path key may be parsed partially in this load."""
+        return (self.partial_parse_min_bytes is not None and not self.comment_string
+                and context.reader is None and context.includes is None and context.manifests is None
+                and key not in context.documents and key not in context.loading)
+
+    def _locate_reject(self, keys: List[str]) -> Callable[[int, str], bool]:
+        """The reject callback of locate for keys, giving up where processing could change the value."""
+        prefix = self.path_annotation_prefix if self.resolve_path_annotations else None
+
+        def reject(level, key):
+            # Keys that could supply, replace or override the selected value once processed
+            return key == "include" or key == "replace_value" or (prefix is not None and key == prefix + keys[level])
+        return reject
+
+    def _load_partial(self, path: str, keys_path: Union[str, List[Any]], context: _LoadContext) -> Generator:
+        """Task that parses and processes only the value at keys_path of a large file.
+
+        Returns _MISSING if the file is too small or the value cannot be taken from the file
+        alone, in which case the whole file has to be loaded. A single value is parsed partially
+        per file and load: further include sites of the same value get a copy of it, and a
+        different value of the same file also returns _MISSING, so that the file is parsed whole
+        once rather than scanned again for every value.
+        """
+        keys = keys_path.split('/') if isinstance(keys_path, str) else keys_path
+        if not keys or not all(isinstance(k, str) for k in keys):
+            return _MISSING
+        key = os.path.abspath(path)
+        partial = context.partials.get(key)
+        if partial is not None:
+            if partial[0] != tuple(keys):
+                return _MISSING
+            if context.budget is not None:
+                context.budget.add_nodes(partial[1], path)
+            return _copy_tree(partial[1])
+        signature = file_signature(path) if context.files is not None else None
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < max(self.partial_parse_min_bytes, 1):
+                return _MISSING
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                span = locate(buf, keys, self._locate_reject(keys), self.enable_key)
+                if span is None:
+                    return _MISSING
+                raw = buf[span[0]:span[1]]
+        located = time.perf_counter()
+        value = self._parse(raw)
+        parsed = time.perf_counter()
+        if isinstance(value, dict) and self.enable_key in value and not value[self.enable_key]:
+            return _MISSING  # Filtered out of the processed document, let the full load report it
+        if signature is not None:
+            context.files[key] = signature
+        if context.stats is not None:
+            # Scanned up to the end of the value, of which only the value was parsed
+            context.stats.add_file(FileStats(key, context.depth, span[1], located - start,
+                                             parse_seconds=parsed - located,
+                                             nodes=count_nodes(value)))
 
+        partial_key = (key, tuple(keys))
+        if partial_key in context.loading:
+            raise _circular_include(path, partial_key, context)
+        budget = context.budget
+        if budget is not None:
+            budget.enter(key, path, context.depth, size)
+            budget.add_nodes(value, path)
+        context.loading[partial_key] = None
+        context.depth += 1
+        data = yield self._walk(value, os.path.dirname(path), context, True)
+        context.depth -= 1
+        del context.loading[partial_key]
+        context.partials[key] = (partial_key[1], data)
+        return data
+
+    def _select(self, data: Any, spec: Dict[str, Any], keys_path: bool = True) -> Any:
+        """Take the part of included data selected by the keys_path (unless keys_path=False) and keys of spec."""
         # Navigate to nested keys if keys_path is present
-        if "keys_path" in spec:
+        if keys_path and "keys_path" in spec:
             keys = spec["keys_path"]
             if isinstance(keys, str):
                 keys = keys.split('/')
@@ -94,11 +1111,10 @@ class PypayaJSON:
                 data = data[key]
 
         if "keys" in spec:
-            if isinstance(data, list):
+            if isinstance(data, (list, LazySequence)):
                 data = [data[i] for i in spec["keys"]]
-            elif isinstance(data, dict):
+            elif isinstance(data, (dict, LazyMapping)):
                 data = {self._get_last_key(k): self._navigate_nested_key(data, k) for k in spec["keys"]}
-
         return data
 
     def _get_last_key(self, key: Union[str, List[str]]) -> str:
@@ -122,129 +1138,236 @@ class PypayaJSON:
             data = data[k]
         return data
 
-    def _is_enabled(self, data: Any) -> bool:
-        """Check if a data element is enabled according to the enable_key."""
-        return not isinstance(data, dict) or self.enable_key not in data or data[self.enable_key]
+    def _resolve_single_path(self, path_str: str, base_dir: str) -> str:
+        """Resolve a single path string relative to base_dir."""
+        return self._paths.resolve(path_str, base_dir)
 
-    def _handle_enabled_flag(self, data: Any) -> Any:
-        """Filter data based on enabled flags."""
-        if isinstance(data, dict):
-            return {k: self._handle_enabled_flag(v) for k, v in data.items() if self._is_enabled(v)}
-        elif isinstance(data, list):
-            return [self._handle_enabled_flag(item) for item in data if self._is_enabled(item)]
-        return data
+    def _process_spec(self, spec: Any, base_dir: str) -> Any:
+        """Apply enable filtering and path annotation resolution, without expanding includes."""
+        return _run(self._walk(spec, base_dir, _LoadContext(), False))
 
-    def _has_path_annotations(self, obj: Any) -> bool:
-        """Quick check to determine if path annotation processing is needed."""
-        if isinstance(obj, dict):
-            return any(k.startswith(self.path_annotation_prefix) for k in obj.keys()) or \
-                any(self._has_path_annotations(v) for v in obj.values()
-                    if isinstance(v, (dict, list)))
-        elif isinstance(obj, list):
-            return any(self._has_path_annotations(item) for item in obj
-                       if isinstance(item, (dict, list)))
-        return False
-
-    def _resolve_path_annotations(self, data: Any, base_dir: str) -> Any:
-        """Resolve @path: annotations to absolute paths."""
-        if isinstance(data, dict):
-            result = {}
-            for key, value in data.items():
-                if key.startswith(self.path_annotation_prefix) and isinstance(value, str):
-                    # This is a path annotation - resolve it
-                    actual_key = key[len(self.path_annotation_prefix):]
-                    resolved_path = self._resolve_single_path(value, base_dir)
-                    result[actual_key] = resolved_path
-                elif isinstance(value, (dict, list)):
-                    # Recurse into nested structures
-                    result[key] = self._resolve_path_annotations(value, base_dir)
-                else:
-                    # Regular key-value pair
-                    result[key] = value
-            return result
-        elif isinstance(data, list):
-            return [self._resolve_path_annotations(item, base_dir) for item in data]
-        else:
-            return data
+    def _process_data(self, data: Any, base_dir: str) -> Any:
+        """Process data, handling includes, replacements, path annotations, and nested structures.
 
-    def _resolve_single_path(self, path_str: str, base_dir: str) -> str:
-        """Resolve a single path string relative to base_dir."""
-        if not path_str:
-            return path_str
+        Enable filtering, path annotation resolution and include/replace expansion are done in a
+        single pass that visits every node once. The input is never modified.
+        """
+        return _run(self._walk(data, base_dir, _LoadContext(), True))
 
-        path = Path(path_str)
+    def _walk(self, data: Any, base_dir: str, context: _LoadContext, expand: bool) -> Generator:
+        """Task that processes data using an explicit stack of partially processed containers.
 
-        # If relative, make it relative to base_dir (same logic as includes)
-        if not path.is_absolute():
-            path = Path(base_dir) / path
+        Every dictionary is first scanned (enable filtering and path annotations), then its
+        include or replace_value declaration is handled, and finally its nested containers are
+        pushed on the stack. The task only yields to the driver to load included documents.
 
-        return str(path.expanduser().resolve())
+        With expand=False only enable filtering and path annotation resolution are applied;
+        this is used for include specs and for lists nested directly in lists.
+        """
+        enable_key = self.enable_key
+        scan_dict = self._scan_dict if context.stats is None else partial(self._scan_dict_timed, context.stats)
+        scan_list = self._scan_list
+        holder = {None: data}
+        # Frames are (is_dict, items, result, expand); dict frames iterate over the nested
+        # (key, value) pairs left by _scan_dict, list frames over the remaining list elements.
+        # Containers are stored in their parent before being processed in place
+        stack = [(True, iter(holder.items()), holder, expand)]
+        while stack:
+            is_dict, items, result, expand = stack[-1]
+            for item in items:
+                if is_dict:
+                    key, value = item
+                    child_expand = expand
+                elif isinstance(item, dict):
+                    if enable_key in item and not item[enable_key]:
+                        continue
+                    spec = item.get("include", _MISSING) if expand else _MISSING
+                    if spec is not _MISSING and not (isinstance(spec, dict) and enable_key in spec
+                                                     and not spec[enable_key]):
+                        # The element is an include declaration: its other keys are ignored
+                        spec = yield self._walk(spec, base_dir, context, False)
+                        for fragment in self._fragment_specs(spec, base_dir, context):
+                            included_data = yield self._load_from_spec(fragment, base_dir, context)
+                            if isinstance(included_data, list):
+                                result.extend(included_data)
+                            else:
+                                result.append(included_data)
+                        continue
+                    value = item
+                    child_expand = expand
+                    key = len(result)
+                    result.append(None)
+                elif isinstance(item, list):
+                    # Lists nested directly in lists are filtered and resolved, but includes
+                    # in them are not expanded
+                    value = item
+                    child_expand = False
+                    key = len(result)
+                    result.append(None)
+                else:
+                    result.append(item)
+                    continue
 
-    def _process_data(self, data: Any, base_dir: str) -> Any:
-        """Process data, handling includes, replacements, path annotations, and nested structures."""
-        # Handle enabled flag before processing
-        data = self._handle_enabled_flag(data)
-
-        # Handle path annotations if enabled and present
-        if self.resolve_path_annotations and self._has_path_annotations(data):
-            data = self._resolve_path_annotations(data, base_dir)
-
-        if isinstance(data, list):
-            new_data = []
-            for i, v in enumerate(data):
-                if isinstance(v, dict) and "include" in v:
-                    included_data = self.load_from_spec(v["include"], base_dir)
-                    if isinstance(included_data, list):
-                        new_data.extend(included_data)
-                    else:
-                        new_data.append(included_data)
-                elif isinstance(v, dict):
-                    new_data.append(self._process_data(v, base_dir))
+                if isinstance(value, dict):
+                    child, nested = scan_dict(value, base_dir)
+                    if child_expand:
+                        if "include" in child:
+                            spec = yield self._walk(child.pop("include"), base_dir, context, False)
+                            yield self._merge_include(child, spec, base_dir, context)
+                            # Values overridden by the include are not processed
+                            nested = [(k, v) for k, v in nested if child.get(k, _MISSING) is v]
+                        if "replace_value" in child:
+                            # Applied after the include, which may supply or override it
+                            spec = yield self._walk(child["replace_value"], base_dir, context, False)
+                            result[key] = yield self._replace_value(spec, base_dir, context)
+                            continue
+                    result[key] = child
+                    if nested:
+                        stack.append((True, iter(nested), child, child_expand))
+                        break
+                elif isinstance(value, list):
+                    child, start = scan_list(value)
+                    result[key] = child
+                    if start < len(value):
+                        stack.append((False, islice(value, start, None), child, child_expand))
+                        break
+            else:
+                stack.pop()
+        return holder[None]
+
+    def _scan_dict(self, data: Dict[str, Any], base_dir: str,
+                   stats: Optional[LoadStats] = None) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+        """Filter disabled children of a dictionary and resolve its path annotations.
+
+        Returns the new dictionary, still holding the original nested containers, and the
+        (key, value) pairs of those containers. If stats is given, the time spent resolving
+        path annotations is added to it.
+        """
+        enable_key = self.enable_key
+        prefix = self.path_annotation_prefix if self.resolve_path_annotations else None
+        result = {}
+        nested = []
+        renamed = False
+        for key, value in data.items():
+            if isinstance(value, dict):
+                if enable_key in value and not value[enable_key]:
+                    continue
+                nested.append((key, value))
+            elif isinstance(value, list):
+                nested.append((key, value))
+            elif prefix is not None and isinstance(value, str) and key.startswith(prefix):
+                key = key[len(prefix):]
+                if stats is None:
+                    value = self._resolve_single_path(value, base_dir)
                 else:
-                    new_data.append(data[i])
-            return new_data
-
-        elif isinstance(data, dict):
-            if "include" in data:
-                if isinstance(data["include"], dict):
-                    included_data = self.load_from_spec(data["include"], base_dir)
-                    if isinstance(included_data, dict):
-                        data.update(included_data)
-                    else:
-                        # Insert included data into the main dictionary key positions
-                        key_path = data["include"].get("keys_path", "")
-                        if isinstance(key_path, str):
-                            key_path = key_path.split('/')
-                        elif not isinstance(key_path, list):
-                            key_path = []
-                        if key_path:
-                            last_key = key_path[-1]
-                            data[last_key] = included_data
-                        else:
-                            data["included"] = included_data  # Default to 'included' key
-
-                elif isinstance(data["include"], list):
-                    for inc in data["include"]:
-                        included_data = self.load_from_spec(inc, base_dir)
-                        if isinstance(included_data, dict):
-                            data.update(included_data)
-                        else:
-                            data["included"] = included_data  # Default to 'included' key
-                del data["include"]
-
-            if "replace_value" in data:
-                replace_spec = data["replace_value"]
-                replaced_data = self.load_from_spec(replace_spec, base_dir)
-                if "keys" in replace_spec:
-                    return {k: self._navigate_nested_key(replaced_data, k) for k in replace_spec["keys"]}
-                if "key" in replace_spec:
-                    return self._navigate_nested_key(replaced_data, replace_spec["key"])
-                return replaced_data
-
-            for k, v in data.items():
-                if isinstance(v, (dict, list)):
-                    data[k] = self._process_data(v, base_dir)
+                    start = time.perf_counter()
+                    value = self._resolve_single_path(value, base_dir)
+                    stats.path_seconds += time.perf_counter() - start
+                renamed = True
+            result[key] = value
+        if renamed:
+            # A resolved annotation may have replaced a nested container with the same key
+            nested = [(k, v) for k, v in nested if result[k] is v]
+        return result, nested
 
-            return data
+    def _scan_dict_timed(self, stats: LoadStats, data: Dict[str, Any],
+                         base_dir: str) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+        """_scan_dict adding its time, without path resolution, to stats.filter_seconds."""
+        path_seconds = stats.path_seconds
+        start = time.perf_counter()
+        result = self._scan_dict(data, base_dir, stats)
+        stats.filter_seconds += time.perf_counter() - start - (stats.path_seconds - path_seconds)
+        return result
 
-        return data
+    @staticmethod
+    def _scan_list(data: List[Any]) -> Tuple[List[Any], int]:
+        """Copy the leading scalar elements of a list; returns the copy and the index of the first container."""
+        index = 0
+        for item in data:
+            if isinstance(item, (dict, list)):
+                break
+            index += 1
+        return data[:index], index
+
+    def _merge_include(self, result: Dict[str, Any], spec: Any, base_dir: str,
+                       context: _LoadContext) -> Generator:
+        """Task that merges the data of a dictionary-level include declaration into result."""
+        merge = self._merge_included
+        if context.stats is not None:
+            merge = partial(self._merge_included_timed, context.stats)
+        if isinstance(spec, dict):
+            for fragment in self._fragment_specs(spec, base_dir, context):
+                included_data = yield self._load_from_spec(fragment, base_dir, context)
+                merge(result, included_data, spec.get("keys_path", ""))
+
+        elif isinstance(spec, list):
+            for inc in spec:
+                for fragment in self._fragment_specs(inc, base_dir, context):
+                    included_data = yield self._load_from_spec(fragment, base_dir, context)
+                    merge(result, included_data)
+
+    def _fragment_specs(self, spec: Any, base_dir: str, context: Optional[_LoadContext] = None) -> List[Any]:
+        """The specs of the files an include spec names, in order: the spec itself unless it has a pattern.
+
+        The directories listed are recorded in context as files the load depends on.
+        """
+        pattern = fragment_pattern(spec) if isinstance(spec, dict) else None
+        if pattern is None:
+            return [spec]
+        matches, listed = self._listing.expand(base_dir, pattern)
+        if not matches:
+            if "directory" not in spec:
+                if os.path.isfile(os.path.join(base_dir, spec["filename"])):
+                    return [spec]  # A file named like a pattern
+            elif not os.path.isdir(os.path.join(base_dir, spec["directory"])):
+                raise FileNotFoundError(f"Include directory not found: {os.path.join(base_dir, spec['directory'])}")
+        if context is not None and listed:
+            # A file added to or removed from a directory changes the data like a changed file
+            if context.files is not None:
+                context.files.update(listed)
+            if context.manifests:
+                context.manifests[-1].update(listed)
+            if context.includes is not None and context.active:
+                context.includes.setdefault(context.active[-1], set()).update(listed)
+        return [fragment_spec(spec, match) for match in matches]
+
+    @staticmethod
+    def _merge_included(result: Dict[str, Any], included_data: Any, key_path: Any = None) -> None:
+        """Merge the data loaded for one include spec into result.
+
+        Dictionaries are merged; other data is stored under the last key of key_path, or
+        under "included" if there is none.
+        """
+        if isinstance(included_data, dict):
+            result.update(included_data)
+            return
+        # Insert included data into the main dictionary key positions
+        if isinstance(key_path, str):
+            key_path = key_path.split('/')
+        elif not isinstance(key_path, list):
+            key_path = []
+        if key_path:
+            last_key = key_path[-1]
+            result[last_key] = included_data
+        else:
+            result["included"] = included_data  # Default to 'included' key
+
+    def _merge_included_timed(self, stats: LoadStats, result: Dict[str, Any], included_data: Any,
+                              key_path: Any = None) -> None:
+        """_merge_included adding its time to stats.merge_seconds."""
+        start = time.perf_counter()
+        self._merge_included(result, included_data, key_path)
+        stats.merge_seconds += time.perf_counter() - start
+
+    def _replace_value(self, replace_spec: Dict[str, Any], base_dir: str, context: _LoadContext) -> Generator:
+        """Task that loads the value replacing a dictionary with a replace_value declaration."""
+        replaced_data = yield self._load_from_spec(replace_spec, base_dir, context)
+        return self._select_replaced(replaced_data, replace_spec)
+
+    def _select_replaced(self, replaced_data: Any, replace_spec: Dict[str, Any]) -> Any:
+        """Take the part of the loaded data selected by the keys or key of a replace_value spec."""
+        if "keys" in replace_spec:
+            return {k: self._navigate_nested_key(replaced_data, k) for k in replace_spec["keys"]}
+        if "key" in replace_spec:
+            return self._navigate_nested_key(replaced_data, replace_spec["key"])
+        return replaced_data
@@ -0,0 +1,123 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Bumped whenever the entry layout or the processing rules change, so old entries are ignored
+FORMAT_VERSION = 1
+
+Signature = Tuple[int, int]  # (st_mtime_ns, st_size)
+
+
+def file_signature(path: str) -> Signature:
+    """The signature used to detect changes of a file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """Directory of fully processed load results, shared between processes.
+
+    Every entry holds a processed result with the manifest of the files it was built from:
+    their path, modification time, size and, optionally, a content hash. An entry is valid while
+    all its files keep the recorded modification time and size; with hashing enabled, a file whose
+    stats changed but whose contents did not (e.g. after a checkout) keeps the entry valid too.
+    Entries are serialized with marshal and written atomically, by renaming a complete temporary file.
+    """
+
+    def __init__(self, directory: str, use_hash: bool = False):
+        """
+        Initialize a cache in directory, creating it if needed.
+
+        Args:
+            directory (str): The cache directory.
+            use_hash (bool): Whether to record content hashes of the files. Defaults to False.
+        """
+        self.directory = directory
+        self.use_hash = use_hash
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, path: str, settings: Hashable) -> str:
+        """The name of the entry for loading path with the given loader settings."""
+        # The marshal format may change between Python versions
+        identity = (FORMAT_VERSION, sys.version_info[:2], os.path.abspath(path), settings)
+        return hashlib.sha256(repr(identity).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Return the result stored under key if its files are unchanged, otherwise default."""
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                version, manifest, result = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return default  # Missing, unreadable or written by another version
+        if version != FORMAT_VERSION:
+            return default
+        for path, mtime_ns, size, digest in manifest:
+            try:
+                if file_signature(path) == (mtime_ns, size):
+                    continue
+                if digest is None or file_digest(path) != digest:
+                    return default
+            except OSError:
+                return default
+        return result
+
+    def put(self, key: str, files: Dict[str, Signature], result: Any) -> bool:
+        """
+        Store result under key, with the signatures of the files it was built from.
+
+        The entry is not written if a file changed since its signature was taken, or if the
+        result cannot be serialized (e.g. objects produced by a custom parser).
+
+        Returns:
+            bool: Whether the entry was written.
+        """
+        manifest = []
+        for path, signature in sorted(files.items()):
+            try:
+                digest = file_digest(path) if self.use_hash and not os.path.isdir(path) else None
+                if file_signature(path) != signature:
+                    return False
+            except OSError:
+                return False
+            manifest.append((path, signature[0], signature[1], digest))
+        try:
+            blob = marshal.dumps((FORMAT_VERSION, manifest, result))
+        except ValueError:
+            return False
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(temp_path, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".cache"):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".cache")
@@ -0,0 +1,135 @@
+import fnmatch
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pypaya_json.disk_cache import Signature
+
+_MAGIC = re.compile(r"[*?[]")
+_SEPARATORS = re.compile(r"[/\\]" if os.sep == "\\" else "/")
+# Directories modified more recently than this (in ns) are listed again: an entry added within
+# the same tick of the file system clock would not change their modification time
+_RACY_NS = 2 * 10 ** 9
+
+Listing = Tuple[Signature, List[Tuple[str, bool]]]  # (signature of the directory, sorted [(name, is a directory)])
+
+
+def fragment_pattern(spec: Dict[str, Any]) -> Optional[str]:
+    """The glob pattern of an include spec naming several files, None if it names a single file.
+
+    A spec names several files with a "directory" (and an optional "pattern", "*.json" by
+    default) or with a "filename" containing glob characters.
+    """
+    directory = spec.get("directory")
+    if isinstance(directory, str):
+        return directory.rstrip("/\\") + "/" + spec.get("pattern", "*.json")
+    filename = spec.get("filename")
+    if isinstance(filename, str) and _MAGIC.search(filename):
+        return filename
+    return None
+
+
+def fragment_spec(spec: Dict[str, Any], filename: str) -> Dict[str, Any]:
+    """The include spec of one of the files matched by a fragment spec."""
+    result = {key: value for key, value in spec.items() if key != "directory" and key != "pattern"}
+    result["filename"] = filename
+    return result
+
+
+class DirectoryListing:
+    """Expands glob patterns, keeping directory listings until the directories change.
+
+    A listing is reused while the modification time and size of its directory are unchanged,
+    which adding, removing or renaming an entry changes; expanding a pattern again then costs
+    one stat per directory visited. Directories modified in the last two seconds are always
+    listed again. As with glob, names starting with a dot only match
+    pattern components that start with a dot, and "**" matches any number of directories.
+    """
+
+    def __init__(self):
+        self._listings: Dict[str, Listing] = {}  # absolute path -> listing of the directory
+
+    def expand(self, base_dir: str, pattern: str) -> Tuple[List[str], Dict[str, Signature]]:
+        """
+        Find the files matching a glob pattern.
+
+        Args:
+            base_dir (str): The directory relative patterns start from.
+            pattern (str): The pattern, with "/" separating components.
+
+        Returns:
+            Tuple[List[str], Dict[str, Signature]]: The paths of the matching files, written like
+                the pattern (relative to base_dir unless it is absolute) and sorted, and the
+                signatures of the directories listed, by absolute path.
+        """
+        parts = _SEPARATORS.split(pattern)
+        first = next((i for i, part in enumerate(parts) if _MAGIC.search(part) or part == "**"), len(parts))
+        prefix = "/".join(parts[:first])
+        if first == len(parts):  # Nothing to expand
+            return ([prefix] if os.path.isfile(os.path.join(base_dir, prefix)) else []), {}
+        if first == 1 and parts[0] == "":
+            prefix = "/"  # A pattern component right below the root
+        matches = []
+        listed = {}
+        # Entries are (path of a directory, written like the pattern, index of the next component)
+        stack = [(prefix, first)]
+        while stack:
+            directory, index = stack.pop()
+            listing = self._list(os.path.join(base_dir, directory or os.curdir), listed)
+            part = parts[index]
+            last = index + 1 == len(parts)
+            if part == "**":
+                if last:
+                    matches.extend(_join(directory, name) for name, is_dir in listing
+                                   if not is_dir and not name.startswith("."))
+                else:
+                    stack.append((directory, index + 1))  # No directory
+                # One directory more
+                stack.extend((_join(directory, name), index) for name, is_dir in listing
+                             if is_dir and not name.startswith("."))
+                continue
+            kinds = dict(listing)
+            if _MAGIC.search(part):
+                names = fnmatch.filter([name for name, _ in listing if part.startswith(".") or not name.startswith(".")],
+                                       part)
+            else:
+                names = [part] if part in kinds else []
+            for name in names:
+                if last:
+                    if not kinds[name]:
+                        matches.append(_join(directory, name))
+                elif kinds[name]:
+                    stack.append((_join(directory, name), index + 1))
+        return sorted(set(matches)), listed
+
+    def clear(self) -> None:
+        """Forget all listings."""
+        self._listings = {}
+
+    def _list(self, directory: str, listed: Dict[str, Signature]) -> List[Tuple[str, bool]]:
+        """The sorted (name, is a directory) entries of a directory, recording its signature in listed."""
+        key = os.path.abspath(directory)
+        try:
+            stat = os.stat(key)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._listings.get(key)
+        if entry is None or entry[0] != signature:
+            try:
+                with os.scandir(key) as entries:
+                    names = sorted((e.name, e.is_dir()) for e in entries)
+            except NotADirectoryError:
+                return []
+            entry = (signature, names)
+            if time.time_ns() - stat.st_mtime_ns > _RACY_NS:
+                self._listings[key] = entry
+        listed[key] = signature
+        return entry[1]
+
+
+def _join(directory: str, name: str) -> str:
+    if not directory:
+        return name
+    return directory + name if directory.endswith("/") else directory + "/" + name
@@ -0,0 +1,130 @@
+from typing import Any, Dict, NoReturn
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+
+class FrozenDict(dict):
+    """Read-only dictionary returned by frozen loads.
+
+    A dict subclass, so that it is accepted wherever a dict is (isinstance checks, json.dumps,
+    comparisons with dicts), but every mutating method raises TypeError. Frozen values are
+    hashable, and copy.copy and copy.deepcopy return them unchanged; copy() returns a plain,
+    mutable dict of the same (still frozen) values.
+    """
+
+    __slots__ = ("_hash", "__weakref__")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def __reduce__(self) -> Any:
+        return type(self), (dict(self),)
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """Read-only list returned by frozen loads; see FrozenDict."""
+
+    __slots__ = ("_hash", "__weakref__")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(tuple(self))
+            return self._hash
+
+    def __reduce__(self) -> Any:
+        return type(self), (list(self),)
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenList":
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list.__repr__(self)})"
+
+
+_FROZEN = (FrozenDict, FrozenList)
+
+
+def _shallow(container: Any) -> Any:
+    return FrozenDict(container) if isinstance(container, dict) else FrozenList(container)
+
+
+def freeze(data: Any) -> Any:
+    """
+    Make a JSON tree read-only.
+
+    Dicts and lists are copied into FrozenDict and FrozenList; frozen subtrees are kept as they
+    are, so they stay shared with every other tree holding them.
+
+    Args:
+        data (Any): Processed data.
+
+    Returns:
+        Any: The frozen data.
+    """
+    if not isinstance(data, (dict, list)) or type(data) in _FROZEN:
+        return data
+    # Containers are copied shallowly, then their nested containers are replaced by frozen
+    # copies, bypassing the read-only methods (the hash is only computed on demand)
+    root = _shallow(data)
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            for key, value in dict.items(container):
+                if isinstance(value, (dict, list)) and type(value) not in _FROZEN:
+                    value = _shallow(value)
+                    dict.__setitem__(container, key, value)
+                    stack.append(value)
+        else:
+            for index, value in enumerate(container):
+                if isinstance(value, (dict, list)) and type(value) not in _FROZEN:
+                    value = _shallow(value)
+                    list.__setitem__(container, index, value)
+                    stack.append(value)
+    return root
+
+
+def thaw(data: Any) -> Any:
+    """Plain dicts and lists with the contents of frozen data, e.g. for serializers needing exact types."""
+    if not isinstance(data, (dict, list)):
+        return data
+    root = {} if isinstance(data, dict) else []
+    stack = [(data, root)]
+    while stack:
+        source, target = stack.pop()
+        for key, value in (source.items() if isinstance(source, dict) else enumerate(source)):
+            if isinstance(value, (dict, list)):
+                copy = {} if isinstance(value, dict) else []
+                stack.append((value, copy))
+                value = copy
+            if isinstance(target, dict):
+                target[key] = value
+            else:
+                target.append(value)
+    return root
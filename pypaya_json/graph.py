@@ -0,0 +1,92 @@
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from pypaya_json.fragments import DirectoryListing
+from pypaya_json.specs import iter_include_specs, spec_paths
+
+KeyPath = Union[str, List[str]]
+
+
+@dataclass(frozen=True)
+class IncludeEdge:
+    """An include or replace_value declaration of one file naming another."""
+
+    parent: str  # Absolute path of the declaring file
+    child: str  # Absolute path of the named file
+    kind: str  # "include" or "replace_value"
+    enabled: bool  # False if the declaration or one of its containers is disabled
+    keys_path: Optional[KeyPath] = None
+    keys: Optional[List[Any]] = None
+    key: Optional[KeyPath] = None  # replace_value only
+
+
+@dataclass
+class DependencyGraph:
+    """The files an include tree is built from and the declarations connecting them."""
+
+    root: str
+    edges: List[IncludeEdge] = field(default_factory=list)
+    sizes: Dict[str, int] = field(default_factory=dict)  # absolute path -> size in bytes, in discovery order
+
+    @property
+    def files(self) -> List[str]:
+        """Absolute paths of the files read by a load, root first."""
+        return list(self.sizes)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the files read by a load."""
+        return sum(self.sizes.values())
+
+    def children(self, path: str, enabled_only: bool = True) -> List[IncludeEdge]:
+        """Declarations of the file at path."""
+        path = os.path.abspath(path)
+        return [e for e in self.edges if e.parent == path and (e.enabled or not enabled_only)]
+
+    def parents(self, path: str, enabled_only: bool = True) -> List[IncludeEdge]:
+        """Declarations naming the file at path."""
+        path = os.path.abspath(path)
+        return [e for e in self.edges if e.child == path and (e.enabled or not enabled_only)]
+
+
+def build_graph(path: str, read: Callable[[str], Any], enable_key: str,
+                listing: Optional[DirectoryListing] = None) -> DependencyGraph:
+    """
+    Build the dependency graph of the file at path.
+
+    Files are only parsed and inspected, nothing is merged. Files named by disabled
+    declarations are recorded as edges but not read.
+
+    Args:
+        path (str): The path to the root JSON file.
+        read (Callable[[str], Any]): Reads and parses the file at a path.
+        enable_key (str): The key used to enable or disable inclusions.
+        listing (Optional[DirectoryListing]): Expands the patterns of fragment includes, which
+            get an edge per matching file. Defaults to None (a new one).
+
+    Returns:
+        DependencyGraph: The graph.
+    """
+    graph = DependencyGraph(os.path.abspath(path))
+    pending = deque([path])
+    seen = {graph.root}
+    while pending:
+        file_path = pending.popleft()
+        parent = os.path.abspath(file_path)
+        graph.sizes[parent] = os.stat(file_path).st_size
+        base_dir = os.path.dirname(file_path)
+        for kind, spec, enabled in iter_include_specs(read(file_path), enable_key):
+            if enabled:
+                child_paths = spec_paths(spec, base_dir, listing)
+            else:
+                child_paths = [os.path.join(base_dir, spec.get("filename") or spec["directory"])]
+            for child_path in child_paths:
+                child = os.path.abspath(child_path)
+                graph.edges.append(IncludeEdge(parent, child, kind, enabled, spec.get("keys_path"),
+                                               spec.get("keys"), spec.get("key")))
+                if enabled and child not in seen:
+                    seen.add(child)
+                    pending.append(child_path)
+    return graph
@@ -0,0 +1,432 @@
+import os
+from collections.abc import Mapping, Sequence
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from pypaya_json.core import PypayaJSON
+
+_MISSING = object()
+_LOADING = object()  # Value of a deferred dictionary being processed
+_MAX_NESTING = 64  # Values processed inside one another before the innermost one is postponed
+
+
+class _Postponed(Exception):
+    """Processing of a value needed too deep inside the processing of others, to be run first."""
+
+    def __init__(self, value: Any, process: Callable[[], Any]):
+        super().__init__()
+        self.value = value
+        self.process = process
+        self.waiting = []  # The values whose processing was abandoned for it, innermost first
+
+
+class _Deferred:
+    """A dictionary with a replace_value declaration, processed when it is first accessed.
+
+    The replacement can be any value, so it takes the place of the dictionary in its container.
+    Dictionaries that also have an include are deferred as a whole, the include being applied
+    first. The processed value is kept, as the dictionary may be merged into several mappings.
+    """
+
+    __slots__ = ("data", "base_dir", "value")
+
+    def __init__(self, data: Dict[str, Any], base_dir: str):
+        self.data = data
+        self.base_dir = base_dir
+        self.value = _MISSING
+
+    def __repr__(self) -> str:
+        return "<replace_value not loaded>"
+
+
+class LazyMapping(Mapping):
+    """Read-only mapping processed when its contents are first accessed.
+
+    The include declaration of the mapping is loaded and merged on the first key lookup,
+    iteration or len(). Nested dictionaries and lists become lazy in turn, and values with
+    a replace_value declaration are loaded when their key is first looked up. Processed
+    contents are memoized; resolve() returns the fully processed data as plain dicts and lists.
+    """
+
+    __slots__ = ("_load", "_source", "_base_dir", "_data")
+
+    def __init__(self, load: "LazyLoad", data: Dict[str, Any], base_dir: str):
+        self._load = load
+        self._source = data  # The unprocessed dictionary, None once processing started
+        self._base_dir = base_dir
+        self._data = None  # The processed dictionary
+
+    def _items(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._load.process(self, self._process)
+        return self._data
+
+    def _process(self) -> None:
+        if self._data is not None:
+            return
+        if self._source is None:
+            raise ValueError("Circular include")
+        source, self._source = self._source, None
+        try:
+            data = self._load.expand_dict(source, self._base_dir)
+            if isinstance(data, LazyMapping):
+                data = dict(data._items())
+        except BaseException:
+            self._source = source
+            raise
+        if not isinstance(data, dict):
+            # Only possible when the included file supplies the replace_value declaration,
+            # which cannot be known before loading it
+            raise TypeError(f"A lazily loaded mapping in {self._base_dir} was replaced by a "
+                            f"{type(data).__name__}; load this file without lazy=True")
+        self._data = data
+
+    def __getitem__(self, key: Any) -> Any:
+        data = self._items()
+        value = data[key]
+        if type(value) is _Deferred:
+            value = data[key] = self._load.expand_deferred(value)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items()
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"<{type(self).__name__} not loaded>"
+        return f"{type(self).__name__}({self._data!r})"
+
+    def resolve(self) -> Dict[str, Any]:
+        """Load everything below this mapping and return it as plain dicts and lists."""
+        return resolve(self)
+
+
+class LazySequence(Sequence):
+    """Read-only sequence processed when its elements are first accessed.
+
+    The include declarations among the elements of a list are loaded together, on the first
+    access, since they determine the positions of all following elements.
+    """
+
+    __slots__ = ("_load", "_source", "_base_dir", "_data")
+
+    def __init__(self, load: "LazyLoad", data: List[Any], base_dir: str):
+        self._load = load
+        self._source = data
+        self._base_dir = base_dir
+        self._data = None
+
+    def _items(self) -> List[Any]:
+        if self._data is None:
+            self._load.process(self, self._process)
+        return self._data
+
+    def _process(self) -> None:
+        if self._data is not None:
+            return
+        if self._source is None:
+            raise ValueError("Circular include")
+        source, self._source = self._source, None
+        try:
+            self._data = self._load.expand_list(source, self._base_dir)
+        except BaseException:
+            self._source = source
+            raise
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        data = self._items()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(data)))]
+        value = data[index]
+        if type(value) is _Deferred:
+            value = data[index] = self._load.expand_deferred(value)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._items())):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (list, LazySequence)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"<{type(self).__name__} not loaded>"
+        return f"{type(self).__name__}({self._data!r})"
+
+    def _unprocessed(self) -> Optional[Tuple[List[Any], str]]:
+        """The unprocessed list and its base directory, or None once it was processed."""
+        if self._data is not None or self._source is None:
+            return None
+        return self._source, self._base_dir
+
+    def resolve(self) -> List[Any]:
+        """Load everything below this sequence and return it as plain dicts and lists."""
+        return resolve(self)
+
+
+def resolve(value: Any) -> Any:
+    """
+    Fully process a lazily loaded value.
+
+    Args:
+        value (Any): A value returned by a lazy load, or any part of it.
+
+    Returns:
+        Any: The processed data as new plain dicts and lists, equal to what an eager load returns.
+    """
+    containers = (Mapping, list, LazySequence)
+    if not isinstance(value, containers):
+        return value
+    holder = {}
+    # Frames are (items, target, source); mapping targets iterate over (key, value) pairs.
+    # Sources on the current path are tracked so that include cycles are reported, not expanded
+    stack = [(iter([(None, value)]), holder, None)]
+    active = set()
+    while stack:
+        items, target, source = stack[-1]
+        is_dict = isinstance(target, dict)
+        for item in items:
+            if is_dict:
+                key, item = item
+            if isinstance(item, containers):
+                if id(item) in active:
+                    raise ValueError("Circular include")
+                active.add(id(item))
+                is_mapping = isinstance(item, Mapping)
+                child = {} if is_mapping else []
+                if is_dict:
+                    target[key] = child
+                else:
+                    target.append(child)
+                stack.append((iter(item.items()) if is_mapping else iter(item), child, item))
+                break
+            if is_dict:
+                target[key] = item
+            else:
+                target.append(item)
+        else:
+            stack.pop()
+            active.discard(id(source))
+    return holder[None]
+
+
+class LazyLoad:
+    """State shared by the lazy mappings and sequences of a single lazy load.
+
+    Every file is read at most once per load. Its lazy document is shared by all the places
+    including it, which is safe because lazy values are read-only.
+    """
+
+    def __init__(self, loader: "PypayaJSON"):
+        self.loader = loader
+        self.documents = {}  # absolute path -> lazy document
+        self.nesting = 0  # Number of values being processed inside one another
+        self.waiting = set()  # ids of the values waiting for postponed ones to be processed
+
+    def document(self, path: str) -> Any:
+        """The lazy document of the file at path."""
+        key = os.path.abspath(path)
+        document = self.documents.get(key, _MISSING)
+        if document is _MISSING:
+            document = self.documents[key] = self.wrap(self.loader._read_json(path), os.path.dirname(path))
+        if type(document) is _Deferred:
+            # Nothing holds the root of a document, so it cannot be replaced later. The deferred
+            # root is kept meanwhile, so that processing postponed by process() is not lost
+            if document.value is _LOADING:
+                raise ValueError(f"Circular include of {path}")
+            document = self.documents[key] = self.expand_deferred(document)
+        return document
+
+    def wrap(self, value: Any, base_dir: str) -> Any:
+        """The lazy form of an unprocessed value."""
+        if isinstance(value, dict):
+            if "replace_value" in value:
+                return _Deferred(value, base_dir)
+            return LazyMapping(self, value, base_dir)
+        if isinstance(value, list):
+            return LazySequence(self, value, base_dir)
+        return value
+
+    def expand_deferred(self, deferred: _Deferred) -> Any:
+        """The lazy value taking the place of a deferred dictionary."""
+        if deferred.value is _MISSING or deferred.value is _LOADING:
+            self.process(deferred, partial(self._process_deferred, deferred))
+        return deferred.value
+
+    def _process_deferred(self, deferred: _Deferred) -> None:
+        if deferred.value is _LOADING:
+            raise ValueError("Circular include")
+        if deferred.value is not _MISSING:
+            return
+        deferred.value = _LOADING
+        try:
+            value = self.expand_dict(deferred.data, deferred.base_dir)
+        except BaseException:
+            deferred.value = _MISSING
+            raise
+        if type(value) is dict:
+            # Not replaced: its nested values are lazy in turn
+            mapping = LazyMapping(self, None, deferred.base_dir)
+            mapping._data = value
+            value = mapping
+        deferred.value = value
+
+    def process(self, value: Any, process: Callable[[], None]) -> None:
+        """Run process(), which processes value, without recursing deeper than _MAX_NESTING values.
+
+        Processing a value processes the documents it includes first, inside the same call, so
+        every level of an include chain adds to the call stack. Past _MAX_NESTING nested values,
+        the innermost one is postponed instead: the outermost call processes it, then processes
+        the values that needed it again, which now find it done. Long include chains thus take
+        a bounded call stack, like eager loads. The values whose processing was abandoned for a
+        postponed one all need it, so needing one of them before it is done is an include cycle.
+        """
+        if self.nesting:
+            if id(value) in self.waiting:
+                raise ValueError("Circular include")
+            if self.nesting >= _MAX_NESTING:
+                raise _Postponed(value, process)
+            self.nesting += 1
+            try:
+                process()
+            except _Postponed as e:
+                e.waiting.append(value)
+                raise
+            finally:
+                self.nesting -= 1
+            return
+        # Entries are [value, its processing, the values abandoned for the next entry]
+        pending = [[value, process, []]]
+        waiting = self.waiting
+        try:
+            while pending:
+                entry = pending[-1]
+                waiting.difference_update(map(id, entry[2]))  # Processed again now
+                self.nesting = 1
+                try:
+                    entry[1]()
+                except _Postponed as e:
+                    entry[2] = e.waiting + [entry[0]]
+                    waiting.update(map(id, entry[2]))
+                    if id(e.value) in waiting:
+                        raise ValueError("Circular include") from None
+                    pending.append([e.value, e.process, []])
+                    continue
+                finally:
+                    self.nesting = 0
+                pending.pop()
+        finally:
+            waiting.clear()
+
+    def expand_dict(self, data: Dict[str, Any], base_dir: str) -> Any:
+        """Process one level of a dictionary: the processed dictionary, or its replacement."""
+        loader = self.loader
+        result, nested = loader._scan_dict(data, base_dir)
+        if "include" in result:
+            spec = loader._process_spec(result.pop("include"), base_dir)
+            if isinstance(spec, dict):
+                for fragment in loader._fragment_specs(spec, base_dir):
+                    included_data = self.load_from_spec(fragment, base_dir)
+                    loader._merge_included(result, self._merged(included_data), spec.get("keys_path", ""))
+            elif isinstance(spec, list):
+                for inc in spec:
+                    for fragment in loader._fragment_specs(inc, base_dir):
+                        loader._merge_included(result, self._merged(self.load_from_spec(fragment, base_dir)))
+            # Values overridden by the include are not processed
+            nested = [(k, v) for k, v in nested if result.get(k, _MISSING) is v]
+        if "replace_value" in result:
+            # Applied after the include, which may supply or override it
+            spec = loader._process_spec(result["replace_value"], base_dir)
+            return loader._select_replaced(self.load_from_spec(spec, base_dir), spec)
+        for key, value in nested:
+            result[key] = self.wrap(value, base_dir)
+        return result
+
+    def expand_list(self, data: List[Any], base_dir: str) -> List[Any]:
+        """Process one level of a list, splicing in the data of its include declarations."""
+        loader = self.loader
+        enable_key = loader.enable_key
+        result = []
+        for item in data:
+            if isinstance(item, dict):
+                if enable_key in item and not item[enable_key]:
+                    continue
+                spec = item.get("include", _MISSING)
+                if spec is not _MISSING and not (isinstance(spec, dict) and enable_key in spec
+                                                 and not spec[enable_key]):
+                    spec = loader._process_spec(spec, base_dir)
+                    for fragment in loader._fragment_specs(spec, base_dir):
+                        included_data = self.load_from_spec(fragment, base_dir)
+                        if isinstance(included_data, LazySequence):
+                            result.extend(included_data._items())
+                        elif isinstance(included_data, list):
+                            result.extend(included_data)
+                        else:
+                            result.append(included_data)
+                    continue
+                result.append(self.wrap(item, base_dir))
+            elif isinstance(item, list):
+                # Includes in lists nested directly in lists are not expanded, nothing to defer
+                result.append(loader._process_spec(item, base_dir))
+            else:
+                result.append(item)
+        return result
+
+    def load_from_spec(self, spec: Dict[str, Any], base_dir: str) -> Any:
+        """Lazy version of PypayaJSON.load_from_spec."""
+        data = self.document(os.path.join(base_dir, spec["filename"]))
+        return self.loader._select(data, spec)
+
+    @staticmethod
+    def _merged(value: Any) -> Any:
+        """The processed dictionary of a lazy mapping, whose items are merged into another one."""
+        if isinstance(value, LazyMapping):
+            return value._items()
+        return value
+
+
+def select(data: Any, paths: Iterable[Union[str, List[Any]]]) -> Dict[str, Any]:
+    """
+    Fully process only the given key paths of lazily loaded data.
+
+    Only the dictionaries on the way to the selected values are processed, so includes,
+    replacements and path annotations elsewhere in the tree are never loaded.
+
+    Args:
+        data (Any): A value returned by a lazy load.
+        paths (Iterable[Union[str, List[Any]]]): Key paths, as "a/b" strings or lists of keys
+            (the same forms as keys_path).
+
+    Returns:
+        Dict[str, Any]: The selected values as plain data, nested under their key paths.
+            Selecting both a key and keys below it returns the whole value of the key.
+    """
+    result = {}
+    selected = set()
+    for keys in sorted((p.split('/') if isinstance(p, str) else list(p) for p in paths), key=len):
+        if not keys:
+            raise ValueError("Selected key paths cannot be empty")
+        if any(tuple(keys[:i]) in selected for i in range(1, len(keys))):
+            continue  # Already selected as part of a shorter path
+        selected.add(tuple(keys))
+        target, value = result, data
+        for key in keys[:-1]:
+            value = value[key]
+            target = target.setdefault(key, {})
+        target[keys[-1]] = resolve(value[keys[-1]])
+    return result
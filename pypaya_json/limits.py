@@ -0,0 +1,71 @@
+import os
+from typing import Any, Optional, Set
+
+
+class LoadLimitError(ValueError):
+    """A load went over one of the limits of its loader."""
+
+
+class LoadBudget:
+    """What a single load may still use of the limits of its loader.
+
+    Every limit is checked as soon as the amount it bounds grows: a file's include depth and
+    size before it is read, the nodes of a document once parsed, before it is processed, and
+    the nodes of the data handed to every further include site of a document, before copying.
+    """
+
+    def __init__(self, max_include_depth: Optional[int] = None, max_files: Optional[int] = None,
+                 max_bytes: Optional[int] = None, max_nodes: Optional[int] = None):
+        self.max_include_depth = max_include_depth
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_nodes = max_nodes
+        self.files = 0
+        self.bytes = 0
+        self.nodes = 0
+        self.parsed: Set[str] = set()  # absolute paths of the documents parsed by the load
+        self.sited: Set[str] = set()  # absolute paths of the documents handed to an include site
+
+    def enter(self, key: str, path: str, depth: int, size: Optional[int] = None) -> None:
+        """Account for the file at path (absolute path key), about to be read at an include depth."""
+        if self.max_include_depth is not None and depth > self.max_include_depth:
+            raise LoadLimitError(f"Include depth of {path} exceeds max_include_depth={self.max_include_depth}")
+        if key in self.parsed:
+            return  # Read again for another element of a streamed array, already counted
+        self.files += 1
+        if self.max_files is not None and self.files > self.max_files:
+            raise LoadLimitError(f"Reading {path} exceeds max_files={self.max_files}")
+        if self.max_bytes is not None:
+            self.bytes += os.stat(path).st_size if size is None else size
+            if self.bytes > self.max_bytes:
+                raise LoadLimitError(f"Reading {path} exceeds max_bytes={self.max_bytes}")
+        self.parsed.add(key)
+
+    def add_nodes(self, data: Any, path: str) -> None:
+        """Account for the nodes of data from the file at path, counting no further than the limit."""
+        if self.max_nodes is None:
+            return
+        left = self.max_nodes - self.nodes
+        count = 0
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            count += 1
+            if count > left:
+                raise LoadLimitError(f"Data from {path} exceeds max_nodes={self.max_nodes}")
+            if isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+        self.nodes += count
+
+    def add_site(self, key: str, data: Any, path: str) -> None:
+        """Account for the data an include site gets from the document at absolute path key.
+
+        The nodes of the first include site of a document parsed by this load were counted with
+        the document; every other include site adds a copy, or a reference to shared frozen data
+        that consumers walk all the same.
+        """
+        if key in self.sited or key not in self.parsed:
+            self.add_nodes(data, path)
+        self.sited.add(key)
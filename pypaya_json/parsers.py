@@ -0,0 +1,74 @@
+import importlib
+import json
+from typing import Any, Callable, Union
+
+Parser = Callable[[bytes], Any]
+
+# Optional backends tried by "auto", fastest first
+BACKENDS = ("orjson", "ujson")
+# Backends whose loads reads any buffer, such as a memoryview of a memory-mapped file, without a copy
+BUFFER_BACKENDS = ("orjson",)
+
+_buffer_loads = set()  # loads functions of the imported BUFFER_BACKENDS, at most one per backend
+
+
+def _import_backend(name: str) -> Parser:
+    """Return the loads function of an optional JSON library."""
+    if name == "json":
+        return json.loads
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON parser '{name}', expected 'auto', 'json', "
+                         f"{', '.join(repr(b) for b in BACKENDS)} or a callable")
+    try:
+        module = importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(f"JSON parser '{name}' requires the {name} package to be installed") from e
+    if name in BUFFER_BACKENDS:
+        _buffer_loads.add(module.loads)
+    return module.loads
+
+
+def _with_fallback(loads: Parser) -> Parser:
+    """Wrap a fast parser so that documents it rejects are parsed again by the standard library.
+
+    Some backends are stricter than json (NaN, integers beyond 64 bits, byte order marks);
+    retrying keeps "auto" accepting exactly what json accepts, with json's error messages.
+    """
+    def parse(data: bytes) -> Any:
+        try:
+            return loads(data)
+        except ValueError:
+            return json.loads(data if isinstance(data, (bytes, str)) else bytes(data))
+    parse.accepts_buffers = loads in _buffer_loads
+    return parse
+
+
+def accepts_buffers(parse: Parser) -> bool:
+    """Whether a parse function returned by get_parser reads memoryviews without copying them to bytes."""
+    return getattr(parse, "accepts_buffers", False) or parse in _buffer_loads
+
+
+def get_parser(parser: Union[str, Parser] = "auto") -> Parser:
+    """
+    Resolve a parser option to a function that parses JSON from bytes.
+
+    Args:
+        parser (Union[str, Callable]): A callable taking the raw bytes of a file, or the name of
+            a backend: "orjson", "ujson", "json" (standard library) or "auto", which picks the
+            fastest installed one. Defaults to "auto".
+
+    Returns:
+        Callable[[bytes], Any]: The parse function.
+    """
+    if callable(parser):
+        return parser
+    if not isinstance(parser, str):
+        raise ValueError("parser must be a backend name or a callable")
+    if parser == "auto":
+        for name in BACKENDS:
+            try:
+                return _with_fallback(_import_backend(name))
+            except ImportError:
+                continue
+        return json.loads
+    return _import_backend(parser)
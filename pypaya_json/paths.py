@@ -0,0 +1,96 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+# Path resolution modes
+MODES = ("resolve", "prefix", "abspath")
+
+
+def _resolve(path: str) -> str:
+    """Absolute path with symlinks resolved."""
+    return str(Path(path).expanduser().resolve())
+
+
+def _abspath(path: str) -> str:
+    """Absolute, normalized path without following symlinks."""
+    return os.path.abspath(os.path.expanduser(path))
+
+
+class PathResolver:
+    """Resolves path annotation values relative to the directory of the file declaring them.
+
+    In "resolve" mode every path is made absolute with symlinks resolved. "prefix" mode resolves
+    only the directory part of a path, once per directory, and appends the last component to it,
+    so a symlink in the last component is not followed. "abspath" mode only makes paths absolute
+    and normalizes them, without any file system access.
+
+    Resolved paths and directory prefixes are memoized for ttl seconds, or until clear().
+    """
+
+    def __init__(self, mode: str = "resolve", cache: bool = False, ttl: Optional[float] = None):
+        """
+        Initialize a resolver.
+
+        Args:
+            mode (str): "resolve", "prefix" or "abspath". Defaults to "resolve".
+            cache (bool): Whether to memoize every resolved (base directory, value) pair.
+                Directory prefixes are always memoized in "prefix" mode. Defaults to False.
+            ttl (Optional[float]): Number of seconds after which the memoized paths are dropped.
+                Defaults to None (kept until clear()).
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown path resolution mode '{mode}', expected one of "
+                             f"{', '.join(repr(m) for m in MODES)}")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.mode = mode
+        self.ttl = ttl
+        self._paths = {} if cache else None  # (absolute base_dir, value) -> resolved path
+        self._prefixes = {}  # joined absolute directory -> resolved directory, "prefix" mode only
+        self._expires = None if ttl is None else time.monotonic() + ttl
+        self._absolute = _abspath if mode == "abspath" else _resolve
+        self.hits = 0  # Lookups answered by the memoized paths
+        self.misses = 0
+
+    def resolve(self, value: str, base_dir: str) -> str:
+        """Resolve value relative to base_dir."""
+        if not value:
+            return value
+        if self._expires is not None and time.monotonic() >= self._expires:
+            self.clear()
+        if not os.path.isabs(base_dir):
+            # Memoized by absolute directory, a relative one changes meaning with the working directory
+            base_dir = os.path.abspath(base_dir)
+        paths = self._paths
+        if paths is None:
+            return self._resolve_uncached(value, base_dir)
+        key = (base_dir, value)
+        path = paths.get(key)
+        if path is None:
+            self.misses += 1
+            path = paths[key] = self._resolve_uncached(value, base_dir)
+        else:
+            self.hits += 1
+        return path
+
+    def clear(self) -> None:
+        """Drop all memoized paths."""
+        if self._paths is not None:
+            self._paths = {}
+        self._prefixes = {}
+        if self.ttl is not None:
+            self._expires = time.monotonic() + self.ttl
+
+    def _resolve_uncached(self, value: str, base_dir: str) -> str:
+        # Relative paths are relative to base_dir (same logic as includes)
+        path = os.path.join(base_dir, value)
+        if self.mode != "prefix":
+            return self._absolute(path)
+        head, name = os.path.split(path)
+        if not head or name in ("", ".", ".."):
+            return self._absolute(path)
+        directory = self._prefixes.get(head)
+        if directory is None:
+            directory = self._prefixes[head] = self._absolute(head)
+        return os.path.join(directory, name)
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional
+
+from pypaya_json.fragments import DirectoryListing
+from pypaya_json.limits import LoadBudget, LoadLimitError
+from pypaya_json.specs import iter_include_specs, spec_paths
+
+
+class Prefetcher:
+    """Reads and parses the files of an include tree ahead of processing, on an executor.
+
+    Every file submitted is inspected for include and replace_value declarations as soon as
+    it is parsed, and the files they name are submitted in turn. Processing then picks the
+    parsed documents up in its usual order, so the result does not depend on which files
+    finish first. Errors are kept in the futures and only raised when the document is needed.
+
+    With a budget, files that would take the files read ahead over its limits are not read
+    ahead, and neither are the files they include; processing reads them if it needs them,
+    checking its own budget first.
+    """
+
+    def __init__(self, read: Callable[[str], Any], enable_key: str, executor: Executor,
+                 listing: Optional[DirectoryListing] = None, budget: Optional[LoadBudget] = None):
+        """
+        Initialize a prefetcher.
+
+        Args:
+            read (Callable[[str], Any]): Reads and parses the file at a path.
+            enable_key (str): The key used to enable or disable inclusions.
+            executor (Executor): Executor the files are read on.
+            listing (Optional[DirectoryListing]): Expands the patterns of fragment includes.
+                Defaults to None (a new one).
+            budget (Optional[LoadBudget]): Limits of the files read ahead, with include depths
+                counted from the first file submitted. Separate from the budget of processing,
+                which counts the same files again. Defaults to None (no limits).
+        """
+        self._read = read
+        self._enable_key = enable_key
+        self._executor = executor
+        self._listing = listing or DirectoryListing()
+        self._futures = {}  # absolute path -> future of the parsed document
+        self._budget = budget
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, path: str, depth: int = 0) -> None:
+        """Start reading the file at path, found at an include depth, unless it was already submitted."""
+        key = os.path.abspath(path)
+        with self._lock:
+            if self._closed or key in self._futures:
+                return
+            if self._budget is not None:
+                try:
+                    self._budget.enter(key, path, depth)
+                except (LoadLimitError, OSError):
+                    self._futures[key] = None  # Left to processing
+                    return
+            self._futures[key] = self._executor.submit(self._fetch, path, depth)
+
+    def get(self, path: str) -> Any:
+        """Return the parsed document of the file at path, waiting for it if necessary."""
+        self.submit(path)
+        with self._lock:
+            future = self._futures.get(os.path.abspath(path))
+        if future is None:  # Closed in the meantime, or not read ahead
+            return self._read(path)
+        return future.result()
+
+    def close(self) -> None:
+        """Stop submitting files and cancel the ones that have not started yet."""
+        with self._lock:
+            self._closed = True
+            futures = [future for future in self._futures.values() if future is not None]
+        for future in futures:
+            future.cancel()
+
+    def _fetch(self, path: str, depth: int) -> Any:
+        data = self._read(path)
+        base_dir = os.path.dirname(path)
+        for _, spec, enabled in iter_include_specs(data, self._enable_key):
+            if enabled:
+                # The fragments of a pattern are all submitted at once, to be read in parallel
+                for file_path in spec_paths(spec, base_dir, self._listing):
+                    self.submit(file_path, depth + 1)
+        return data
+
+
+class Preloaded:
+    """Documents of an include tree that were read before processing started.
+
+    Provides the same interface to processing as Prefetcher. Files that were not preloaded are
+    read on demand, and read errors are raised only when the document is needed.
+    """
+
+    def __init__(self, read: Callable[[str], Any]):
+        self._read = read
+        self._documents = {}  # absolute path -> (parsed document, read error), None while reading
+
+    def reserve(self, path: str) -> bool:
+        """Claim path for reading; returns False if it was already claimed."""
+        key = os.path.abspath(path)
+        if key in self._documents:
+            return False
+        self._documents[key] = None
+        return True
+
+    def set(self, path: str, document: Any = None, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of reading path."""
+        self._documents[os.path.abspath(path)] = (document, error)
+
+    def get(self, path: str) -> Any:
+        """Return the parsed document of the file at path."""
+        entry = self._documents.get(os.path.abspath(path))
+        if entry is None:  # Not preloaded
+            return self._read(path)
+        document, error = entry
+        if error is not None:
+            raise error
+        return document
+
+    def close(self) -> None:
+        pass
+
+
+async def preload(path: str, read: Callable[[str], Any], enable_key: str, max_concurrency: int,
+                  executor: Optional[Executor] = None, listing: Optional[DirectoryListing] = None,
+                  budget: Optional[LoadBudget] = None) -> Preloaded:
+    """
+    Read the files of an include tree concurrently, without blocking the event loop.
+
+    Every file is read on the executor, at most max_concurrency at a time. The files named by
+    the include declarations of a document are then read together with asyncio.gather.
+    Files that would take the files preloaded over the limits of budget are left to be read
+    on demand, together with the files they include.
+
+    Args:
+        path (str): The path to the root JSON file.
+        read (Callable[[str], Any]): Reads and parses the file at a path.
+        enable_key (str): The key used to enable or disable inclusions.
+        max_concurrency (int): Maximum number of files read at the same time.
+        executor (Optional[Executor]): Executor the files are read on. Defaults to the event
+            loop's default executor.
+        listing (Optional[DirectoryListing]): Expands the patterns of fragment includes.
+            Defaults to None (a new one).
+        budget (Optional[LoadBudget]): Limits of the files preloaded, separate from the budget
+            of processing. Defaults to None (no limits).
+
+    Returns:
+        Preloaded: The documents read.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    preloaded = Preloaded(read)
+    listing = listing or DirectoryListing()
+
+    async def fetch(file_path, depth):
+        # Claimed before the first await so that every file is read only once
+        if not preloaded.reserve(file_path):
+            return
+        if budget is not None:
+            try:
+                budget.enter(os.path.abspath(file_path), file_path, depth)
+            except (LoadLimitError, OSError):
+                return  # Read on demand
+        async with semaphore:
+            try:
+                document = await loop.run_in_executor(executor, read, file_path)
+            except Exception as e:
+                preloaded.set(file_path, error=e)
+                return
+        preloaded.set(file_path, document)
+        base_dir = os.path.dirname(file_path)
+        await asyncio.gather(*(fetch(file_path, depth + 1)
+                               for _, spec, enabled in iter_include_specs(document, enable_key) if enabled
+                               for file_path in spec_paths(spec, base_dir, listing)))
+
+    await fetch(path, 0)
+    return preloaded
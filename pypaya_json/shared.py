@@ -0,0 +1,185 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from pypaya_json.parsers import get_parser
+from pypaya_json.stream import locate
+
+# Layout: MAGIC, the size of the index, the index (JSON) and the data (compact JSON). The index
+# lists the top-level keys of a dictionary with the start and end of their values in the data
+MAGIC = b"PYPAYA-JSON-SHARED-1\n"
+_SIZE = struct.Struct("<Q")
+_MISSING = object()
+
+
+def encode(data: Any) -> bytes:
+    """Serialize processed data into the shared layout."""
+    encode_value = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    index = []
+    if isinstance(data, dict):
+        parts = []
+        pos = 1
+        for key, value in data.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Keys must be strings to be shared, not {type(key).__name__}")
+            prefix = encode_value(key).encode("utf-8") + b":"
+            encoded = encode_value(value).encode("utf-8")
+            start = pos + len(prefix)
+            index.append((key, start, start + len(encoded)))
+            parts.append(prefix + encoded)
+            pos = start + len(encoded) + 1  # The comma
+        body = b"{" + b",".join(parts) + b"}"
+    else:
+        body = encode_value(data).encode("utf-8")
+    header = json.dumps({"dict": isinstance(data, dict), "keys": index}, ensure_ascii=False).encode("utf-8")
+    return MAGIC + _SIZE.pack(len(header)) + header + body
+
+
+class SharedConfig(Mapping):
+    """Read-only view of processed data published in a memory mapping.
+
+    The data is stored once, serialized, in pages that no process writes to, so forked workers
+    share them with the parent for as long as they run, and no reference counting of a large
+    tree of Python objects ever copies them. Top-level values are parsed on first access and
+    then kept by the process; get_path() parses only the value at a key path.
+    """
+
+    def __init__(self, buffer: mmap.mmap, parse: Optional[Callable[[bytes], Any]] = None,
+                 path: Optional[str] = None):
+        """
+        Wrap a mapping holding data in the shared layout (see publish and open).
+
+        Args:
+            buffer (mmap.mmap): The mapping.
+            parse (Optional[Callable[[bytes], Any]]): JSON parser. Defaults to the fastest installed one.
+            path (Optional[str]): The file mapped, if any.
+        """
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a shared config")
+        start = len(MAGIC) + _SIZE.size
+        (size,) = _SIZE.unpack(buffer[len(MAGIC):start])
+        header = json.loads(buffer[start:start + size])
+        self._buffer = buffer
+        self._data_start = start + size
+        self._is_dict = header["dict"]
+        self._spans = {key: (begin, end) for key, begin, end in header["keys"]}
+        self._parse = parse or get_parser("auto")
+        self._values = {}  # Top-level key -> parsed value, per process
+        self._lock = threading.Lock()
+        self.path = path
+
+    @classmethod
+    def publish(cls, data: Any, path: Optional[str] = None,
+                parse: Optional[Callable[[bytes], Any]] = None) -> "SharedConfig":
+        """
+        Serialize data into a new shared mapping.
+
+        Args:
+            data (Any): Processed data, e.g. the result of load_file.
+            path (Optional[str]): File to write the data to (atomically), e.g. under /dev/shm, so
+                that unrelated processes can open() it. Defaults to None: an anonymous mapping,
+                shared only with the processes forked after publishing.
+            parse (Optional[Callable[[bytes], Any]]): JSON parser. Defaults to the fastest installed one.
+
+        Returns:
+            SharedConfig: The view of the published data.
+        """
+        blob = encode(data)
+        if path is None:
+            buffer = mmap.mmap(-1, len(blob))
+            buffer.write(blob)
+            return cls(buffer, parse)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return cls.open(path, parse)
+
+    @classmethod
+    def open(cls, path: str, parse: Optional[Callable[[bytes], Any]] = None) -> "SharedConfig":
+        """Map a file written by publish(data, path)."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, parse, path)
+
+    def _items(self) -> Any:
+        if not self._is_dict:
+            raise TypeError("The shared data is not a dictionary, use resolve()")
+        return self._spans
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            begin, end = self._items()[key]
+            start = self._data_start
+            value = self._parse(self._buffer[start + begin:start + end])
+            with self._lock:
+                value = self._values.setdefault(key, value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._items())
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._items()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self._buffer)} bytes>"
+
+    def get_path(self, keys_path: Union[str, List[str]], default: Any = None) -> Any:
+        """
+        Parse only the value at a key path.
+
+        The dictionaries on the way are scanned without building objects; the value is parsed
+        anew on every call and not kept.
+
+        Args:
+            keys_path (Union[str, List[str]]): Keys through dictionaries, as "a/b" or ["a", "b"].
+            default (Any): Returned if the key path does not exist. Defaults to None.
+
+        Returns:
+            Any: The parsed value.
+        """
+        keys = keys_path.split('/') if isinstance(keys_path, str) else list(keys_path)
+        if not keys or not self._is_dict or keys[0] not in self._spans:
+            return default
+        begin, end = self._spans[keys[0]]
+        start = self._data_start
+        data = self._buffer[start + begin:start + end]
+        if len(keys) > 1:
+            span = locate(data, keys[1:], lambda level, key: False)
+            if span is None:
+                return default
+            data = data[span[0]:span[1]]
+        return self._parse(data)
+
+    def resolve(self) -> Any:
+        """Parse all of the data."""
+        return self._parse(self._buffer[self._data_start:])
+
+    def close(self) -> None:
+        """Unmap the data; values already parsed stay usable."""
+        self._buffer.close()
+
+    def __enter__(self) -> "SharedConfig":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,75 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pypaya_json.fragments import DirectoryListing, fragment_pattern
+
+
+def _names_files(spec: Any) -> bool:
+    """Whether an include spec names a file, or a directory of fragments."""
+    return isinstance(spec, dict) and (isinstance(spec.get("filename"), str) or isinstance(spec.get("directory"), str))
+
+
+def _as_spec_list(value: Any) -> List[Dict[str, Any]]:
+    """The file specs of an include or replace_value declaration that name files."""
+    specs = value if isinstance(value, list) else [value]
+    return [spec for spec in specs if _names_files(spec)]
+
+
+def spec_paths(spec: Dict[str, Any], base_dir: str, listing: Optional[DirectoryListing] = None) -> List[str]:
+    """The paths of the files an include spec names: its filename, or the files matching its pattern."""
+    pattern = fragment_pattern(spec)
+    if pattern is None:
+        return [os.path.join(base_dir, spec["filename"])]
+    matches = (listing or DirectoryListing()).expand(base_dir, pattern)[0]
+    if not matches and "directory" not in spec:
+        return [os.path.join(base_dir, spec["filename"])]  # Possibly a file named like a pattern
+    return [os.path.join(base_dir, match) for match in matches]
+
+
+def iter_include_specs(data: Any, enable_key: str) -> Iterator[Tuple[str, Dict[str, Any], bool]]:
+    """
+    Find the include and replace_value declarations of an unprocessed document.
+
+    The document is only inspected, not processed: nothing is loaded or merged. Declarations
+    are reported in document order, following the same rules as processing, so that only specs
+    which processing could reach are found (e.g. nothing below a replace_value is reported).
+
+    Args:
+        data (Any): The parsed JSON data.
+        enable_key (str): The key used to enable or disable inclusions.
+
+    Yields:
+        Tuple[str, Dict[str, Any], bool]: The kind ("include" or "replace_value"), the spec,
+            and whether the declaration is enabled (it and all its containers are enabled).
+    """
+    def disabled(value):
+        return isinstance(value, dict) and enable_key in value and not value[enable_key]
+
+    # Entries are (value, enabled, expand); expand is False for lists nested directly in lists.
+    # As in processing, the enable flag of the document root itself is not checked
+    stack = [(data, True, True)]
+    while stack:
+        value, enabled, expand = stack.pop()
+        children = []
+        if isinstance(value, dict):
+            if expand and "include" in value:
+                include = value["include"]
+                for spec in _as_spec_list(include):
+                    yield "include", spec, enabled and not disabled(include) and not disabled(spec)
+            spec = value.get("replace_value")
+            if expand and isinstance(spec, dict) and not disabled(spec):
+                if isinstance(spec.get("filename"), str):
+                    yield "replace_value", spec, enabled
+                continue  # The other keys are replaced as well
+            children = [(v, enabled and not disabled(v), expand) for k, v in value.items()
+                        if isinstance(v, (dict, list)) and not (expand and k == "include")]
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict) and expand and "include" in item and not disabled(item["include"]):
+                    # A list element include declaration: its other keys are ignored
+                    include = item["include"]
+                    if _names_files(include):
+                        yield "include", include, enabled and not disabled(item)
+                elif isinstance(item, (dict, list)):
+                    children.append((item, enabled and not disabled(item), expand and isinstance(item, dict)))
+        stack.extend(reversed(children))
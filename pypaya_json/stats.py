@@ -0,0 +1,108 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+def count_nodes(data: Any) -> int:
+    """Number of dicts, lists and scalars in a JSON tree."""
+    count = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+@dataclass
+class FileStats:
+    """What reading one file cost during a load."""
+
+    path: str  # Absolute path
+    depth: Optional[int] = None  # Include depth, 0 for the root file; None if it was never processed
+    bytes: int = 0  # Bytes read from disk, 0 for files taken from the parsed-file cache
+    read_seconds: float = 0.0
+    strip_seconds: float = 0.0  # Removing comments and trailing commas
+    parse_seconds: float = 0.0
+    nodes: int = 0  # Dicts, lists and scalars of the parsed document, before processing
+    cached: Optional[bool] = None  # Whether the parsed-file cache had it; None without a cache
+
+
+@dataclass
+class LoadStats:
+    """Where the time of a single load went.
+
+    Files are listed in the order they were read. Processing times are totals over the whole
+    load: filter_seconds covers scanning dictionaries (enable filtering) without the path
+    resolution counted in path_seconds, merge_seconds covers merging included data.
+    """
+
+    path: str  # Absolute path of the loaded file
+    seconds: float = 0.0  # Wall time of the whole load
+    files: List[FileStats] = field(default_factory=list)
+    filter_seconds: float = 0.0
+    path_seconds: float = 0.0
+    merge_seconds: float = 0.0
+    path_cache_hits: int = 0
+    path_cache_misses: int = 0
+    disk_cache_hit: Optional[bool] = None  # None without an on-disk cache
+    on_event: Optional[Callable[[str, Any], None]] = field(default=None, repr=False, compare=False)
+    _by_path: Dict[str, FileStats] = field(default_factory=dict, repr=False, compare=False)
+    _lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes read by the load."""
+        return sum(f.bytes for f in self.files)
+
+    @property
+    def read_seconds(self) -> float:
+        return sum(f.read_seconds for f in self.files)
+
+    @property
+    def strip_seconds(self) -> float:
+        return sum(f.strip_seconds for f in self.files)
+
+    @property
+    def parse_seconds(self) -> float:
+        return sum(f.parse_seconds for f in self.files)
+
+    @property
+    def nodes(self) -> int:
+        """Nodes of all parsed documents, before processing."""
+        return sum(f.nodes for f in self.files)
+
+    @property
+    def max_depth(self) -> int:
+        """Deepest include level reached."""
+        return max((f.depth for f in self.files if f.depth is not None), default=0)
+
+    @property
+    def file_cache_hits(self) -> int:
+        return sum(1 for f in self.files if f.cached)
+
+    @property
+    def file_cache_misses(self) -> int:
+        return sum(1 for f in self.files if f.cached is False)
+
+    def add_file(self, record: FileStats) -> None:
+        """Record a file that was read; may be called from prefetching threads."""
+        with self._lock:
+            self.files.append(record)
+            self._by_path.setdefault(record.path, record)
+        self.emit("file", record)
+
+    def set_depth(self, path: str, depth: int) -> None:
+        """Record the include depth at which the file at path was processed."""
+        record = self._by_path.get(os.path.abspath(path))
+        if record is not None and record.depth is None:
+            record.depth = depth
+
+    def emit(self, event: str, value: Any) -> None:
+        """Pass an event to the on_event callback, if any."""
+        if self.on_event is not None:
+            self.on_event(event, value)
@@ -0,0 +1,268 @@
+import codecs
+import json
+import re
+from itertools import accumulate, count
+from operator import sub
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+# Characters JSON allows between tokens
+_WHITESPACE = " \t\n\r"
+
+_WS = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")  # Numbers, true, false and null
+# Everything up to the next bracket, strings included, so that skipping a value loops once per bracket
+_NESTED_RUN = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+# Text whose strings are all complete, i.e. up to a string cut by the end of the text
+_COMPLETE_STRINGS = re.compile(rb'[^"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"]*)*', re.DOTALL)
+_WINDOW = 1 << 16
+_NOT_BRACKETS = bytes(c for c in range(256) if c not in b"[]{}")
+_BRACKET_STEPS = bytes.maketrans(b"[]{}", b"\x02\x00\x02\x00")
+_BOM = b"\xef\xbb\xbf"
+
+
+class _Buffer:
+    """Decoded text of a file, read in chunks as far as parsing needs it."""
+
+    def __init__(self, file: BinaryIO, chunk_size: int, limit: Optional[int] = None):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._left = limit  # Bytes of the file still to be read, None for all of it
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size: int = 0) -> bool:
+        """Read more of the file, dropping the consumed text; returns False at the end of the file."""
+        if self.eof:
+            return False
+        size = max(size, self._chunk_size)
+        if self._left is not None:
+            size = min(size, self._left)
+        data = self._file.read(size) if size else b""
+        if self._left is not None:
+            self._left -= len(data)
+        self.eof = not data
+        self.text = self.text[self.pos:] + self._decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def next_char(self) -> str:
+        """Skip whitespace and return the next character without consuming it, "" at the end."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        """Parse the value starting at the current position."""
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                # Most likely cut off by the end of the buffer; read more, growing the reads
+                # so that large values are not parsed again for every chunk
+                if not self.fill(size):
+                    raise
+                size *= 2
+                continue
+            if len(self.text) - end < 3 and not self.eof:
+                # A number cut by the end of the buffer (e.g. "12", "1." or "1e+") goes on in the next chunk
+                self.fill(size)
+                continue
+            self.pos = end
+            return value
+
+
+def is_array_file(path: str, chunk_size: int = 1 << 16) -> bool:
+    """Whether the JSON file at path holds an array, judging by its first character."""
+    with open(path, 'rb') as f:
+        return _Buffer(f, chunk_size).next_char() == "["
+
+
+def iter_array(path: str, chunk_size: int = 1 << 16, start: int = 0, end: Optional[int] = None) -> Iterator[Any]:
+    """
+    Parse the elements of the JSON array in the file at path, one at a time.
+
+    The file is read in chunks and each element is parsed with the standard library as soon as
+    it is complete, so memory use is bounded by the largest element rather than the file size.
+
+    Args:
+        path (str): The path to a JSON file whose top-level value is an array.
+        chunk_size (int): Number of bytes read at a time. Defaults to 64 KiB.
+        start (int): Byte offset of the array in the file, e.g. found by locate. Defaults to 0.
+        end (Optional[int]): Byte offset where the array ends. Defaults to None (the end of the file).
+
+    Yields:
+        Any: The parsed elements, unprocessed.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'rb') as f:
+        f.seek(start)
+        buffer = _Buffer(f, chunk_size, None if end is None else end - start)
+        if buffer.next_char() != "[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        buffer.pos += 1
+        if buffer.next_char() == "]":
+            buffer.pos += 1
+        else:
+            while True:
+                buffer.next_char()
+                yield buffer.decode(decoder)
+                char = buffer.next_char()
+                buffer.pos += 1
+                if char == "]":
+                    break
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in {path}, found {char or 'end of file'!r}")
+        if buffer.next_char():
+            raise ValueError(f"Extra data after the JSON array in {path}")
+
+
+def _brackets_outside_strings(window: bytes) -> Tuple[int, bytes]:
+    """The length of the start of window whose strings are complete, and its brackets outside strings."""
+    if b"\\" in window:
+        size = _COMPLETE_STRINGS.match(window).end()
+        outside = _STRING.sub(b"", window[:size])
+    else:
+        # Without escapes, every other quote-separated part is inside a string
+        parts = window.split(b'"')
+        size = len(window)
+        if len(parts) % 2 == 0:  # The last string is cut by the end of the window
+            size -= len(parts.pop()) + 1
+        outside = b"".join(parts[::2])
+    return size, outside.translate(None, _NOT_BRACKETS)
+
+
+def _skip_nested(buf: Any, pos: int) -> int:
+    """End position of the array or object starting at pos, found by counting brackets.
+
+    Windows of the data in which the depth does not drop to zero are skipped at once: their
+    brackets outside strings are extracted and the lowest depth among them is computed with
+    builtins only. Just the window where the value ends is stepped through bracket by bracket.
+    """
+    depth = 0
+    limit = pos  # Step through brackets up to here before trying a window again
+    while True:
+        if depth > 0 and pos >= limit:
+            size, brackets = _brackets_outside_strings(buf[pos:pos + _WINDOW])
+            # Running depth relative to the start of the window: opening brackets count 2, the
+            # position subtracts 1 for every bracket
+            lowest = min(map(sub, accumulate(brackets.translate(_BRACKET_STEPS)), count(1)), default=0)
+            if size and depth + lowest > 0:
+                depth += 2 * (brackets.count(b"{") + brackets.count(b"[")) - len(brackets)
+                pos += size
+                continue
+            limit = pos + max(size, 1)
+        pos = _NESTED_RUN.match(buf, pos).end()
+        char = buf[pos:pos + 1]
+        if char == b"{" or char == b"[":
+            depth += 1
+        elif char == b"}" or char == b"]":
+            depth -= 1
+        else:  # An unterminated string or the end of the data
+            raise ValueError(f"Invalid JSON at position {pos}")
+        pos += 1
+        if depth == 0:
+            return pos
+
+
+def _skip_value(buf: Any, pos: int) -> int:
+    """End position of the JSON value starting at pos, found without parsing it."""
+    char = buf[pos:pos + 1]
+    if char == b"{" or char == b"[":
+        return _skip_nested(buf, pos)
+    match = (_STRING if char == b'"' else _SCALAR).match(buf, pos)
+    if match is None:
+        raise ValueError(f"Invalid JSON at position {pos}")
+    return match.end()
+
+
+def locate(buf: Any, keys: List[str], reject: Callable[[int, str], bool],
+           enable_key: Optional[str] = None) -> Optional[Tuple[int, int]]:
+    """
+    Find the value at a key path of a JSON document without parsing the rest of it.
+
+    Values that are not on the key path are skipped by counting brackets, without building
+    any objects. The keys of every dictionary on the path are still all scanned, so that
+    keys after the selected one can reject the shortcut.
+
+    Args:
+        buf (Any): The UTF-8 encoded document, as bytes or another buffer such as an mmap.
+        keys (List[str]): The key path, through dictionaries only.
+        reject (Callable[[int, str], bool]): Called with the depth and every key of the
+            dictionaries on the path (the root is at depth 0); returning True gives up.
+        enable_key (Optional[str]): If given, gives up when a dictionary on the path below the
+            root has a false value for this key.
+
+    Returns:
+        Optional[Tuple[int, int]]: The start and end positions of the value, or None if the key
+            path goes through something other than dictionaries, a key occurs twice, reject
+            or enable_key gave up, or the value was not found.
+    """
+    pos = _WS.match(buf, 3 if buf[:3] == _BOM else 0).end()
+    if buf[pos:pos + 1] != b"{":
+        return None
+    pos = _WS.match(buf, pos + 1).end()
+    if buf[pos:pos + 1] == b"}":
+        return None
+    seen = [False] * len(keys)
+    found = None
+    level = 0
+    while True:
+        # At the start of a key of the dictionary at depth level
+        match = _STRING.match(buf, pos)
+        if match is None:
+            raise ValueError(f"Expected a key at position {pos}")
+        key = json.loads(match.group())
+        pos = _WS.match(buf, match.end()).end()
+        if buf[pos:pos + 1] != b":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        pos = _WS.match(buf, pos + 1).end()
+        if reject(level, key):
+            return None
+        if key == keys[level]:
+            if seen[level]:
+                return None  # The last occurrence wins, the one found may be overridden
+            seen[level] = True
+            if level + 1 == len(keys):
+                start, pos = pos, _skip_value(buf, pos)
+                found = (start, pos)
+            elif buf[pos:pos + 1] == b"{":
+                pos = _WS.match(buf, pos + 1).end()
+                if buf[pos:pos + 1] == b"}":
+                    return None
+                level += 1
+                continue
+            else:
+                return None
+        elif level > 0 and key == enable_key:
+            end = _skip_value(buf, pos)
+            if not json.loads(bytes(buf[pos:end])):
+                return None
+            pos = end
+        else:
+            pos = _skip_value(buf, pos)
+
+        # After a value: the next key, or the end of the dictionary and of the value holding it
+        while True:
+            pos = _WS.match(buf, pos).end()
+            char = buf[pos:pos + 1]
+            if char == b",":
+                pos = _WS.match(buf, pos + 1).end()
+                break
+            if char != b"}":
+                raise ValueError(f"Expected ',' or '}}' at position {pos}")
+            pos += 1
+            if level == 0:
+                if _WS.match(buf, pos).end() != len(buf):
+                    raise ValueError(f"Extra data at position {pos}")
+                return found
+            level -= 1
@@ -0,0 +1,136 @@
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Set
+
+from pypaya_json.disk_cache import file_signature
+
+if TYPE_CHECKING:
+    from pypaya_json.core import PypayaJSON
+
+_MISSING = object()
+
+
+class _Reader:
+    """Supplies parsed documents, re-reading only the files whose signature changed."""
+
+    def __init__(self, read: Callable[[str], Any], raw: Dict[str, Any]):
+        self._read = read
+        self.raw = raw  # absolute path -> (signature, parsed document)
+
+    def get(self, path: str) -> Any:
+        key = os.path.abspath(path)
+        signature = file_signature(path)
+        entry = self.raw.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        data = self._read(path)
+        self.raw[key] = (signature, data)
+        return data
+
+    def close(self) -> None:
+        pass
+
+
+def _changed_keys(old: Any, new: Any) -> List[Any]:
+    """Top-level keys whose value differs between two results; [None] for changed non-dict results."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return [] if old == new else [None]
+    changed = [key for key, value in new.items() if old.get(key, _MISSING) != value]
+    changed.extend(key for key in old if key not in new)
+    return changed
+
+
+class LoadedConfig:
+    """A loaded JSON file that can be refreshed when the files it was built from change.
+
+    The handle keeps the parsed and the processed form of every file of the last load, and
+    which file includes which. refresh() only stats those files; when some changed, only they
+    and the files including them (directly or not) are processed again, the processed
+    documents of all other files are reused.
+    """
+
+    def __init__(self, loader: "PypayaJSON", path: str):
+        """
+        Load path with loader.
+
+        Args:
+            loader (PypayaJSON): The loader whose configuration is used.
+            path (str): The path to the JSON file.
+        """
+        self.loader = loader
+        self.path = path
+        self.root = os.path.abspath(path)
+        self.data = None
+        self._raw = {}  # absolute path -> (signature, parsed document)
+        self._documents = {}  # absolute path -> processed document, only the root one is handed out
+        self._includes = {}  # absolute path -> absolute paths of the documents it loaded
+        self._reload(set())
+
+    @property
+    def files(self) -> List[str]:
+        """Absolute paths of the files the data depends on."""
+        return sorted(self._raw)
+
+    def changed_files(self) -> List[str]:
+        """Absolute paths of the files that changed (or disappeared) since the last load."""
+        changed = []
+        for path, (signature, _) in self._raw.items():
+            try:
+                current = file_signature(path)
+            except OSError:
+                current = None
+            if current != signature:
+                changed.append(path)
+        return changed
+
+    def refresh(self) -> List[Any]:
+        """
+        Reload the data if any of its files changed.
+
+        Returns:
+            List[Any]: The top-level keys whose value changed, added and removed keys included.
+                Empty if nothing changed. If the data is not a dictionary, a change is reported
+                as [None].
+        """
+        changed = self.changed_files()
+        if not changed:
+            return []
+        old = self.data
+        self._reload(self._with_ancestors(changed))
+        return _changed_keys(old, self.data)
+
+    def _with_ancestors(self, paths: Iterable[str]) -> Set[str]:
+        parents = {}
+        for parent, children in self._includes.items():
+            for child in children:
+                parents.setdefault(child, []).append(parent)
+        affected = set(paths)
+        stack = list(affected)
+        while stack:
+            for parent in parents.get(stack.pop(), ()):
+                if parent not in affected:
+                    affected.add(parent)
+                    stack.append(parent)
+        return affected
+
+    def _reload(self, affected: Set[str]) -> None:
+        documents = {key: document for key, document in self._documents.items() if key not in affected}
+        # The state is only replaced once the load succeeded
+        reader = _Reader(self.loader._read_json, dict(self._raw))
+        data, context = self.loader._load_incremental(self.path, reader, documents)
+        for key, signature in context.files.items():
+            reader.raw[key] = (signature, None)  # Directories listed by fragment includes
+
+        includes = {key: children for key, children in self._includes.items() if key not in affected}
+        includes.update(context.includes)
+        reachable = {self.root}
+        stack = [self.root]
+        while stack:
+            for child in includes.get(stack.pop(), ()):
+                if child not in reachable:
+                    reachable.add(child)
+                    stack.append(child)
+
+        self._includes = {key: children for key, children in includes.items() if key in reachable}
+        self._documents = {key: document for key, document in context.documents.items() if key in reachable}
+        self._raw = {key: entry for key, entry in reader.raw.items() if key in reachable}
+        self.data = data
@@ -0,0 +1,28 @@
+import json
+import os
+import pytest
+from pypaya_json import PypayaJSON
+
+
+@pytest.fixture
+def write_tree(tmpdir):
+    """Write files given as {relative path: JSON content} under tmpdir and return tmpdir."""
+    def write(files):
+        for name, content in files.items():
+            tmpdir.join(name).write(json.dumps(content), ensure=True)
+        return tmpdir
+    return write
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Base names of the files parsed by PypayaJSON instances."""
+    names = []
+    original = PypayaJSON._parse_file
+
+    def parse_file(self, path):
+        names.append(os.path.basename(path))
+        return original(self, path)
+
+    monkeypatch.setattr(PypayaJSON, "_parse_file", parse_file)
+    return names
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from pypaya_json import PypayaJSON
+
+
+@pytest.fixture
+def include_tree(write_tree):
+    files = {
+        "main.json": {
+            "@path:data": "data",
+            "include": [{"filename": "a.json"}, {"filename": "sub/b.json"}],
+            "items": [{"include": {"filename": "list.json"}}, {"include": {"filename": "list.json"}}],
+            "section": {"replace_value": {"filename": "a.json", "key": "a"}},
+        },
+        "a.json": {"a": {"value": 1}},
+        "sub/b.json": {"b": 2, "more": {"include": {"filename": "c.json"}}},
+        "sub/c.json": {"c": 3},
+        "list.json": [1, {"x": 2}],
+    }
+    return str(write_tree(files).join("main.json"))
+
+
+def test_aload_file_matches_load_file(include_tree):
+    loader = PypayaJSON()
+    assert asyncio.run(loader.aload_file(include_tree)) == loader.load_file(include_tree)
+    assert asyncio.run(PypayaJSON.aload(include_tree, max_concurrency=1)) == PypayaJSON.load(include_tree)
+
+
+def test_aload_file_limits_concurrency(include_tree, monkeypatch):
+    loader = PypayaJSON()
+    original = loader._parse_file
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def parse_file(path):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(path)
+        return original(path)
+
+    monkeypatch.setattr(loader, "_parse_file", parse_file)
+    asyncio.run(loader.aload_file(include_tree, max_concurrency=2))
+    assert len(peak) == 5  # Every file is read once
+    assert max(peak) == 2
+
+
+def test_aload_file_does_not_block_event_loop(include_tree, monkeypatch):
+    loader = PypayaJSON()
+    original = loader._parse_file
+
+    def parse_file(path):
+        time.sleep(0.02)
+        return original(path)
+
+    monkeypatch.setattr(loader, "_parse_file", parse_file)
+
+    async def main():
+        ticks = 0
+        task = asyncio.ensure_future(loader.aload_file(include_tree))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.001)
+        return ticks, task.result()
+
+    ticks, data = asyncio.run(main())
+    assert ticks > 5
+    assert data["more"] == {"c": 3}
+
+
+def test_aload_file_missing_include(tmpdir):
+    p = tmpdir.join("main.json")
+    p.write(json.dumps({"include": {"filename": "missing.json"}}))
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(PypayaJSON().aload_file(str(p)))
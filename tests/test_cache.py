@@ -0,0 +1,69 @@
+import pytest
+from pypaya_json.cache import FileCache
+
+
+def test_get_returns_default_on_miss():
+    cache = FileCache()
+    sentinel = object()
+    assert cache.get("a", (1, 1), sentinel) is sentinel
+    assert cache.info().misses == 1
+
+
+def test_get_hit_with_matching_signature():
+    cache = FileCache()
+    cache.put("a", (1, 10), {"x": 1}, 10)
+    assert cache.get("a", (1, 10)) == {"x": 1}
+    info = cache.info()
+    assert info.hits == 1
+    assert info.currsize == 1
+    assert info.currbytes == 10
+
+
+def test_signature_mismatch_drops_entry():
+    cache = FileCache()
+    cache.put("a", (1, 10), {"x": 1}, 10)
+    assert cache.get("a", (2, 10)) is None
+    assert cache.info().currsize == 0
+    assert cache.info().currbytes == 0
+
+
+def test_evicts_least_recently_used_entry():
+    cache = FileCache(max_entries=2)
+    cache.put("a", 1, "A", 1)
+    cache.put("b", 1, "B", 1)
+    cache.get("a", 1)  # "b" is now the least recently used
+    cache.put("c", 1, "C", 1)
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == "A"
+    assert cache.get("c", 1) == "C"
+
+
+def test_evicts_to_respect_byte_limit():
+    cache = FileCache(max_bytes=100)
+    cache.put("a", 1, "A", 60)
+    cache.put("b", 1, "B", 60)
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1) == "B"
+    assert cache.info().currbytes == 60
+
+
+def test_oversized_entry_is_not_cached():
+    cache = FileCache(max_bytes=100)
+    cache.put("a", 1, "A", 50)
+    cache.put("b", 1, "B", 500)
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == "A"
+
+
+def test_clear_resets_entries_and_statistics():
+    cache = FileCache()
+    cache.put("a", 1, "A", 1)
+    cache.get("a", 1)
+    cache.clear()
+    assert cache.info() == (0, 0, 128, 0, 64 * 1024 * 1024, 0)
+
+
+@pytest.mark.parametrize("kwargs", [{"max_entries": 0}, {"max_bytes": 0}])
+def test_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        FileCache(**kwargs)
@@ -0,0 +1,56 @@
+import json
+import mmap
+import pytest
+from pypaya_json.comments import has_comment_markers, strip_comments
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1} // comment', {"a": 1}),
+    ('{\n  // "b": 2,\n  "a": 1\n}', {"a": 1}),
+    ('{"url": "http://example.com"} // comment', {"url": "http://example.com"}),
+    ('{"a": /* inline */ 1, /* multi\nline */ "b": 2}', {"a": 1, "b": 2}),
+    ('{"a": [1, 2, ], "b": 3, }', {"a": [1, 2], "b": 3}),
+    ('{"a": 1, // trailing\n}', {"a": 1}),
+    ('{"a": "quote \\" // not a comment"}', {"a": 'quote " // not a comment'}),
+    ('{"a": ", ]"}', {"a": ", ]"}),
+    ('{\n  "a": 1, // /* legacy\n  "b": 2 /* x */\n}', {"a": 1, "b": 2}),  # No block comment in a line comment
+    ('{"a": [1, // */ ]\n 2, /* x */ ]}', {"a": [1, 2]}),
+])
+def test_strip_comments(text, expected):
+    assert json.loads(strip_comments(text, "//")) == expected
+
+
+@pytest.mark.parametrize("text, expected", [('{"a": 1} // c', True), ('{"a": "/ *"}', False)])
+def test_has_comment_markers_in_memory_map(tmpdir, text, expected):
+    p = tmpdir.join("config.json")
+    p.write(text)
+    with open(str(p), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        assert has_comment_markers(buf, "//") is expected
+
+
+def test_strip_comments_multi_character_marker():
+    text = '{"range": "1--2", -- comment with "quote\n "dash": "-", "n": -1}'
+    assert json.loads(strip_comments(text, "--")) == {"range": "1--2", "dash": "-", "n": -1}
+
+
+def test_block_comment_ends_at_first_terminator():
+    text = '{"a": "/*", /* one */ "b": [1, /* two */ 2]}'
+    assert json.loads(strip_comments(text, "//")) == {"a": "/*", "b": [1, 2]}
+
+
+def test_strip_comments_bytes():
+    text = '{"name": "café", # comment\n "b": [1,]}'.encode("utf-8")
+    stripped = strip_comments(text, "#")
+    assert isinstance(stripped, bytes)
+    assert json.loads(stripped) == {"name": "café", "b": [1]}
+
+
+def test_strip_comments_returns_text_unchanged_without_comments():
+    text = '{"a": 1}'
+    assert strip_comments(text, "#") == text
+
+
+def test_has_comment_markers():
+    assert has_comment_markers('{"a": 1} # x', "#")
+    assert has_comment_markers(b'{"a": /* x */ 1}', "#")
+    assert not has_comment_markers('{"a": 1}', "#")
@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+import pytest
+from pypaya_json import FrozenDict, PypayaJSON
+from pypaya_json.compact import Compactor
+
+
+def test_identical_subtrees_are_shared():
+    compactor = Compactor()
+    data = compactor.compact({"a": {"act": {"type": "relu"}}, "b": [{"act": {"type": "relu"}}]})
+    assert data == {"a": {"act": {"type": "relu"}}, "b": [{"act": {"type": "relu"}}]}
+    assert type(data) is FrozenDict
+    assert data["a"] is data["b"][0]
+    # Also across documents
+    assert compactor.compact([{"type": "relu"}])[0] is data["a"]["act"]
+
+
+@pytest.mark.parametrize("first,second", [(1, True), (1, 1.0), (0.0, -0.0)])
+def test_equal_but_different_values_are_not_shared(first, second):
+    data = Compactor().compact([{"x": first}, {"x": second}, [{"x": first}], [{"x": second}]])
+    assert data[0] is not data[1] and data[2] is not data[3]
+    assert type(data[1]["x"]) is type(second) and repr(data[1]["x"]) == repr(second)
+
+
+def test_strings_are_interned():
+    key, value, long_value = "".join(["na", "me"]), "".join(["re", "lu"]), "x" * 100
+    data = Compactor().compact({key: value, "long": long_value}, share_subtrees=False)
+    assert type(data) is dict
+    assert next(iter(data)) is sys.intern("name") and data["name"] is sys.intern("relu")
+    assert data["long"] is long_value
+
+
+def test_compact_loads(tmpdir):
+    tmpdir.join("a.json").write(json.dumps({"act": {"type": "relu", "inplace": True}}))
+    tmpdir.join("b.json").write(json.dumps({"layers": [{"type": "relu", "inplace": True}, 1]}))
+    tmpdir.join("main.json").write(json.dumps({"a": {"include": {"filename": "a.json"}},
+                                               "b": {"include": {"filename": "b.json"}}}))
+    path = str(tmpdir.join("main.json"))
+    expected = PypayaJSON().load_file(path)
+
+    data = PypayaJSON(frozen=True, compact=True).load_file(path)
+    assert data == expected
+    assert data["a"]["act"] is data["b"]["layers"][0]
+
+    data = PypayaJSON(compact=True).load_file(path)
+    assert data == expected and type(data) is dict
+    assert data["a"]["act"] is not data["b"]["layers"][0]
+
+
+def test_shared_subtrees_are_dropped_with_their_documents(tmpdir):
+    loader = PypayaJSON(frozen=True, compact=True)
+    path = str(tmpdir.join("main.json"))
+    sizes = []
+    for version in range(20):
+        tmpdir.join("main.json").write(json.dumps({"items": [{"i": i, "v": version} for i in range(200)]}))
+        os.utime(path, ns=(version, version))
+        data = loader.load_file(path)
+        assert data["items"][-1] == {"i": 199, "v": version}
+        sizes.append(len(loader._compactor._nodes))
+    assert sizes[-1] == sizes[0] == 202
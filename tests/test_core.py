@@ -1,4 +1,5 @@
 import json
+import os
 import pytest
 from pypaya_json.core import PypayaJSON
 
@@ -481,25 +482,6 @@ def test_path_annotation_with_includes(loader_with_paths, tmpdir):
     assert result["external_path"] == expected_external
 
 
-def test_has_path_annotations_detection(loader_with_paths):
-    """Test the _has_path_annotations optimization method."""
-    # Data with path annotations
-    data_with_paths = {"@path:test": "value", "regular": "value"}
-    assert loader_with_paths._has_path_annotations(data_with_paths) is True
-
-    # Data without path annotations
-    data_without_paths = {"regular": "value", "other": "value"}
-    assert loader_with_paths._has_path_annotations(data_without_paths) is False
-
-    # Nested data with path annotations
-    nested_data = {"level1": {"@path:nested": "value"}}
-    assert loader_with_paths._has_path_annotations(nested_data) is True
-
-    # List with path annotations
-    list_data = [{"@path:item": "value"}]
-    assert loader_with_paths._has_path_annotations(list_data) is True
-
-
 def test_path_annotation_class_method(tmpdir):
     """Test path annotations using the class method."""
     config_file = tmpdir.join("config.json")
@@ -573,3 +555,182 @@ def test_path_annotation_complex_nested_structure(loader_with_paths, tmpdir):
     assert "@path:model_path" not in result["inference"]
     assert "@path:dirpath" not in result["callbacks"][0]
     assert "@path:save_dir" not in result["callbacks"][1]
+
+
+def test_cache_disabled_by_default(loader):
+    assert loader.cache_info() is None
+    loader.cache_clear()  # No-op without a cache
+
+
+def test_cache_reuses_parsed_include(tmpdir):
+    loader = PypayaJSON(cache=True)
+    common = tmpdir.join("common.json")
+    common.write(json.dumps({"shared": {"value": 1}}))
+    for name in ("a.json", "b.json"):
+        tmpdir.join(name).write(json.dumps({"name": name, "include": {"filename": "common.json"}}))
+
+    assert loader.load_file(str(tmpdir.join("a.json"))) == {"name": "a.json", "shared": {"value": 1}}
+    assert loader.load_file(str(tmpdir.join("b.json"))) == {"name": "b.json", "shared": {"value": 1}}
+    info = loader.cache_info()
+    assert info.hits == 1
+    assert info.misses == 3
+    assert info.currsize == 3
+
+
+def test_cache_invalidated_when_file_changes(tmpdir):
+    loader = PypayaJSON(cache=True)
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({"value": 1}))
+    assert loader.load_file(str(p)) == {"value": 1}
+
+    p.write(json.dumps({"value": 22}))
+    stat = os.stat(str(p))
+    os.utime(str(p), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert loader.load_file(str(p)) == {"value": 22}
+    assert loader.cache_info().hits == 0
+
+
+def test_cached_entries_are_not_corrupted_by_processing(tmpdir):
+    loader = PypayaJSON(cache=True)
+    tmpdir.join("inner.json").write(json.dumps({"inner": [1, 2]}))
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({"include": {"filename": "inner.json"}, "nested": {"include": {"filename": "inner.json"}}}))
+
+    first = loader.load_file(str(p))
+    first["inner"].append(3)
+    first["nested"]["extra"] = True
+    second = loader.load_file(str(p))
+    assert second == {"inner": [1, 2], "nested": {"inner": [1, 2]}}
+
+
+def test_cache_clear(tmpdir):
+    loader = PypayaJSON(cache=True)
+    p = tmpdir.join("config.json")
+    p.write("{}")
+    loader.load_file(str(p))
+    loader.cache_clear()
+    assert loader.cache_info().currsize == 0
+
+
+def test_include_parsed_once_per_load(loader, tmpdir, parsed):
+    tmpdir.join("models.json").write(json.dumps({
+        "resnet": {"depth": 50, "layers": [1, 2]},
+        "vit": {"patch": 16, "layers": [3, 4]},
+    }))
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({
+        "a": {"include": {"filename": "models.json", "keys_path": "resnet"}},
+        "b": {"include": {"filename": "models.json", "keys_path": "resnet"}},
+        "c": {"include": {"filename": "models.json", "keys": ["vit"]}},
+        "d": {"replace_value": {"filename": "models.json", "key": "vit"}},
+    }))
+
+    result = loader.load_file(str(p))
+
+    assert result == {
+        "a": {"depth": 50, "layers": [1, 2]},
+        "b": {"depth": 50, "layers": [1, 2]},
+        "c": {"vit": {"patch": 16, "layers": [3, 4]}},
+        "d": {"patch": 16, "layers": [3, 4]},
+    }
+    assert len(parsed) == 2
+    # Include sites never share containers
+    assert result["a"]["layers"] is not result["b"]["layers"]
+    assert result["c"]["vit"]["layers"] is not result["d"]["layers"]
+
+    # The memo is scoped to a single load
+    loader.load_file(str(p))
+    assert len(parsed) == 4
+
+
+def test_process_data_does_not_modify_input(loader, tmpdir):
+    p = tmpdir.join("inner.json")
+    p.write(json.dumps({"included_key": "included_value"}))
+    data = {
+        "@path:data_dir": "data",
+        "nested": {"include": {"filename": str(p)}, "off": {"enabled": False}},
+        "items": [{"include": {"filename": str(p)}}, {"enabled": False}],
+    }
+    snapshot = json.loads(json.dumps(data))
+    result = loader._process_data(data, str(tmpdir))
+    assert data == snapshot
+    assert result == {
+        "data_dir": str(tmpdir.join("data")),
+        "nested": {"included_key": "included_value"},
+        "items": [{"included_key": "included_value"}],
+    }
+
+
+def test_process_data_deeply_nested(loader, tmpdir):
+    depth = 20000
+    data = {"@path:leaf": "data"}
+    for i in range(depth):
+        data = {"level": data, "items": [[i], {"enabled": False}]} if i % 1000 == 0 else {"level": data}
+
+    result = loader._process_data(data, str(tmpdir))
+
+    for _ in range(depth):
+        result = result["level"]
+    assert result == {"leaf": str(tmpdir.join("data"))}
+
+
+def test_long_include_chain(loader, tmpdir):
+    length = 3000
+    for i in range(length):
+        tmpdir.join(f"{i}.json").write(json.dumps({f"key{i}": i, "include": {"filename": f"{i + 1}.json"}}))
+    tmpdir.join(f"{length}.json").write(json.dumps({"last": True}))
+
+    result = loader.load_file(str(tmpdir.join("0.json")))
+
+    assert len(result) == length + 1
+    assert result["key2999"] == 2999
+    assert result["last"] is True
+
+
+def test_circular_include(loader, tmpdir):
+    tmpdir.join("a.json").write(json.dumps({"include": {"filename": "b.json"}}))
+    tmpdir.join("b.json").write(json.dumps({"nested": {"include": {"filename": "a.json"}}}))
+    with pytest.raises(ValueError, match="Circular include"):
+        loader.load_file(str(tmpdir.join("a.json")))
+
+
+def test_replace_value_applied_after_include(loader, tmpdir):
+    tmpdir.join("value.json").write(json.dumps({"v": 1}))
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({"a": {
+        "replace_value": {"filename": "value.json", "key": "v"},
+        "include": {"filename": "missing.json"},
+    }}))
+    # The include is still merged before the replacement, so a broken include is reported
+    with pytest.raises(FileNotFoundError):
+        loader.load_file(str(p))
+
+
+def test_included_data_is_not_filtered_again(loader, tmpdir):
+    """Included data is processed once, in its own file; the including file does not filter it again."""
+    tmpdir.join("optional.json").write(json.dumps({"enabled": False, "v": 1}))
+    tmpdir.join("inner.json").write(json.dumps({"items": [{"include": {"filename": "optional.json"}}]}))
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({"a": {"include": {"filename": "inner.json"}}}))
+    # The root of an included file is never checked against the enable key
+    assert loader.load_file(str(p)) == {"a": {"items": [{"enabled": False, "v": 1}]}}
+
+
+def test_enable_flag_checked_before_filtering(loader):
+    """A container used as enable flag is evaluated as written, not after its own filtering."""
+    data = {"outer": {"inner": {"enabled": {"x": {"enabled": False}}, "v": 1}}}
+    assert loader._process_data(data, "") == {"outer": {"inner": {"enabled": {}, "v": 1}}}
+
+
+def test_comments_keep_markers_inside_strings(tmpdir):
+    loader = PypayaJSON(comment_string="//")
+    p = tmpdir.join("config.json")
+    p.write('{\n  "url": "https://example.com", // the endpoint\n  /* "debug": true, */\n  "workers": 4,\n}')
+    assert loader.load_file(str(p)) == {"url": "https://example.com", "workers": 4}
+
+
+def test_trailing_commas_without_comments(tmpdir):
+    loader = PypayaJSON(comment_string="#")
+    p = tmpdir.join("config.json")
+    p.write('{"items": [1, 2,],}')
+    assert loader.load_file(str(p)) == {"items": [1, 2]}
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json.disk_cache import DiskCache, file_signature
+
+
+@pytest.fixture
+def config(tmpdir):
+    tmpdir.join("base.json").write(json.dumps({"base": {"value": 1}}))
+    main = tmpdir.join("main.json")
+    main.write(json.dumps({"include": {"filename": "base.json"}, "name": "main"}))
+    return str(main)
+
+
+@pytest.fixture
+def cache_dir(tmpdir):
+    return str(tmpdir.join("cache"))
+
+
+def test_disk_cache_reused_across_loaders(config, cache_dir, parsed):
+    expected = PypayaJSON().load_file(config)
+    assert PypayaJSON(disk_cache=cache_dir).load_file(config) == expected
+
+    loader = PypayaJSON(disk_cache=cache_dir)
+    parsed.clear()
+    assert loader.load_file(config) == expected
+    assert parsed == []
+
+
+def test_disk_cache_invalidated_when_include_changes(config, cache_dir, tmpdir, parsed):
+    PypayaJSON(disk_cache=cache_dir).load_file(config)
+    tmpdir.join("base.json").write(json.dumps({"base": {"value": 22}}))
+
+    loader = PypayaJSON(disk_cache=cache_dir)
+    parsed.clear()
+    assert loader.load_file(config)["base"] == {"value": 22}
+    assert sorted(parsed) == ["base.json", "main.json"]
+
+
+def test_disk_cache_key_includes_settings(tmpdir, cache_dir):
+    p = tmpdir.join("config.json")
+    p.write(json.dumps({"a": {"enabled": False}, "b": {"active": False}}))
+    assert PypayaJSON(disk_cache=cache_dir).load_file(str(p)) == {"b": {"active": False}}
+    assert PypayaJSON(enable_key="active", disk_cache=cache_dir).load_file(str(p)) == {"a": {"enabled": False}}
+
+
+def test_disk_cache_hash_survives_touch(config, cache_dir, tmpdir, parsed):
+    PypayaJSON(disk_cache=cache_dir, disk_cache_hash=True).load_file(config)
+    base = str(tmpdir.join("base.json"))
+    stat = os.stat(base)
+    os.utime(base, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    loader = PypayaJSON(disk_cache=cache_dir, disk_cache_hash=True)
+    parsed.clear()
+    loader.load_file(config)
+    assert parsed == []
+
+
+def test_disk_cache_with_aload_file(config, cache_dir, parsed):
+    expected = asyncio.run(PypayaJSON(disk_cache=cache_dir).aload_file(config))
+    loader = PypayaJSON(disk_cache=cache_dir)
+    parsed.clear()
+    assert asyncio.run(loader.aload_file(config)) == expected
+    assert parsed == []
+
+
+def test_disk_cache_ignores_corrupt_entries(config, cache_dir):
+    loader = PypayaJSON(disk_cache=cache_dir)
+    expected = loader.load_file(config)
+    for name in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, name), "wb") as f:
+            f.write(b"garbage")
+    assert loader.load_file(config) == expected
+
+
+def test_disk_cache_put_and_clear(tmpdir):
+    cache = DiskCache(str(tmpdir.join("cache")))
+    source = tmpdir.join("source.json")
+    source.write("{}")
+    key = cache.key(str(source), ("settings",))
+    assert cache.put(key, {str(source): file_signature(str(source))}, {"a": [1, 2.5, None]})
+    assert cache.get(key) == {"a": [1, 2.5, None]}
+    assert [name for name in os.listdir(cache.directory) if name.startswith(".tmp-")] == []
+
+    # Not written when the file changed after its signature was taken
+    signature = file_signature(str(source))
+    source.write('{"changed": true}')
+    assert not cache.put(key, {str(source): signature}, {})
+
+    cache.clear()
+    assert cache.get(key) is None
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json.fragments import DirectoryListing
+
+
+@pytest.fixture
+def tree(tmpdir):
+    """main.json includes every fragment of conf.d, which sorts after the file names."""
+    conf = tmpdir.mkdir("conf.d")
+    conf.join("20-b.json").write(json.dumps({"b": 2, "level": "b"}))
+    conf.join("10-a.json").write(json.dumps({"a": 1, "level": "a", "@path:data": "data"}))
+    conf.join(".hidden.json").write(json.dumps({"hidden": True}))
+    conf.join("notes.txt").write("not json")
+    conf.mkdir("sub").join("30-c.json").write(json.dumps({"c": 3}))
+    tmpdir.join("main.json").write(json.dumps({"include": {"filename": "conf.d/*.json"}, "name": "main"}))
+    return tmpdir
+
+
+def age(path):
+    """Make path look unmodified for a while, so that its listing may be kept."""
+    os.utime(str(path), (1_000_000_000, 1_000_000_000))
+
+
+def test_glob_include_merges_fragments_in_order(tree):
+    data = PypayaJSON().load_file(str(tree.join("main.json")))
+    assert data == {"a": 1, "b": 2, "level": "b", "data": str(tree.join("conf.d", "data")), "name": "main"}
+
+
+@pytest.mark.parametrize("spec,expected", [
+    ({"directory": "conf.d"}, ["10-a.json", "20-b.json"]),
+    ({"directory": "conf.d/", "pattern": "2*.json"}, ["20-b.json"]),
+    ({"filename": "conf.d/**/*.json"}, ["10-a.json", "20-b.json", "sub/30-c.json"]),
+    ({"filename": "conf.d/.*.json"}, [".hidden.json"]),
+    ({"filename": "conf.d/*.yaml"}, []),
+])
+def test_list_include_splices_fragments(tree, spec, expected):
+    for name in ("10-a.json", "20-b.json", "sub/30-c.json", ".hidden.json"):
+        tree.join("conf.d", name).write(json.dumps([name]))
+    tree.join("list.json").write(json.dumps([0, {"include": spec}, 1]))
+    assert PypayaJSON().load_file(str(tree.join("list.json"))) == [0] + expected + [1]
+
+
+def test_missing_directory_and_literal_names(tree):
+    tree.join("missing.json").write(json.dumps({"include": {"directory": "missing"}}))
+    with pytest.raises(FileNotFoundError, match="Include directory not found"):
+        PypayaJSON().load_file(str(tree.join("missing.json")))
+    # Files whose names look like patterns can still be included
+    tree.join("a[1].json").write(json.dumps({"x": 1}))
+    tree.join("literal.json").write(json.dumps({"include": [{"filename": "a[1].json"}]}))
+    assert PypayaJSON().load_file(str(tree.join("literal.json"))) == {"x": 1}
+
+
+def test_listing_is_kept_until_the_directory_changes(tree, monkeypatch):
+    conf = tree.join("conf.d")
+    age(conf)
+    listing = DirectoryListing()
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    first = listing.expand(str(tree), "conf.d/*.json")
+    assert listing.expand(str(tree), "conf.d/*.json") == first and len(scans) == 1
+    assert first == (["conf.d/10-a.json", "conf.d/20-b.json"], {str(conf): (os.stat(str(conf)).st_mtime_ns,
+                                                                                os.stat(str(conf)).st_size)})
+    conf.join("15-x.json").write("{}")
+    assert "conf.d/15-x.json" in listing.expand(str(tree), "conf.d/*.json")[0] and len(scans) == 2
+
+
+@pytest.mark.parametrize("options", [{"prefetch_workers": 4}, {"frozen": True}, {"cache": True}])
+def test_fragments_with_other_options(tree, options):
+    path = str(tree.join("main.json"))
+    assert PypayaJSON(**options).load_file(path) == PypayaJSON().load_file(path)
+
+
+def test_aload_and_dependency_graph(tree):
+    path = str(tree.join("main.json"))
+    assert asyncio.run(PypayaJSON().aload_file(path)) == PypayaJSON().load_file(path)
+    graph = PypayaJSON().dependency_graph(path)
+    assert [os.path.basename(edge.child) for edge in graph.edges] == ["10-a.json", "20-b.json"]
+    lazy = PypayaJSON().load_file(path, lazy=True)
+    assert lazy["level"] == "b"
+
+
+def test_added_fragment_invalidates_cached_results(tree):
+    path = str(tree.join("main.json"))
+    frozen = PypayaJSON(frozen=True)
+    disk = PypayaJSON(disk_cache=str(tree.mkdir("cache")), disk_cache_hash=True, stats=True)
+    first = frozen.load_file(path)
+    disk.load_file(path)
+    handle = PypayaJSON().watch(path)
+    assert frozen.load_file(path) is first
+    disk.load_file(path)
+    assert disk.last_stats.disk_cache_hit
+
+    tree.join("conf.d", "30-c.json").write(json.dumps({"level": "c"}))
+    os.utime(str(tree.join("conf.d")), ns=(0, 0))
+    assert frozen.load_file(path)["level"] == "c"
+    assert disk.load_file(path)["level"] == "c"
+    assert handle.refresh() == ["level"] and handle.data["level"] == "c"
+
+
+def test_iter_file_with_fragments(tree):
+    conf = tree.join("conf.d")
+    conf.join("10-a.json").write(json.dumps([1, 2]))
+    conf.join("20-b.json").write(json.dumps({"x": 3}))
+    tree.join("array.json").write(json.dumps([0, {"include": {"directory": "conf.d"}}]))
+    assert list(PypayaJSON().iter_file(str(tree.join("array.json")))) == [0, 1, 2, {"x": 3}]
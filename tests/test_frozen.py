@@ -0,0 +1,88 @@
+import copy
+import json
+import os
+import pickle
+import pytest
+from pypaya_json import FrozenDict, FrozenList, PypayaJSON
+from pypaya_json.frozen import freeze, thaw
+
+
+@pytest.fixture
+def tree(tmpdir):
+    """main.json includes a.json and b.json, which both include shared.json."""
+    tmpdir.join("shared.json").write(json.dumps({"layers": [1, {"units": 8}], "@path:dir": "data"}))
+    for name in ("a", "b"):
+        tmpdir.join(f"{name}.json").write(json.dumps({"include": {"filename": "shared.json"}, "name": name}))
+    tmpdir.join("main.json").write(json.dumps({
+        "a": {"include": {"filename": "a.json"}},
+        "b": {"include": {"filename": "b.json"}},
+        "items": [{"include": {"filename": "shared.json", "keys_path": "layers"}}, 3],
+    }))
+    return tmpdir
+
+
+def test_freeze_and_thaw():
+    data = {"a": [1, {"b": [2, None]}], "c": {}}
+    frozen = freeze(data)
+    assert frozen == data and type(frozen["a"]) is FrozenList and type(frozen["a"][1]) is FrozenDict
+    assert freeze(frozen) is frozen
+    assert freeze({"x": frozen["a"]})["x"] is frozen["a"]
+    assert thaw(frozen) == data and type(thaw(frozen)["a"][1]) is dict
+    assert hash(frozen) == hash(freeze(data))
+    assert copy.deepcopy(frozen) is frozen
+    assert pickle.loads(pickle.dumps(frozen)) == data
+    assert json.dumps(frozen) == json.dumps(data)
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda d: d.__setitem__("x", 1), lambda d: d.update(x=1), lambda d: d.pop("c"),
+    lambda d: d["a"].append(1), lambda d: d["a"].__setitem__(0, 2), lambda d: d["a"].sort(),
+])
+def test_frozen_values_are_read_only(mutate):
+    with pytest.raises(TypeError):
+        mutate(freeze({"a": [1], "c": {}}))
+
+
+def test_frozen_load_equals_normal_load(tree):
+    path = str(tree.join("main.json"))
+    data = PypayaJSON(frozen=True).load_file(path)
+    assert data == PypayaJSON().load_file(path)
+    assert type(data) is FrozenDict and type(data["items"]) is FrozenList
+
+
+def test_include_sites_share_documents(tree):
+    data = PypayaJSON(frozen=True).load_file(str(tree.join("main.json")))
+    assert data["a"]["layers"] is data["b"]["layers"]
+    assert data["items"][1] is data["a"]["layers"][1]
+
+
+def test_successive_loads_share_unchanged_documents(tree):
+    loader = PypayaJSON(frozen=True)
+    path = str(tree.join("main.json"))
+    first = loader.load_file(path)
+    assert loader.load_file(path) is first
+
+    b = tree.join("b.json")
+    b.write(json.dumps({"include": {"filename": "shared.json"}, "name": "B"}))
+    os.utime(str(b), ns=(0, 0))
+    second = loader.load_file(path)
+    assert second is not first and second["b"]["name"] == "B"
+    # Dictionary-level includes merge into the including dictionary, the included values are shared
+    assert second["a"]["layers"] is first["a"]["layers"]
+    assert second["b"]["layers"] is first["b"]["layers"]
+    assert second["items"][1] is first["items"][1]
+
+    loader.cache_clear()
+    assert loader.load_file(path) is not second
+
+
+def test_frozen_with_disk_cache_and_load_many(tree):
+    path = str(tree.join("main.json"))
+    loader = PypayaJSON(frozen=True, disk_cache=str(tree.mkdir("cache")))
+    expected = PypayaJSON().load_file(path)
+    assert loader.load_file(path) == expected
+    data = PypayaJSON(frozen=True, disk_cache=str(tree.join("cache"))).load_file(path)
+    assert data == expected and type(data) is FrozenDict
+
+    results = PypayaJSON(frozen=True).load_many([path, str(tree.join("a.json"))])
+    assert results[0]["a"]["layers"] is results[1]["layers"]
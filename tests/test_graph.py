@@ -0,0 +1,49 @@
+import os
+import pytest
+from pypaya_json import DependencyGraph, IncludeEdge, PypayaJSON
+
+
+@pytest.fixture
+def include_tree(write_tree):
+    files = {
+        "main.json": {
+            "include": {"filename": "a.json", "keys_path": "a/b"},
+            "items": [{"include": {"filename": "sub/list.json"}}],
+            "section": {"replace_value": {"filename": "a.json", "key": "a"}},
+            "off": {"enabled": False, "include": {"filename": "missing.json"}},
+        },
+        "a.json": {"a": {"b": {"c": 1}}, "include": {"filename": "a.json", "keys": ["x"], "enabled": False}},
+        "sub/list.json": [{"include": {"filename": "../a.json"}}],
+    }
+    return write_tree(files)
+
+
+def test_dependency_graph(include_tree):
+    main, a, sub = (str(include_tree.join(name)) for name in ("main.json", "a.json", "sub/list.json"))
+    graph = PypayaJSON().dependency_graph(main)
+
+    assert isinstance(graph, DependencyGraph)
+    assert graph.root == main
+    assert graph.files == [main, a, sub]
+    assert graph.sizes[a] == os.path.getsize(a)
+    assert graph.total_bytes == sum(os.path.getsize(p) for p in (main, a, sub))
+    assert graph.edges == [
+        IncludeEdge(main, a, "include", True, keys_path="a/b"),
+        IncludeEdge(main, sub, "include", True),
+        IncludeEdge(main, a, "replace_value", True, key="a"),
+        IncludeEdge(main, str(include_tree.join("missing.json")), "include", False),
+        IncludeEdge(a, a, "include", False, keys=["x"]),
+        IncludeEdge(sub, a, "include", True),
+    ]
+    assert [e.parent for e in graph.parents(a)] == [main, main, sub]
+    assert len(graph.children(a)) == 0
+    assert len(graph.children(a, enabled_only=False)) == 1
+
+
+def test_dependency_graph_matches_files_read_by_load(include_tree, parsed):
+    loader = PypayaJSON()
+    loader.load_file(str(include_tree.join("main.json")))
+    loaded = sorted(set(parsed))
+    parsed.clear()
+    graph = loader.dependency_graph(str(include_tree.join("main.json")))
+    assert sorted(os.path.basename(path) for path in graph.files) == loaded
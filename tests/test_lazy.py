@@ -0,0 +1,172 @@
+import json
+import pytest
+from pypaya_json import LazyMapping, LazySequence, PypayaJSON
+
+
+@pytest.fixture
+def tree(write_tree):
+    files = {
+        "main.json": {
+            "name": "app",
+            "database": {"include": {"filename": "db.json"}, "port": 1},
+            "secret": {"replace_value": {"filename": "secrets.json", "key": "token"}},
+            "items": [1, {"include": {"filename": "items.json"}}, {"enabled": False}, [{"@path:p": "x"}]],
+            "pinned": {"include": {"filename": "db.json", "keys_path": "replica/host"}},
+            "off": {"enabled": False, "include": {"filename": "missing.json"}},
+            "@path:data": "data",
+        },
+        "db.json": {"host": "localhost", "port": 5432, "replica": {"host": "replica"},
+                    "pool": {"replace_value": {"filename": "secrets.json", "keys": ["pool"]}}},
+        "secrets.json": {"token": "s3cr3t", "pool": {"size": 4}},
+        "items.json": [{"a": 1}, {"include": {"filename": "secrets.json", "keys": ["token"]}}],
+    }
+    return write_tree(files)
+
+
+def test_lazy_resolve_matches_eager_load(tree):
+    loader = PypayaJSON()
+    data = loader.load_file(str(tree.join("main.json")), lazy=True)
+    assert isinstance(data, LazyMapping)
+    expected = loader.load_file(str(tree.join("main.json")))
+    resolved = data.resolve()
+    assert type(resolved) is dict and type(resolved["items"]) is list
+    assert resolved == expected
+    assert data == expected
+
+
+def test_lazy_loads_includes_on_access(tree, parsed):
+    data = PypayaJSON().load_file(str(tree.join("main.json")), lazy=True)
+    assert data["name"] == "app"
+    assert data["data"] == str(tree.join("data"))
+    assert parsed == ["main.json"]
+
+    database = data["database"]
+    assert isinstance(database, LazyMapping)
+    assert parsed == ["main.json"]
+    assert database["port"] == 5432
+    assert parsed == ["main.json", "db.json"]
+
+    assert data["pinned"] == {"host": "replica"}
+    assert parsed == ["main.json", "db.json"]  # Every file is read once per load
+
+
+def test_lazy_replace_value_loads_on_key_access(tree, parsed):
+    data = PypayaJSON().load_file(str(tree.join("main.json")), lazy=True)
+    assert "secret" in data
+    assert parsed == ["main.json"]
+    assert data["secret"] == "s3cr3t"
+    assert parsed == ["main.json", "secrets.json"]
+
+
+def test_lazy_include_with_replace_value(write_tree):
+    files = {
+        "main.json": {"outer": {
+            "listed": {"include": {"filename": "extra.json"}, "replace_value": {"filename": "items.json"}},
+            "scalar": {"include": {"filename": "extra.json"}, "replace_value": {"filename": "token.json", "key": "t"}},
+        }},
+        "extra.json": {"extra": True},
+        "items.json": [1, 2, 3],
+        "token.json": {"t": "s3cr3t"},
+    }
+    path = str(write_tree(files).join("main.json"))
+    loader = PypayaJSON()
+    expected = loader.load_file(path)
+    assert expected["outer"]["scalar"] == "s3cr3t"
+    data = loader.load_file(path, lazy=True)
+    assert isinstance(data["outer"]["listed"], LazySequence) and list(data["outer"]["listed"]) == [1, 2, 3]
+    assert data["outer"]["scalar"] == "s3cr3t"
+    assert data.resolve() == expected
+    assert loader.load_file(path, select=["outer/listed", "outer/scalar"]) == expected
+    assert list(loader.iter_file(path, key_path="outer/listed")) == [1, 2, 3]
+
+
+def test_lazy_sequence(tree):
+    items = PypayaJSON().load_file(str(tree.join("main.json")), lazy=True)["items"]
+    assert isinstance(items, LazySequence)
+    assert len(items) == 4
+    assert items[0] == 1
+    assert items[1:3] == [{"a": 1}, {"token": "s3cr3t"}]
+    assert items[-1] == [{"p": str(tree.join("x"))}]
+
+
+def test_lazy_values_are_read_only(tree):
+    data = PypayaJSON().load_file(str(tree.join("main.json")), lazy=True)
+    with pytest.raises(TypeError):
+        data["name"] = "other"
+    with pytest.raises(TypeError):
+        data["items"][0] = 2
+
+
+def test_lazy_circular_include(tmpdir):
+    tmpdir.join("a.json").write(json.dumps({"x": {"include": {"filename": "b.json"}}}))
+    tmpdir.join("b.json").write(json.dumps({"include": {"filename": "a.json"}}))
+    data = PypayaJSON().load_file(str(tmpdir.join("a.json")), lazy=True)
+    with pytest.raises(ValueError, match="Circular include"):
+        data.resolve()
+
+    tmpdir.join("c.json").write(json.dumps({"include": {"filename": "c.json"}}))
+    data = PypayaJSON().load_file(str(tmpdir.join("c.json")), lazy=True)
+    with pytest.raises(ValueError, match="Circular include"):
+        len(data)
+
+
+@pytest.mark.parametrize("kind", ["mapping", "sequence", "replace_value"])
+def test_lazy_long_include_chains(tmpdir, kind):
+    # Each file includes the next one; far deeper than the recursion limit allows nested calls for
+    length = 1500
+    for i in range(length):
+        spec = {"filename": f"{i + 1}.json"}
+        content = {"mapping": {f"k{i}": i, "include": spec}, "sequence": [i, {"include": spec}],
+                   "replace_value": {"replace_value": spec}}[kind]
+        tmpdir.join(f"{i}.json").write(json.dumps(content))
+    tmpdir.join(f"{length}.json").write(json.dumps([length] if kind == "sequence" else {"end": True}))
+    path = str(tmpdir.join("0.json"))
+    expected = PypayaJSON().load_file(path)
+    assert PypayaJSON().load_file(path, lazy=True).resolve() == expected
+    if kind == "mapping":
+        assert PypayaJSON().load_file(path, select=["end", "k1000"]) == {"end": True, "k1000": 1000}
+
+    tmpdir.join(f"{length}.json").write(json.dumps({"include": {"filename": "0.json"}} if kind != "replace_value"
+                                                   else {"replace_value": {"filename": "0.json"}}))
+    with pytest.raises(ValueError, match="Circular include"):
+        PypayaJSON().load_file(path, lazy=True).resolve()
+
+
+@pytest.fixture
+def selectable(write_tree):
+    files = {
+        "main.json": {
+            "include": {"filename": "base.json"},
+            "database": {
+                "primary": {"include": {"filename": "primary.json"}},
+                "replica": {"include": {"filename": "replica.json"}},
+            },
+            "logging": {"replace_value": {"filename": "logging.json"}},
+        },
+        "base.json": {"workers": {"count": 4, "@path:dir": "work"}},
+        "primary.json": {"host": "primary"},
+        "replica.json": {"host": "replica"},
+        "logging.json": {"level": "info"},
+    }
+    return write_tree(files)
+
+
+def test_select_loads_only_needed_files(selectable, parsed):
+    data = PypayaJSON().load_file(str(selectable.join("main.json")), select=["database/primary", ["workers"]])
+    assert data == {"database": {"primary": {"host": "primary"}},
+                    "workers": {"count": 4, "dir": str(selectable.join("work"))}}
+    assert type(data["database"]["primary"]) is dict
+    assert sorted(parsed) == ["base.json", "main.json", "primary.json"]
+
+
+def test_select_overlapping_and_missing_paths(selectable):
+    loader = PypayaJSON()
+    path = str(selectable.join("main.json"))
+    data = loader.load_file(path, select=["database/replica/host", "database", "logging/level"])
+    expected = loader.load_file(path)
+    assert data == {"database": expected["database"], "logging": {"level": "info"}}
+
+    with pytest.raises(KeyError):
+        loader.load_file(path, select=["database/missing"])
+    with pytest.raises(ValueError):
+        loader.load_file(path, lazy=True, select=["database"])
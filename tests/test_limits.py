@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+import re
+import pytest
+from pypaya_json import LoadLimitError, PypayaJSON
+
+
+def write(tmpdir, name, data):
+    tmpdir.join(name).write(json.dumps(data))
+    return str(tmpdir.join(name))
+
+
+def chain(tmpdir, length):
+    """0.json includes 1.json, which includes 2.json, ... up to length.json."""
+    for i in range(length):
+        write(tmpdir, f"{i}.json", {f"key{i}": i, "include": {"filename": f"{i + 1}.json"}})
+    write(tmpdir, f"{length}.json", {"last": True})
+    return str(tmpdir.join("0.json"))
+
+
+def test_circular_include_names_the_cycle(tmpdir):
+    write(tmpdir, "main.json", {"a": {"include": {"filename": "a.json"}}})
+    write(tmpdir, "a.json", {"include": {"filename": "b.json"}})
+    write(tmpdir, "b.json", {"nested": [{"include": {"filename": "a.json"}}]})
+    a, b = str(tmpdir.join("a.json")), str(tmpdir.join("b.json"))
+    with pytest.raises(ValueError) as info:
+        PypayaJSON().load_file(str(tmpdir.join("main.json")))
+    assert str(info.value).endswith(f": {a} -> {b} -> {a}")
+
+
+def test_circular_include_of_partially_parsed_file(tmpdir):
+    write(tmpdir, "a.json", {"x": {"y": {"include": {"filename": "a.json", "keys_path": "x"}}}})
+    with pytest.raises(ValueError, match="Circular include"):
+        PypayaJSON(partial_parse_min_bytes=0).load_file(str(tmpdir.join("a.json")))
+
+
+def test_circular_streamed_include_names_the_cycle(tmpdir):
+    write(tmpdir, "a.json", [1, {"include": {"filename": "b.json"}}])
+    write(tmpdir, "b.json", [2, {"include": {"filename": "a.json"}}])
+    a, b = str(tmpdir.join("a.json")), str(tmpdir.join("b.json"))
+    with pytest.raises(ValueError, match=re.escape(f"{a} -> {b} -> {a}")):
+        list(PypayaJSON().iter_file(a))
+
+
+def test_max_include_depth(tmpdir):
+    path = chain(tmpdir, 5)
+    assert PypayaJSON(max_include_depth=5).load_file(path)["last"] is True
+    with pytest.raises(LoadLimitError, match="max_include_depth=4"):
+        PypayaJSON(max_include_depth=4).load_file(path)
+
+
+def test_max_files_aborts_before_reading(tmpdir, monkeypatch):
+    path = chain(tmpdir, 5)
+    loader = PypayaJSON(max_files=3)
+    read = []
+    original = loader._read_json
+    monkeypatch.setattr(loader, "_read_json", lambda path, *args: read.append(path) or original(path, *args))
+    with pytest.raises(LoadLimitError, match="max_files=3"):
+        loader.load_file(path)
+    assert len(read) == 3
+    # Files included several times are read once
+    write(tmpdir, "twice.json", {"a": {"include": {"filename": "5.json"}}, "b": {"include": {"filename": "5.json"}}})
+    assert PypayaJSON(max_files=2).load_file(str(tmpdir.join("twice.json")))["b"] == {"last": True}
+
+
+@pytest.mark.parametrize("limit", [{"max_files": 3}, {"max_include_depth": 2}])
+@pytest.mark.parametrize("mode", ["prefetch", "aload"])
+def test_prefetching_stops_at_the_limits(tmpdir, monkeypatch, limit, mode):
+    path = chain(tmpdir, 8)
+    loader = PypayaJSON(prefetch_workers=4 if mode == "prefetch" else 0, **limit)
+    read = []
+    original = loader._read_json
+    monkeypatch.setattr(loader, "_read_json",
+                        lambda path, *args, **kwargs: read.append(path) or original(path, *args, **kwargs))
+    with pytest.raises(LoadLimitError):
+        if mode == "prefetch":
+            loader.load_file(path)
+        else:
+            asyncio.run(loader.aload_file(path))
+    assert sorted(os.path.basename(p) for p in read) == ["0.json", "1.json", "2.json"]
+
+
+def test_max_bytes(tmpdir):
+    big = write(tmpdir, "big.json", {"data": "x" * 1000})
+    path = write(tmpdir, "main.json", {"include": {"filename": "big.json"}})
+    total = os.path.getsize(big) + os.path.getsize(path)
+    assert PypayaJSON(max_bytes=total).load_file(path)["data"] == "x" * 1000
+    with pytest.raises(LoadLimitError, match=f"big.json exceeds max_bytes={total - 1}"):
+        PypayaJSON(max_bytes=total - 1).load_file(path)
+
+
+def test_max_nodes_counts_copies_for_every_include_site(tmpdir):
+    # Every level includes the previous one twice: the result has 2 ** 20 copies of leaf.json
+    write(tmpdir, "0.json", {"leaf": [1, 2, 3]})
+    for i in range(1, 21):
+        write(tmpdir, f"{i}.json", {"a": {"include": {"filename": f"{i - 1}.json"}},
+                                    "b": {"include": {"filename": f"{i - 1}.json"}}})
+    path = str(tmpdir.join("2.json"))
+    data = PypayaJSON(max_nodes=100).load_file(path)
+    assert data["b"]["b"] == {"leaf": [1, 2, 3]}
+    for options in ({}, {"frozen": True}):
+        with pytest.raises(LoadLimitError, match="max_nodes=10000"):
+            PypayaJSON(max_nodes=10000, **options).load_file(str(tmpdir.join("20.json")))
+
+
+def test_limits_apply_to_other_entry_points(tmpdir):
+    path = chain(tmpdir, 5)
+    loader = PypayaJSON(max_include_depth=2)
+    with pytest.raises(LoadLimitError):
+        loader.watch(path)
+    assert isinstance(loader.load_many([path], return_exceptions=True)[0], LoadLimitError)
+    write(tmpdir, "array.json", [1, {"include": {"filename": "0.json"}}])
+    with pytest.raises(LoadLimitError):
+        list(loader.iter_file(str(tmpdir.join("array.json"))))
+
+
+def test_negative_limit_rejected():
+    with pytest.raises(ValueError, match="max_nodes"):
+        PypayaJSON(max_nodes=-1)
@@ -0,0 +1,71 @@
+import json
+import pytest
+from pypaya_json import PypayaJSON
+
+
+@pytest.fixture
+def sweep(tmpdir):
+    """Ten configs including the same base file, which includes shared.json."""
+    tmpdir.join("shared.json").write(json.dumps({"lr": 0.1, "layers": [1, 2]}))
+    tmpdir.join("base.json").write(json.dumps({"model": {"include": {"filename": "shared.json"}},
+                                               "@path:data": "data"}))
+    paths = []
+    for i in range(10):
+        path = tmpdir.join(f"run_{i}.json")
+        path.write(json.dumps({"include": {"filename": "base.json"}, "seed": i}))
+        paths.append(str(path))
+    return paths
+
+
+def expected(paths):
+    loader = PypayaJSON()
+    return [loader.load_file(path) for path in paths]
+
+
+@pytest.mark.parametrize("workers,executor", [(0, "thread"), (4, "thread"), (2, "process")])
+def test_results_in_input_order(sweep, workers, executor):
+    results = PypayaJSON().load_many(sweep, workers=workers, executor=executor)
+    assert results == expected(sweep)
+    assert [r["seed"] for r in results] == list(range(10))
+
+
+def test_includes_are_processed_once_per_batch(sweep, parsed):
+    loader = PypayaJSON()
+    results = loader.load_many(sweep)
+    assert len(parsed) == len(sweep) + 2
+    # Include sites never share containers
+    results[0]["model"]["layers"].append(3)
+    assert results[1]["model"]["layers"] == [1, 2]
+
+
+def test_root_included_by_another_root(tmpdir):
+    tmpdir.join("a.json").write(json.dumps({"x": [1]}))
+    tmpdir.join("b.json").write(json.dumps({"include": {"filename": "a.json"}, "y": 2}))
+    paths = [str(tmpdir.join("b.json")), str(tmpdir.join("a.json")), str(tmpdir.join("a.json"))]
+    results = PypayaJSON().load_many(paths)
+    assert results == [{"x": [1], "y": 2}, {"x": [1]}, {"x": [1]}]
+    assert results[1]["x"] is not results[2]["x"] and results[0]["x"] is not results[1]["x"]
+
+
+def test_unordered_iterator(sweep):
+    results = PypayaJSON().load_many(sweep, workers=3, ordered=False)
+    assert sorted(results, key=lambda item: item[1]["seed"]) == list(zip(sweep, expected(sweep)))
+
+
+@pytest.mark.parametrize("workers,executor", [(0, "thread"), (2, "thread"), (2, "process")])
+def test_errors(sweep, tmpdir, workers, executor):
+    paths = sweep[:2] + [str(tmpdir.join("missing.json"))] + sweep[2:]
+    loader = PypayaJSON()
+    with pytest.raises(FileNotFoundError):
+        loader.load_many(paths, workers=workers, executor=executor)
+
+    results = loader.load_many(paths, workers=workers, executor=executor, return_exceptions=True)
+    assert isinstance(results[2], FileNotFoundError)
+    assert results[:2] + results[3:] == expected(sweep)
+
+
+def test_invalid_arguments(sweep):
+    with pytest.raises(ValueError):
+        PypayaJSON().load_many(sweep, workers=-1)
+    with pytest.raises(ValueError):
+        PypayaJSON().load_many(sweep, executor="fiber")
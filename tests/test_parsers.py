@@ -0,0 +1,89 @@
+import importlib.util
+import json
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json import parsers
+from pypaya_json.parsers import accepts_buffers, get_parser
+
+
+def _installed(name):
+    return name == "json" or importlib.util.find_spec(name) is not None
+
+
+BACKENDS = [pytest.param(name, marks=pytest.mark.skipif(not _installed(name), reason=f"{name} not installed"))
+            for name in ("json", "orjson", "ujson")]
+
+
+@pytest.fixture
+def config_tree(tmpdir):
+    main = tmpdir.join("main.json")
+    main.write_text('{\n  "name": "café",  // unicode\n  "include": {"filename": "base.json"},\n'
+                    '  "items": [1, 2.5, null, true,]\n}', encoding="utf-8")
+    tmpdir.join("base.json").write('{"base": {"nested": [1, {"enabled": false}, {"x": "y"}]}}')
+    return str(main)
+
+
+@pytest.mark.parametrize("backend", BACKENDS + ["auto"])
+def test_backends_give_same_result(backend, config_tree):
+    data = PypayaJSON.load(config_tree, comment_string="//", parser=backend)
+    assert data == {"name": "café", "base": {"nested": [1, {"x": "y"}]}, "items": [1, 2.5, None, True]}
+
+
+def test_auto_accepts_what_json_accepts(tmpdir):
+    p = tmpdir.join("config.json")
+    p.write('{"big": 123456789012345678901234567890, "nan": NaN}')
+    data = PypayaJSON.load(str(p), parser="auto")
+    assert data["big"] == 123456789012345678901234567890
+    assert data["nan"] != data["nan"]
+
+
+def test_auto_reports_json_errors(tmpdir):
+    p = tmpdir.join("config.json")
+    p.write('{"a": }')
+    with pytest.raises(json.JSONDecodeError):
+        PypayaJSON.load(str(p), parser="auto")
+
+
+@pytest.mark.parametrize("backend", BACKENDS + ["auto"])
+@pytest.mark.parametrize("content", ['{"a": [1, 2,]}', '{"a": [1, 2] /* c */}'])
+def test_memory_mapped_files_give_same_result(backend, content, config_tree, tmpdir):
+    expected = PypayaJSON.load(config_tree, comment_string="//", parser=backend)
+    assert PypayaJSON(comment_string="//", parser=backend, mmap_min_bytes=1).load_file(config_tree) == expected
+
+    p = tmpdir.join("data.json")
+    p.write(content)
+    data = PypayaJSON(comment_string="//", parser=backend, mmap_min_bytes=1).load_file(str(p))
+    assert data == {"a": [1, 2]}
+
+
+def test_custom_parser_receives_bytes(tmpdir):
+    p = tmpdir.join("config.json")
+    p.write('{"a": 1}')
+    received = []
+
+    def parse(data):
+        received.append(data)
+        return json.loads(data)
+
+    assert PypayaJSON.load(str(p), parser=parse) == {"a": 1}
+    assert PypayaJSON(parser=parse, mmap_min_bytes=0).load_file(str(p)) == {"a": 1}
+    assert received == [b'{"a": 1}', b'{"a": 1}']
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError, match="Unknown JSON parser"):
+        get_parser("simdjson")
+
+
+@pytest.mark.skipif(_installed("ujson"), reason="ujson is installed")
+def test_missing_parser_backend():
+    with pytest.raises(ImportError, match="ujson"):
+        PypayaJSON(parser="ujson")
+
+
+def test_parsers_are_not_kept_globally():
+    for _ in range(100):
+        parse = get_parser("auto")
+    assert accepts_buffers(parse) is _installed("orjson")
+    assert len(parsers._buffer_loads) <= 1
+    assert not accepts_buffers(get_parser("json")) and not accepts_buffers(lambda data: data)
@@ -0,0 +1,75 @@
+import json
+import os
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json.paths import PathResolver
+
+
+@pytest.fixture
+def linked(tmpdir):
+    """real/ holds data/ and file.txt; link -> real and real/alias.txt -> file.txt."""
+    real = tmpdir.mkdir("real")
+    real.mkdir("data")
+    real.join("file.txt").write("")
+    os.symlink(str(real), str(tmpdir.join("link")))
+    os.symlink(str(real.join("file.txt")), str(real.join("alias.txt")))
+    return tmpdir
+
+
+@pytest.mark.parametrize("mode", ["resolve", "prefix", "abspath"])
+@pytest.mark.parametrize("cache", [False, True])
+def test_modes_agree_without_symlinks(tmpdir, mode, cache):
+    resolver = PathResolver(mode, cache)
+    base = str(tmpdir)
+    for value in ["a/b.txt", "./a/../c", "..", "x", "", str(tmpdir.join("abs")), "a/b/"]:
+        assert resolver.resolve(value, base) == PathResolver().resolve(value, base)
+        assert resolver.resolve(value, base) == resolver.resolve(value, base)
+
+
+def test_modes_follow_symlinks_differently(linked):
+    base = str(linked)
+    real = str(linked.join("real"))
+    assert PathResolver("resolve").resolve("link/alias.txt", base) == os.path.join(real, "file.txt")
+    assert PathResolver("prefix").resolve("link/alias.txt", base) == os.path.join(real, "alias.txt")
+    assert PathResolver("abspath").resolve("link/alias.txt", base) == str(linked.join("link", "alias.txt"))
+
+
+def test_cache_lifetime(linked, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("pypaya_json.paths.time.monotonic", lambda: now[0])
+    resolver = PathResolver("prefix", cache=True, ttl=60)
+    base = str(linked)
+    assert resolver.resolve("link/data", base) == str(linked.join("real", "data"))
+
+    os.remove(str(linked.join("link")))
+    os.symlink(str(linked.join("real", "data")), str(linked.join("link")))
+    assert resolver.resolve("link/data", base) == str(linked.join("real", "data"))  # Memoized
+    now[0] += 61
+    assert resolver.resolve("link/data", base) == str(linked.join("real", "data", "data"))
+
+
+def test_loader_path_options(linked):
+    linked.join("config.json").write(json.dumps({"@path:a": "link/alias.txt", "b": {"@path:c": "link/data"}}))
+    path = str(linked.join("config.json"))
+    loader = PypayaJSON(path_resolution="prefix", path_cache=True)
+    data = loader.load_file(path)
+    assert data == {"a": str(linked.join("real", "alias.txt")), "b": {"c": str(linked.join("real", "data"))}}
+
+    os.remove(str(linked.join("link")))
+    linked.mkdir("link").mkdir("data")
+    assert loader.load_file(path) == data
+    loader.path_cache_clear()
+    assert loader.load_file(path)["b"] == {"c": str(linked.join("link", "data"))}
+
+    with pytest.raises(ValueError, match="path resolution mode"):
+        PypayaJSON(path_resolution="realpath")
+
+
+@pytest.mark.parametrize("mode,cache", [("prefix", False), ("resolve", True), ("abspath", True)])
+def test_relative_paths_follow_the_working_directory(tmpdir, monkeypatch, mode, cache):
+    for name in ("c1", "c2"):
+        tmpdir.mkdir(name).join("main.json").write(json.dumps({"@path:data": "sub/data"}))
+    loader = PypayaJSON(path_resolution=mode, path_cache=cache)
+    for name in ("c1", "c2"):
+        monkeypatch.chdir(tmpdir.join(name))
+        assert loader.load_file("main.json")["data"] == os.path.realpath(str(tmpdir.join(name, "sub", "data")))
@@ -0,0 +1,70 @@
+import json
+import threading
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json.specs import iter_include_specs
+
+
+@pytest.fixture
+def include_tree(write_tree):
+    files = {
+        "main.json": {
+            "include": [{"filename": "a.json"}, {"filename": "sub/b.json"}],
+            "items": [{"include": {"filename": "list.json"}}, 0],
+            "section": {"replace_value": {"filename": "a.json", "key": "a"}},
+            "off": {"enabled": False, "include": {"filename": "missing.json"}},
+        },
+        "a.json": {"a": {"value": 1}},
+        "sub/b.json": {"b": 2, "more": {"include": {"filename": "c.json"}}},
+        "sub/c.json": {"c": 3},
+        "list.json": [1, 2],
+    }
+    return str(write_tree(files).join("main.json"))
+
+
+def test_prefetch_gives_same_result(include_tree):
+    expected = PypayaJSON().load_file(include_tree)
+    assert PypayaJSON(prefetch_workers=4).load_file(include_tree) == expected
+    assert PypayaJSON.load(include_tree, prefetch_workers=2) == expected
+
+
+def test_prefetch_reads_on_worker_threads(include_tree, monkeypatch):
+    loader = PypayaJSON(prefetch_workers=2)
+    threads = {}
+    original = loader._parse_file
+
+    def parse_file(path):
+        threads[path.split("/")[-1]] = threading.current_thread().name
+        return original(path)
+
+    monkeypatch.setattr(loader, "_parse_file", parse_file)
+    loader.load_file(include_tree)
+    assert sorted(threads) == ["a.json", "b.json", "c.json", "list.json", "main.json"]
+    assert all(name.startswith("pypaya-json-prefetch") for name in threads.values())
+
+
+def test_prefetch_raises_errors_of_needed_files(tmpdir):
+    p = tmpdir.join("main.json")
+    p.write(json.dumps({"include": {"filename": "missing.json"}}))
+    with pytest.raises(FileNotFoundError):
+        PypayaJSON(prefetch_workers=2).load_file(str(p))
+
+
+def test_prefetch_workers_validation():
+    with pytest.raises(ValueError):
+        PypayaJSON(prefetch_workers=-1)
+
+
+def test_iter_include_specs():
+    data = {
+        "include": {"filename": "a.json"},
+        "x": {"enabled": False, "include": [{"filename": "b.json"}]},
+        "y": [{"include": {"filename": "c.json", "enabled": False}}, [{"include": {"filename": "d.json"}}]],
+        "z": {"replace_value": {"filename": "e.json"}, "w": {"include": {"filename": "f.json"}}},
+    }
+    assert [(kind, spec["filename"], enabled) for kind, spec, enabled in iter_include_specs(data, "enabled")] == [
+        ("include", "a.json", True),
+        ("include", "b.json", False),
+        ("include", "c.json", False),
+        ("replace_value", "e.json", True),
+    ]
@@ -0,0 +1,70 @@
+import json
+import multiprocessing
+import os
+import pytest
+from pypaya_json import PypayaJSON, SharedConfig
+
+
+@pytest.fixture
+def config(tmpdir):
+    tmpdir.join("model.json").write(json.dumps({"layers": [1, {"units": 8}], "optimizer": {"lr": 0.1}}))
+    tmpdir.join("main.json").write(json.dumps({
+        "model": {"include": {"filename": "model.json"}},
+        "name": "réseau \"1\"",
+        "@path:data": "data",
+        "empty": {},
+    }))
+    return str(tmpdir.join("main.json"))
+
+
+def test_publish_equals_load(config):
+    expected = PypayaJSON().load_file(config)
+    with PypayaJSON().publish(config) as shared:
+        assert dict(shared) == expected and len(shared) == 4 and "model" in shared
+        assert shared.resolve() == expected
+        assert shared["model"] is shared["model"]
+        assert shared.get_path("model/optimizer/lr") == 0.1
+        assert shared.get_path(["model", "layers"]) == [1, {"units": 8}]
+        assert shared.get_path("name") == expected["name"]
+        assert shared.get_path("model/missing", "default") == "default"
+        assert shared.get_path("model/layers/0") is None  # Key paths go through dictionaries only
+        with pytest.raises(KeyError):
+            shared["missing"]
+
+
+def test_publish_to_file(config, tmpdir):
+    file = str(tmpdir.join("config.shared"))
+    PypayaJSON().publish(config, file=file).close()
+    assert [name for name in os.listdir(str(tmpdir)) if name.startswith(".tmp-")] == []
+    with SharedConfig.open(file) as shared:
+        assert dict(shared) == PypayaJSON().load_file(config) and shared.path == file
+
+    tmpdir.join("other").write("{}")
+    with pytest.raises(ValueError):
+        SharedConfig.open(str(tmpdir.join("other")))
+
+
+def test_non_dictionary_data():
+    shared = SharedConfig.publish([1, {"a": 2}])
+    assert shared.resolve() == [1, {"a": 2}]
+    assert shared.get_path("a") is None
+    with pytest.raises(TypeError):
+        len(shared)
+
+
+def _read(shared, queue):
+    queue.put((shared.get_path("model/optimizer/lr"), shared["name"]))
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_workers_read_the_published_data(config):
+    shared = PypayaJSON().publish(config)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_read, args=(shared, queue)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    results = [queue.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join()
+    assert results == [(0.1, "réseau \"1\"")] * 2
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import pytest
+from pypaya_json import PypayaJSON
+
+
+@pytest.fixture
+def tree(tmpdir):
+    """main.json includes a.json, which includes b.json (with comments) twice."""
+    tmpdir.join("b.json").write('{"x": 1, // comment\n "y": [1, 2,],}')
+    tmpdir.join("a.json").write(json.dumps({
+        "first": {"include": {"filename": "b.json"}},
+        "second": {"include": {"filename": "b.json"}},
+    }))
+    tmpdir.join("main.json").write(json.dumps({
+        "a": {"include": {"filename": "a.json"}},
+        "off": {"enabled": False},
+        "@path:dir": "data",
+    }))
+    return tmpdir
+
+
+def test_stats_are_off_by_default(tree):
+    loader = PypayaJSON(comment_string="//")
+    loader.load_file(str(tree.join("main.json")))
+    assert loader.last_stats is None
+
+
+def test_records_every_file_once(tree):
+    loader = PypayaJSON(comment_string="//", stats=True)
+    data = loader.load_file(str(tree.join("main.json")))
+    assert data == PypayaJSON(comment_string="//").load_file(str(tree.join("main.json")))
+
+    stats = loader.last_stats
+    assert stats.path == str(tree.join("main.json"))
+    assert [(f.path, f.depth) for f in stats.files] == [
+        (str(tree.join("main.json")), 0), (str(tree.join("a.json")), 1), (str(tree.join("b.json")), 2)]
+    b = stats.files[2]
+    assert b.bytes == tree.join("b.json").size()
+    assert b.nodes == 5
+    assert b.strip_seconds > 0 and b.parse_seconds > 0 and b.cached is None
+    assert stats.files[0].strip_seconds == 0
+    assert stats.total_bytes == sum(tree.join(n).size() for n in ("main.json", "a.json", "b.json"))
+    assert stats.max_depth == 2
+    assert stats.seconds >= stats.read_seconds + stats.parse_seconds
+    assert stats.filter_seconds > 0 and stats.path_seconds > 0 and stats.merge_seconds > 0
+    assert stats.disk_cache_hit is None
+
+
+def test_cache_hits(tree):
+    loader = PypayaJSON(comment_string="//", stats=True, cache=True, path_cache=True)
+    loader.load_file(str(tree.join("main.json")))
+    assert (loader.last_stats.file_cache_hits, loader.last_stats.file_cache_misses) == (0, 3)
+    assert (loader.last_stats.path_cache_hits, loader.last_stats.path_cache_misses) == (0, 1)
+    loader.load_file(str(tree.join("main.json")))
+    assert (loader.last_stats.file_cache_hits, loader.last_stats.file_cache_misses) == (3, 0)
+    assert (loader.last_stats.path_cache_hits, loader.last_stats.path_cache_misses) == (1, 0)
+    assert loader.last_stats.total_bytes == 0
+
+
+def test_disk_cache_hit(tree):
+    loader = PypayaJSON(comment_string="//", stats=True, disk_cache=str(tree.mkdir("cache")))
+    loader.load_file(str(tree.join("main.json")))
+    assert loader.last_stats.disk_cache_hit is False
+    loader.load_file(str(tree.join("main.json")))
+    assert loader.last_stats.disk_cache_hit is True
+    assert loader.last_stats.files == []
+
+
+def test_on_event(tree):
+    events = []
+    loader = PypayaJSON(comment_string="//", prefetch_workers=2,
+                        on_event=lambda event, value: events.append((event, value)))
+    loader.load_file(str(tree.join("main.json")))
+    assert sorted(value.path for event, value in events if event == "file") == [
+        str(tree.join(n)) for n in ("a.json", "b.json", "main.json")]
+    assert events[-1] == ("load", loader.last_stats)
+    assert loader.last_stats.max_depth == 2
+
+
+def test_partial_parse_aload_and_load_many_are_recorded(tree):
+    tree.join("big.json").write(json.dumps({"pad": "x" * 1000, "sub": {"v": [1, 2]}}))
+    tree.join("partial.json").write(json.dumps({"v": {"include": {"filename": "big.json", "keys_path": "sub"}}}))
+    loader = PypayaJSON(stats=True, partial_parse_min_bytes=0)
+    loader.load_file(str(tree.join("partial.json")))
+    record = loader.last_stats.files[1]
+    assert (record.path, record.depth, record.nodes) == (str(tree.join("big.json")), 1, 4)
+    assert 1000 < record.bytes <= tree.join("big.json").size()
+
+    loader = PypayaJSON(comment_string="//", stats=True)
+    path = str(tree.join("main.json"))
+    asyncio.run(loader.aload_file(path))
+    assert sorted(f.path for f in loader.last_stats.files) == [
+        str(tree.join(n)) for n in ("a.json", "b.json", "main.json")]
+    assert loader.last_stats.max_depth == 2
+    loader.load_many([str(tree.join("a.json")), path])
+    # b.json was processed for the first file
+    assert [f.path for f in loader.last_stats.files] == [path, str(tree.join("a.json"))]
@@ -0,0 +1,217 @@
+import json
+import pytest
+from pypaya_json import PypayaJSON
+from pypaya_json.stream import is_array_file, iter_array, locate
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+def test_iter_array_across_chunk_boundaries(tmpdir, chunk_size):
+    elements = [12345, -1.5e+10, 0.25, "a \\\"quoted\\\" ,] string", "é中\U0001f600", True, None,
+                {"a": [1, {"b": "}"}]}, [], {}, [[1], 2]]
+    p = tmpdir.join("array.json")
+    p.write_binary(("﻿ [ \n" + " ,\n".join(json.dumps(e, ensure_ascii=False) for e in elements)
+                    + "\n]\n").encode("utf-8"))
+    assert list(iter_array(str(p), chunk_size)) == elements
+    assert is_array_file(str(p), chunk_size)
+
+
+@pytest.mark.parametrize("content", ["{}", "[1 2]", "[1,]", "[1] 2", "[1"])
+def test_iter_array_rejects_invalid_input(tmpdir, content):
+    p = tmpdir.join("bad.json")
+    p.write(content)
+    with pytest.raises(ValueError):
+        list(iter_array(str(p), 2))
+
+
+@pytest.fixture
+def manifest(write_tree):
+    files = {
+        "main.json": {
+            "name": "manifest",
+            "samples": [
+                {"@path:file": "a.bin"},
+                {"include": {"filename": "shard1.json"}},
+                {"enabled": False, "include": {"filename": "missing.json"}},
+                {"include": {"filename": "meta.json", "keys_path": "extra"}},
+            ],
+        },
+        "shard1.json": [{"@path:file": "b.bin"}, {"include": {"filename": "sub/shard2.json"}}, {"enabled": False}],
+        "sub/shard2.json": [{"@path:file": "c.bin", "meta": {"include": {"filename": "../meta.json"}}}, [1, 2]],
+        "meta.json": {"extra": [{"x": 1}, {"x": 2}]},
+        "top.json": [{"include": {"filename": "shard1.json"}}, 3],
+    }
+    return write_tree(files)
+
+
+def test_iter_file_matches_load_file(manifest):
+    loader = PypayaJSON()
+    main = str(manifest.join("main.json"))
+    assert list(loader.iter_file(main, key_path="samples")) == loader.load_file(main)["samples"]
+    top = str(manifest.join("top.json"))
+    assert list(loader.iter_file(top)) == loader.load_file(top)
+
+
+def test_iter_file_streams_included_arrays(manifest, parsed):
+    loader = PypayaJSON()
+    items = loader.iter_file(str(manifest.join("main.json")), key_path=["samples"])
+    assert next(items) == {"file": str(manifest.join("a.bin"))}
+    assert next(items) == {"file": str(manifest.join("b.bin"))}
+    list(items)
+    assert parsed == ["meta.json"]  # main.json, shard1.json and shard2.json are streamed
+
+
+def test_iter_array_range(tmpdir):
+    p = tmpdir.join("data.json")
+    p.write('{"a": [1, {"b": [2]}, "]"], "c": [3]}')
+    text = p.read()
+    start = text.index("[")
+    assert list(iter_array(str(p), 2, start, text.index(', "c"'))) == [1, {"b": [2]}, "]"]
+
+
+def test_iter_file_streams_nested_arrays(tmpdir, monkeypatch):
+    samples = [{"i": i, "@path:file": f"{i}.bin"} for i in range(2000)]
+    tmpdir.join("main.json").write(json.dumps({"datasets": {"train": {"samples": samples}, "extra": 1}}))
+    path = str(tmpdir.join("main.json"))
+    expected = PypayaJSON().load_file(path)["datasets"]["train"]["samples"]
+    loader = PypayaJSON()
+    monkeypatch.setattr(loader, "_parse_file", lambda path: pytest.fail(f"{path} parsed whole"))
+    assert list(loader.iter_file(path, key_path="datasets/train/samples")) == expected
+
+    # An include on the way may change the array, the file is then loaded
+    tmpdir.join("other.json").write(json.dumps({"samples": [0]}))
+    tmpdir.join("main.json").write(json.dumps({"datasets": {"train": {"samples": samples[:2],
+                                                                      "include": {"filename": "other.json"}}}}))
+    assert list(PypayaJSON().iter_file(path, key_path="datasets/train/samples")) == [0]
+    with pytest.raises(TypeError):
+        list(PypayaJSON().iter_file(path, key_path="datasets/train"))
+
+
+def test_iter_file_keeps_a_bounded_number_of_documents(tmpdir, monkeypatch, parsed):
+    monkeypatch.setattr("pypaya_json.core._STREAM_DOCUMENTS", 2)
+    for i in range(4):
+        tmpdir.join(f"{i}.json").write(json.dumps({"v": i}))
+    order = [0, 1, 0, 2, 3, 0]
+    tmpdir.join("main.json").write(json.dumps([{"include": {"filename": f"{i}.json"}} for i in order]))
+    loader = PypayaJSON(max_files=5)
+    items = list(loader.iter_file(str(tmpdir.join("main.json"))))
+    assert items == [{"v": i} for i in order]
+    assert items[0] is not items[2] and items[2] is not items[5]
+    # 0.json is kept for the third element, then dropped for 2.json and 3.json
+    assert parsed == ["0.json", "1.json", "2.json", "3.json", "0.json"]
+
+
+def test_iter_file_errors(manifest):
+    loader = PypayaJSON()
+    with pytest.raises(TypeError):
+        loader.iter_file(str(manifest.join("main.json")), key_path="name")
+    manifest.join("loop.json").write(json.dumps([{"include": {"filename": "loop.json"}}]))
+    with pytest.raises(ValueError, match="Circular include"):
+        list(loader.iter_file(str(manifest.join("loop.json"))))
+
+
+def test_locate_skips_other_values():
+    buf = b'\xef\xbb\xbf{"a": [1, {"x": "]}\\""}], "b": {"c": 1.5e3, "enabled": true, "d": {"e": [1, 2]}}, "z": null}'
+    start, end = locate(buf, ["b", "d"], lambda level, key: False, "enabled")
+    assert buf[start:end] == b'{"e": [1, 2]}'
+    start, end = locate(buf, ["a"], lambda level, key: False)
+    assert json.loads(buf[start:end]) == [1, {"x": ']}"'}]
+    assert locate(buf, ["b", "c"], lambda level, key: key == "z") is None
+    assert locate(buf, ["b", "missing"], lambda level, key: False) is None
+    assert locate(buf, ["a", "x"], lambda level, key: False) is None
+
+
+@pytest.mark.parametrize("escapes", [False, True])
+def test_locate_skips_values_larger_than_a_window(escapes):
+    text = "a \\\" ]} [{ " if escapes else "}] [ {{ x"
+    blob = [{"s": text * (i % 7), "n": [[i], {"k": [text]}]} for i in range(20000)]
+    buf = json.dumps({"blob": blob, "nested": {"blob": blob, "v": [1, {"w": text}]}, "z": 1}).encode()
+    start, end = locate(buf, ["nested", "v"], lambda level, key: False)
+    assert json.loads(buf[start:end]) == [1, {"w": text}]
+    start, end = locate(buf, ["blob"], lambda level, key: False)
+    assert json.loads(buf[start:end]) == blob
+
+
+@pytest.mark.parametrize("content", [b'{"a": 1', b'{"a" 1}', b'{"a": 1} 2', b'{"a": [1}', b'{"a": "x}'])
+def test_locate_rejects_invalid_input(content):
+    with pytest.raises(ValueError):
+        locate(content, ["b"], lambda level, key: False)
+
+
+@pytest.fixture
+def large(tmpdir):
+    tmpdir.join("data.json").write(json.dumps({
+        "blob": [{"i": i, "s": "x" * 20} for i in range(2000)],
+        "datasets": {
+            "train": {"meta": {"@path:dir": "train", "n": 3, "tags": [{"include": {"filename": "tags.json"}}]}},
+            "test": {"enabled": False, "meta": {}},
+        },
+        "tail": {"more": list(range(100))},
+    }))
+    tmpdir.join("tags.json").write(json.dumps(["a", "b"]))
+    return tmpdir
+
+
+def test_partial_parse_matches_full_parse(large, parsed):
+    spec = {"filename": "data.json", "keys_path": "datasets/train/meta", "keys": ["n", "dir", "tags"]}
+    tmpdir = large
+    tmpdir.join("main.json").write(json.dumps({"meta": {"include": spec}, "again": {"include": spec}}))
+    expected = PypayaJSON().load_file(str(tmpdir.join("main.json")))
+    parsed.clear()
+
+    loader = PypayaJSON(partial_parse_min_bytes=1024)
+    assert loader.load_file(str(tmpdir.join("main.json"))) == expected
+    assert expected["meta"] == {"n": 3, "dir": str(tmpdir.join("train")), "tags": ["a", "b"]}
+    assert "data.json" not in parsed
+
+
+def test_partial_parse_scans_a_file_once(large, monkeypatch):
+    large.join("main.json").write(json.dumps({
+        "a": {"include": {"filename": "data.json", "keys_path": "tail"}},
+        "b": {"include": {"filename": "data.json", "keys_path": "tail"}},
+        "c": {"include": {"filename": "data.json", "keys_path": "datasets/train/meta"}},
+        "d": {"include": {"filename": "data.json", "keys_path": "blob"}},
+    }))
+    expected = PypayaJSON().load_file(str(large.join("main.json")))
+    loader = PypayaJSON(partial_parse_min_bytes=0)
+    scans = []
+    monkeypatch.setattr("pypaya_json.core.locate", lambda buf, *args: scans.append(args[0]) or locate(buf, *args))
+    data = loader.load_file(str(large.join("main.json")))
+    assert data == expected and data["a"] is not data["b"] and data["a"]["more"] is not data["b"]["more"]
+    # "tail" is scanned for once, "datasets/train/meta" parses the whole file, which "blob" reuses
+    assert scans == [["tail"]]
+
+
+@pytest.mark.parametrize("content, keys_path", [
+    ('{"include": {"filename": "other.json"}, "a": {"b": 1}}', "a/b"),  # The root include may supply a
+    ('{"a": {"b": 1, "replace_value": {"filename": "other.json", "key": "a"}}}', "a/b"),
+    ('{"a": {"b": 1}, "@path:a": "x"}', "a"),
+    ('{"a": {"b": 1}, "a": {"b": 2}}', "a/b"),
+    ('{"a": [{"b": 1}]}', ["a", 0, "b"]),
+])
+def test_partial_parse_falls_back_when_needed(tmpdir, content, keys_path):
+    tmpdir.join("other.json").write(json.dumps({"a": {"b": 2}}))
+    tmpdir.join("data.json").write(content)
+    tmpdir.join("main.json").write(json.dumps({"v": {"include": {"filename": "data.json", "keys_path": keys_path}}}))
+    expected = PypayaJSON().load_file(str(tmpdir.join("main.json")))
+    assert PypayaJSON(partial_parse_min_bytes=0).load_file(str(tmpdir.join("main.json"))) == expected
+
+
+@pytest.mark.parametrize("content, error", [
+    ('{"a": {"b": 1}, "c": {"include": {"filename": "missing.json"}}}', FileNotFoundError),
+    ('{"a": {"b": 1}, "c": {"include": {"filename": "other.json", "keys_path": "x"}}}', KeyError),
+    ('{"a": {"b": 1}, "c": [1x, tru]}', ValueError),
+])
+def test_partial_parse_does_not_validate_the_rest_of_the_file(tmpdir, content, error):
+    tmpdir.join("other.json").write(json.dumps({"a": {"b": 2}}))
+    tmpdir.join("data.json").write(content)
+    tmpdir.join("main.json").write(json.dumps({"v": {"include": {"filename": "data.json", "keys_path": "a/b"}}}))
+    with pytest.raises(error):
+        PypayaJSON().load_file(str(tmpdir.join("main.json")))
+    assert PypayaJSON(partial_parse_min_bytes=0).load_file(str(tmpdir.join("main.json"))) == {"v": {"b": 1}}
+
+
+def test_partial_parse_disabled_value(large):
+    spec = {"filename": "data.json", "keys_path": "datasets/test/meta"}
+    large.join("main.json").write(json.dumps({"include": spec}))
+    with pytest.raises(KeyError):
+        PypayaJSON(partial_parse_min_bytes=0).load_file(str(large.join("main.json")))
@@ -0,0 +1,90 @@
+import json
+import os
+import pytest
+from pypaya_json import LoadedConfig, PypayaJSON
+
+
+def write(path, content):
+    """Write JSON to path, making sure its signature changes even within the timestamp resolution."""
+    existed = path.exists()
+    path.write(json.dumps(content), ensure=True)
+    if existed:
+        stat = os.stat(str(path))
+        os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def tree(tmpdir):
+    write(tmpdir.join("main.json"), {
+        "database": {"include": {"filename": "db.json"}},
+        "workers": {"include": {"filename": "workers.json"}},
+        "name": "app",
+    })
+    write(tmpdir.join("db.json"), {"host": "localhost", "shared": {"include": {"filename": "shared.json"}}})
+    write(tmpdir.join("workers.json"), {"count": 4, "shared": {"include": {"filename": "shared.json"}}})
+    write(tmpdir.join("shared.json"), {"timeout": 10})
+    return tmpdir
+
+
+def test_watch_loads_data(tree):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    assert isinstance(config, LoadedConfig)
+    assert config.data == PypayaJSON().load_file(str(tree.join("main.json")))
+    assert [os.path.basename(p) for p in config.files] == ["db.json", "main.json", "shared.json", "workers.json"]
+
+
+def test_refresh_without_changes(tree, parsed):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    parsed.clear()
+    assert config.refresh() == []
+    assert parsed == []
+
+
+def test_refresh_reprocesses_changed_file_only(tree, parsed):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    write(tree.join("workers.json"), {"count": 8, "shared": {"include": {"filename": "shared.json"}}})
+    parsed.clear()
+
+    assert config.changed_files() == [str(tree.join("workers.json"))]
+    assert config.refresh() == ["workers"]
+    assert parsed == ["workers.json"]
+    assert config.data == PypayaJSON().load_file(str(tree.join("main.json")))
+
+
+def test_refresh_shared_file_changes_every_including_key(tree):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    write(tree.join("shared.json"), {"timeout": 30})
+    assert config.refresh() == ["database", "workers"]
+    assert config.data["database"]["shared"] == config.data["workers"]["shared"] == {"timeout": 30}
+
+
+def test_refresh_is_not_affected_by_changes_to_returned_data(tree):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    config.data["database"]["shared"]["timeout"] = -1
+    write(tree.join("workers.json"), {"count": 1, "shared": {"include": {"filename": "shared.json"}}})
+    config.refresh()
+    assert config.data["database"]["shared"] == {"timeout": 10}
+
+
+def test_refresh_follows_include_changes(tree):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    write(tree.join("db.json"), {"host": "remote"})
+    assert config.refresh() == ["database"]
+    assert "db.json" in [os.path.basename(p) for p in config.files]
+
+    write(tree.join("main.json"), {"name": "app"})
+    assert config.refresh() == ["database", "workers"]
+    assert [os.path.basename(p) for p in config.files] == ["main.json"]
+
+
+def test_refresh_keeps_previous_data_on_error(tree):
+    config = PypayaJSON().watch(str(tree.join("main.json")))
+    previous = config.data
+    tree.join("db.json").write("{broken")
+    with pytest.raises(ValueError):
+        config.refresh()
+    assert config.data is previous
+
+    write(tree.join("db.json"), {"host": "fixed"})
+    assert config.refresh() == ["database"]
+    assert config.data["database"] == {"host": "fixed"}